@@ -0,0 +1,31 @@
+"""Add batch_id to jobs for batch submission
+
+Revision ID: 16431e0da4b4
+Revises: ee86724f92ec
+Create Date: 2026-10-18 16:40:11.274953
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '16431e0da4b4'
+down_revision: Union[str, Sequence[str], None] = 'ee86724f92ec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('batch_id', sa.UUID(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_batch_id_status', 'jobs', ['batch_id', 'status'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_batch_id_status', table_name='jobs')
+    op.drop_column('jobs', 'batch_id')
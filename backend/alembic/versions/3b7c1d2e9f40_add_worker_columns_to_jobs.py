@@ -0,0 +1,37 @@
+"""Add worker columns to jobs
+
+Revision ID: 3b7c1d2e9f40
+Revises: e43964eacc09
+Create Date: 2026-10-18 09:12:41.203114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c1d2e9f40'
+down_revision: Union[str, Sequence[str], None] = 'e43964eacc09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('worker_id', sa.String(length=128), nullable=True))
+    op.add_column('jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('jobs', sa.Column('started_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('jobs', sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True))
+    # Workers claim the oldest pending job; keep that lookup off a sequential scan
+    op.create_index('ix_jobs_status_created_at', 'jobs', ['status', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_status_created_at', table_name='jobs')
+    op.drop_column('jobs', 'finished_at')
+    op.drop_column('jobs', 'started_at')
+    op.drop_column('jobs', 'heartbeat_at')
+    op.drop_column('jobs', 'worker_id')
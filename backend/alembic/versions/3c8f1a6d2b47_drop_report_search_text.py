@@ -0,0 +1,29 @@
+"""Drop reports.search_text; snippets are built from the version text
+
+Revision ID: 3c8f1a6d2b47
+Revises: 9e4b7c2d5a18
+Create Date: 2026-10-18 22:31:52.407613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8f1a6d2b47'
+down_revision: Union[str, Sequence[str], None] = '9e4b7c2d5a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only databases upgraded while f1c7a3e9d582 still created the column have it
+    op.execute("ALTER TABLE reports DROP COLUMN IF EXISTS search_text")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nothing reads the column any more, and f1c7a3e9d582 no longer drops it
+    pass
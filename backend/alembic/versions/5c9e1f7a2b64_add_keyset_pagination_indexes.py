@@ -0,0 +1,59 @@
+"""Add composite indexes for keyset pagination and list filters
+
+Revision ID: 5c9e1f7a2b64
+Revises: 8f2a6c4d1e73
+Create Date: 2026-10-18 14:21:40.118326
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9e1f7a2b64'
+down_revision: Union[str, Sequence[str], None] = '8f2a6c4d1e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction; these tables can be large
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_created_at_id', 'jobs', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_jobs_created_by_created_at', 'jobs', ['created_by', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_jobs_agent_id_created_at', 'jobs', ['agent_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_reports_created_at_id', 'reports', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_reports_created_by_created_at', 'reports', ['created_by', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_report_versions_report_id_version', 'report_versions', ['report_id', 'version_number'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_report_versions_created_at_id', 'report_versions', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tools_created_at_id', 'tools', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tools_agent_id_created_at', 'tools', ['agent_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_audit_logs_entity_created_at', 'audit_logs', ['entity', 'entity_id', 'created_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_audit_logs_user_id_created_at', 'audit_logs', ['user_id', 'created_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_agents_created_at_id', 'agents', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_agents_created_by_created_at', 'agents', ['created_by', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_created_at_id', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_agents_created_by_created_at', table_name='agents', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_agents_created_at_id', table_name='agents', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_audit_logs_user_id_created_at', table_name='audit_logs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_audit_logs_entity_created_at', table_name='audit_logs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_audit_logs_created_at_id', table_name='audit_logs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tools_agent_id_created_at', table_name='tools', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tools_created_at_id', table_name='tools', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_report_versions_created_at_id', table_name='report_versions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_report_versions_report_id_version', table_name='report_versions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_reports_created_by_created_at', table_name='reports', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_reports_created_at_id', table_name='reports', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_jobs_agent_id_created_at', table_name='jobs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_jobs_created_by_created_at', table_name='jobs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_jobs_created_at_id', table_name='jobs', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,37 @@
+"""Add job_stages table for stage checkpoints
+
+Revision ID: 7d3e9b2a6f15
+Revises: 16431e0da4b4
+Create Date: 2026-10-18 17:25:48.903127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3e9b2a6f15'
+down_revision: Union[str, Sequence[str], None] = '16431e0da4b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_stages',
+    sa.Column('job_id', sa.UUID(), nullable=False),
+    sa.Column('stage', sa.String(length=64), nullable=False),
+    sa.Column('pipeline', sa.String(length=32), nullable=False),
+    sa.Column('output_ref', sa.String(length=64), nullable=False),
+    sa.Column('output_size', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id', 'stage')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_stages')
@@ -0,0 +1,41 @@
+"""Add tool cache table and job options
+
+Revision ID: 8f2a6c4d1e73
+Revises: 3b7c1d2e9f40
+Create Date: 2026-10-18 10:02:17.551280
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2a6c4d1e73'
+down_revision: Union[str, Sequence[str], None] = '3b7c1d2e9f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tool_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('tool', sa.String(length=128), nullable=False),
+    sa.Column('model', sa.String(length=256), nullable=False),
+    sa.Column('value', sa.Text(), nullable=False),
+    sa.Column('hits', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_tool_cache_expires_at'), 'tool_cache', ['expires_at'], unique=False)
+    op.add_column('jobs', sa.Column('options', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'options')
+    op.drop_index(op.f('ix_tool_cache_expires_at'), table_name='tool_cache')
+    op.drop_table('tool_cache')
@@ -0,0 +1,32 @@
+"""Index pending jobs by queue so the scheduler can seek between queue heads
+
+Revision ID: 9e4b7c2d5a18
+Revises: f1c7a3e9d582
+Create Date: 2026-10-18 21:14:05.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7c2d5a18'
+down_revision: Union[str, Sequence[str], None] = 'f1c7a3e9d582'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_jobs_status_queue_created_at', 'jobs',
+            ['status', 'created_by', 'agent_id', 'priority', 'created_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_status_queue_created_at', table_name='jobs')
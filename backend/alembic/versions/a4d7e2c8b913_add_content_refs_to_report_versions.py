@@ -0,0 +1,30 @@
+"""Add content store references to report versions
+
+Revision ID: a4d7e2c8b913
+Revises: 5c9e1f7a2b64
+Create Date: 2026-10-18 15:07:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d7e2c8b913'
+down_revision: Union[str, Sequence[str], None] = '5c9e1f7a2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('report_versions', sa.Column('content_ref', sa.String(length=64), nullable=True))
+    op.add_column('report_versions', sa.Column('content_size', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('report_versions', 'content_size')
+    op.drop_column('report_versions', 'content_ref')
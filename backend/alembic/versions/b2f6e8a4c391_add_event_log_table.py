@@ -0,0 +1,45 @@
+"""Add event_log table
+
+Revision ID: b2f6e8a4c391
+Revises: 7d3e9b2a6f15
+Create Date: 2026-10-18 18:04:37.216842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2f6e8a4c391'
+down_revision: Union[str, Sequence[str], None] = '7d3e9b2a6f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_log',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('job_id', sa.UUID(), nullable=True),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('type', sa.String(length=32), nullable=False),
+    sa.Column('status', sa.String(length=32), nullable=True),
+    sa.Column('stage', sa.String(length=64), nullable=True),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_event_log_created_at_id', 'event_log', ['created_at', 'id'], unique=False)
+    op.create_index('ix_event_log_job_id_created_at', 'event_log', ['job_id', 'created_at'], unique=False)
+    op.create_index('ix_event_log_user_id_created_at', 'event_log', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_log_user_id_created_at', table_name='event_log')
+    op.drop_index('ix_event_log_job_id_created_at', table_name='event_log')
+    op.drop_index('ix_event_log_created_at_id', table_name='event_log')
+    op.drop_table('event_log')
@@ -0,0 +1,30 @@
+"""Add delta storage to report_versions
+
+Revision ID: d5b3f9e1a648
+Revises: c8a1d5f3e207
+Create Date: 2026-10-18 19:12:44.087315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b3f9e1a648'
+down_revision: Union[str, Sequence[str], None] = 'c8a1d5f3e207'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('report_versions', sa.Column('base_version', sa.Integer(), nullable=True))
+    op.add_column('report_versions', sa.Column('delta', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('report_versions', 'delta')
+    op.drop_column('report_versions', 'base_version')
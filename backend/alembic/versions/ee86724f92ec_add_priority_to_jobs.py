@@ -0,0 +1,31 @@
+"""Add priority class to jobs for fair-share scheduling
+
+Revision ID: ee86724f92ec
+Revises: a4d7e2c8b913
+Create Date: 2026-10-18 16:02:37.551208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ee86724f92ec'
+down_revision: Union[str, Sequence[str], None] = 'a4d7e2c8b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('priority', sa.String(length=16), server_default='normal', nullable=False))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_jobs_status_priority_created_at', 'jobs', ['status', 'priority', 'created_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_status_priority_created_at', table_name='jobs')
+    op.drop_column('jobs', 'priority')
@@ -0,0 +1,41 @@
+"""Add full-text search columns to reports
+
+Revision ID: f1c7a3e9d582
+Revises: d5b3f9e1a648
+Create Date: 2026-10-18 19:48:26.661904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a3e9d582'
+down_revision: Union[str, Sequence[str], None] = 'd5b3f9e1a648'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reports', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    # Existing reports: title, summary and (legacy inline) current version text,
+    # with the default SEARCH_CONFIG. Versions in the content store are
+    # indexed on the report's next write.
+    op.execute("""
+        UPDATE reports
+        SET search_vector = setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+            || setweight(to_tsvector('english', coalesce((SELECT v.content FROM report_versions v WHERE v.id = reports.current_version_id), '')), 'C')
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_reports_search_vector', 'reports', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reports_search_vector', table_name='reports', postgresql_using='gin')
+    op.drop_column('reports', 'search_vector')
@@ -1,35 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.agent import AgentCreate, AgentRead
 from app.db.agent import Agent
-from app.dependencies import get_db
+from app.dependencies import get_async_db
+from app.api.pagination import filter_created, keyset_page
 
 router = APIRouter(prefix="/agents", tags=["Agents"])
 
 @router.post("/", response_model=AgentRead)
-def create_agent(data: AgentCreate, db: Session = Depends(get_db)):
+async def create_agent(data: AgentCreate, db: AsyncSession = Depends(get_async_db)):
     new_agent = Agent(**data.dict())
     db.add(new_agent)
-    db.commit()
-    db.refresh(new_agent)
+    await db.commit()
+    await db.refresh(new_agent)
     return new_agent
 
 @router.get("/", response_model=list[AgentRead])
-def list_agents(db: Session = Depends(get_db), skip: int = 0, limit: int = 10):
-    return db.query(Agent).offset(skip).limit(limit).all()
+async def list_agents(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    cursor: str | None = None,
+    limit: int = 10,
+    skip: int = 0,
+    created_by: UUID | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+):
+    query = filter_created(select(Agent), Agent, created_after, created_before)
+    if created_by:
+        query = query.where(Agent.created_by == created_by)
+    return await keyset_page(db, query, Agent, response, cursor=cursor, limit=limit, skip=skip)
 
 @router.get("/{agent_id}", response_model=AgentRead)
-def get_agent(agent_id: str, db: Session = Depends(get_db)):
-    agent = db.query(Agent).get(agent_id)
+async def get_agent(agent_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(404, "Agent not found")
     return agent
 
 @router.delete("/{agent_id}")
-def delete_agent(agent_id: str, db: Session = Depends(get_db)):
-    agent = db.query(Agent).get(agent_id)
+async def delete_agent(agent_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(404, "Agent not found")
-    db.delete(agent)
-    db.commit()
+    await db.delete(agent)
+    await db.commit()
     return {"message": "Agent deleted"}
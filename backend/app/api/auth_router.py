@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.user import User
-from app.dependencies import get_db
+from app.dependencies import get_async_db
 from app.schemas.auth import UserCreate, Token, TokenRefresh, UserRead
 from app.auth import hash_password, verify_password, create_access_token, create_refresh_token, verify_token
 
@@ -11,28 +13,29 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 # Signup (for Admin/User creation)
 # -------------------------
 @router.post("/signup", response_model=UserRead)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user.email).first()
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = (await db.execute(select(User).where(User.email == user.email))).scalars().first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     db_user = User(
         full_name=user.full_name,
         email=user.email,
-        hashed_password=hash_password(user.password),
+        # bcrypt is deliberately slow; keep it off the event loop
+        hashed_password=await run_in_threadpool(hash_password, user.password),
         role=user.role
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 # -------------------------
 # Login
 # -------------------------
 @router.post("/login", response_model=Token)
-def login(email: str, password: str, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+async def login(email: str, password: str, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    if not user or not await run_in_threadpool(verify_password, password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     access_token = create_access_token({"sub": str(user.id), "role": user.role})
@@ -43,7 +46,7 @@ def login(email: str, password: str, db: Session = Depends(get_db)):
 # Refresh Token
 # -------------------------
 @router.post("/refresh", response_model=Token)
-def refresh_token(data: TokenRefresh):
+async def refresh_token(data: TokenRefresh):
     payload = verify_token(data.refresh_token)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
@@ -56,5 +59,5 @@ def refresh_token(data: TokenRefresh):
 # Logout (optional, token blacklisting can be implemented)
 # -------------------------
 @router.post("/logout")
-def logout():
+async def logout():
     return {"message": "Logout successful (client should discard tokens)"}
\ No newline at end of file
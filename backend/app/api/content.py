@@ -0,0 +1,79 @@
+# app/api/content.py
+import re
+import unicodedata
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+
+from app.services.content_store import ContentNotFound, content_store
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Single byte range -> (start, end) inclusive; None if unsatisfiable."""
+    match = _RANGE.fullmatch(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+def content_disposition(filename: str, disposition: str = "inline") -> str:
+    """
+    Content-Disposition for a user-supplied file name: an ASCII `filename`
+    fallback (quotes, backslashes and control characters replaced) plus the
+    exact name as RFC 5987 `filename*`.
+    """
+    ascii_name = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+    ascii_name = re.sub(r'[\x00-\x1f\x7f"\\]', "_", ascii_name).strip() or "download"
+    return f"{disposition}; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def content_response(request: Request, key: str, media_type: str, filename: str | None = None) -> Response:
+    """
+    Serve a content-store blob. Whole files go out as a FileResponse straight
+    from disk; `Range: bytes=...` gets a 206 with just that slice. Blobs are
+    immutable, so their hash is a strong ETag.
+    """
+    try:
+        size = content_store.size(key)
+    except ContentNotFound:
+        raise HTTPException(404, "Content not found")
+
+    headers = {"Accept-Ranges": "bytes", "ETag": f'"{key}"', "Cache-Control": "private, max-age=31536000, immutable"}
+    if filename:
+        headers["Content-Disposition"] = content_disposition(filename)
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if not range_header:
+        path = content_store.local_path(key)
+        if path:
+            return FileResponse(path, media_type=media_type, headers=headers)
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iterate_in_threadpool(content_store.iter_range(key)), media_type=media_type, headers=headers)
+
+    byte_range = _parse_range(range_header, size)
+    if byte_range is None:
+        raise HTTPException(416, "Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iterate_in_threadpool(content_store.iter_range(key, start, end)),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
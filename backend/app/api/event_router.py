@@ -0,0 +1,67 @@
+from datetime import datetime
+from uuid import UUID
+import asyncio
+import time
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.event import EventRead
+from app.db.event_log import EventLogEntry
+from app.dependencies import get_async_db
+from app.api.pagination import MAX_PAGE_SIZE, filter_created, keyset_page
+from app.config import settings
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+LAST_EVENT_ID_HEADER = "X-Last-Event-Id"
+MAX_TAIL_WAIT = 30.0
+
+
+@router.get("/", response_model=list[EventRead])
+async def list_events(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    cursor: str | None = None,
+    after: int | None = None,
+    wait: float = 0,
+    limit: int = 50,
+    job_id: UUID | None = None,
+    user_id: UUID | None = None,
+    type: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+):
+    """
+    Job lifecycle events. By default newest first; pass the X-Next-Cursor
+    response header as `cursor` for older pages.
+
+    Live tail: with `after` (an event id), events logged after it are
+    returned oldest first, and `wait` (seconds, up to 30) long-polls until
+    there is at least one. X-Last-Event-Id is the `after` for the next call.
+    Event log writers commit in id order, so following X-Last-Event-Id never
+    skips an event (events pruned by retention aside).
+    """
+    query = filter_created(select(EventLogEntry), EventLogEntry, created_after, created_before)
+    if job_id:
+        query = query.where(EventLogEntry.job_id == job_id)
+    if user_id:
+        query = query.where(EventLogEntry.user_id == user_id)
+    if type:
+        query = query.where(EventLogEntry.type == type)
+
+    if after is None:
+        return await keyset_page(db, query, EventLogEntry, response, cursor=cursor, limit=limit, id_type=int)
+
+    if limit <= 0 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(422, f"limit must be 1..{MAX_PAGE_SIZE}")
+    query = query.where(EventLogEntry.id > after).order_by(EventLogEntry.id).limit(limit)
+    deadline = time.monotonic() + min(max(wait, 0.0), MAX_TAIL_WAIT)
+    while True:
+        rows = (await db.execute(query)).scalars().all()
+        if rows or time.monotonic() >= deadline:
+            break
+        # Don't hold a pooled connection while idle
+        await db.rollback()
+        await asyncio.sleep(settings.EVENT_LOG_TAIL_INTERVAL)
+    response.headers[LAST_EVENT_ID_HEADER] = str(rows[-1].id if rows else after)
+    return rows
@@ -1,61 +1,479 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, undefer
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
+import asyncio
 import json
+import uuid
 
 from app.db.job import Job
-from app.schemas.job import JobRead
-from app.dependencies import get_db
-from app.services.job_runner import run_job_in_background
+from app.db.job_stage import JobStage
+from app.schemas.job import JobBatchCreated, JobBatchStatus, JobRead, JobReport, JobStageRead, JobSummary
+from app.dependencies import get_async_db
+from app.db.engine import AsyncSessionLocal
+from app.api.pagination import filter_created, keyset_page
+from app.config import settings
+from app.services.worker_pool import worker_pool
+from app.services.job_control import cancellation
+from app.services.checkpoints import clear_checkpoints
+from app.services.pipeline import PIPELINES
+from app.services.scheduler import scheduler
+from app.services.documents import UploadTooLarge, offload_input, save_upload
+from app.services.content_store import content_store
+from app.api.content import content_response
+from app.services.job_events import EVENT_SOURCE, TERMINAL_STATUSES, format_sse, job_events
+from app.services.event_bus import publish_on_commit
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
+
+def _job_options(bypass_cache: bool, pipeline: str | None, priority: str | None) -> tuple[dict | None, str]:
+    if pipeline and pipeline not in PIPELINES:
+        raise HTTPException(400, f"Unknown pipeline '{pipeline}', expected one of {sorted(PIPELINES)}")
+    priority = priority or settings.JOB_DEFAULT_PRIORITY
+    if priority not in settings.JOB_PRIORITY_WEIGHTS:
+        raise HTTPException(400, f"Unknown priority '{priority}', expected one of {scheduler.priorities}")
+
+    options = {}
+    if bypass_cache:
+        options["bypass_cache"] = True
+    if pipeline:
+        options["pipeline"] = pipeline
+    return options or None, priority
+
+
+async def _check_queue(db: AsyncSession, adding: int = 1):
+    if settings.MAX_PENDING_JOBS:
+        pending = await db.scalar(select(func.count()).select_from(Job).where(Job.status == "pending"))
+        if pending + adding > settings.MAX_PENDING_JOBS:
+            raise HTTPException(503, "Job queue is full, retry later", headers={"Retry-After": "30"})
+
+
+def _save_upload(input_file: UploadFile) -> dict:
+    """Streamed to disk in chunks; text extraction happens in the worker."""
+    try:
+        return {"document": save_upload(input_file.file, input_file.filename)}
+    except UploadTooLarge as e:
+        raise HTTPException(413, f"{input_file.filename}: {e}")
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+def _created_event(job_id, agent_id, created_by, priority, batch_id=None) -> dict:
+    """Bus-only event; nobody can be streaming a job that did not exist yet."""
+    event = {
+        "job_id": str(job_id),
+        "type": "status",
+        "status": "pending",
+        "agent_id": str(agent_id),
+        "user_id": str(created_by),
+        "priority": priority,
+        "source": EVENT_SOURCE,
+    }
+    if batch_id:
+        event["batch_id"] = str(batch_id)
+    return event
+
+
 @router.post("/", response_model=JobRead)
 async def create_job(
     agent_id: UUID = Form(...),
     created_by: UUID = Form(...),
     input_file: UploadFile | None = File(None),
     input_data: str | None = Form(None),
-    db: Session = Depends(get_db)
+    bypass_cache: bool = Form(False),
+    pipeline: str | None = Form(None),
+    priority: str | None = Form(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
+    options, priority = _job_options(bypass_cache, pipeline, priority)
     if input_file:
-        content = await input_file.read()
-        input_json = {"text": content.decode("utf-8")}
+        input_json = await run_in_threadpool(_save_upload, input_file)
     elif input_data:
         try:
             input_json = json.loads(input_data)
         except Exception as e:
             raise HTTPException(400, f"Invalid JSON: {e}")
+        # Large inline text goes to the content store, the row keeps a reference
+        input_json = await run_in_threadpool(offload_input, input_json)
     else:
         input_json = None
 
-    new_job = Job(agent_id=agent_id, created_by=created_by, input_data=input_json)
+    await _check_queue(db)
+    new_job = Job(
+        id=uuid.uuid4(),
+        agent_id=agent_id,
+        created_by=created_by,
+        input_data=input_json,
+        options=options,
+        priority=priority,
+    )
     db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
+    publish_on_commit(db, _created_event(new_job.id, agent_id, created_by, priority))
+    await db.commit()
+    # Only server-side defaults; input_data is already on the object
+    await db.refresh(new_job, ["status", "progress", "created_at"])
 
-    run_job_in_background(str(new_job.id))
-    return new_job
+    # Job is picked up by the worker pool; just wake idle workers
+    worker_pool.notify()
+    return await _job_read(db, new_job, input_data=new_job.input_data)
 
-@router.get("/", response_model=list[JobRead])
-def list_jobs(db: Session = Depends(get_db), skip: int = 0, limit: int = 10):
-    return db.query(Job).offset(skip).limit(limit).all()
+@router.post("/batch", response_model=JobBatchCreated)
+async def create_job_batch(
+    agent_id: UUID = Form(...),
+    created_by: UUID = Form(...),
+    input_files: list[UploadFile] | None = File(None),
+    inputs: str | None = Form(None),
+    bypass_cache: bool = Form(False),
+    pipeline: str | None = Form(None),
+    priority: str | None = Form(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Many jobs in one request: one per uploaded file and one per element of
+    `inputs` (a JSON array of job inputs; strings are taken as {"text": ...}).
+    All rows go in with a single multi-row INSERT and one commit, and share a
+    batch_id for GET /jobs/batch/{batch_id}. Priority defaults to
+    JOB_BATCH_PRIORITY ("bulk").
+    """
+    options, priority = _job_options(bypass_cache, pipeline, priority or settings.JOB_BATCH_PRIORITY)
+    input_files = input_files or []
+    try:
+        parsed = json.loads(inputs) if inputs else []
+    except Exception as e:
+        raise HTTPException(400, f"Invalid JSON: {e}")
+    if not isinstance(parsed, list):
+        raise HTTPException(400, "inputs must be a JSON array")
+    count = len(input_files) + len(parsed)
+    if not count:
+        raise HTTPException(400, "Provide input_files and/or inputs")
+    if count > settings.MAX_BATCH_JOBS:
+        raise HTTPException(400, f"At most {settings.MAX_BATCH_JOBS} jobs per batch, got {count}")
+    await _check_queue(db, count)
+
+    def prepare() -> list:
+        payloads = [_save_upload(f) for f in input_files]
+        for item in parsed:
+            payloads.append(offload_input({"text": item} if isinstance(item, str) else item))
+        return payloads
+
+    payloads = await run_in_threadpool(prepare)
+    batch_id = uuid.uuid4()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "agent_id": agent_id,
+            "created_by": created_by,
+            "input_data": payload,
+            "options": options,
+            "priority": priority,
+            "batch_id": batch_id,
+        }
+        for payload in payloads
+    ]
+    # Ids are generated here, so no RETURNING / refresh round trips
+    await db.execute(insert(Job), rows)
+    for row in rows:
+        publish_on_commit(db, _created_event(row["id"], agent_id, created_by, priority, batch_id))
+    await db.commit()
+
+    worker_pool.notify()
+    return JobBatchCreated(batch_id=batch_id, job_ids=[row["id"] for row in rows])
+
+@router.get("/batch/{batch_id}", response_model=JobBatchStatus)
+async def get_job_batch(batch_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """Aggregate progress of a batch, from one GROUP BY over its jobs."""
+    rows = (
+        await db.execute(
+            select(Job.status, func.count(), func.sum(Job.progress))
+            .where(Job.batch_id == batch_id)
+            .group_by(Job.status)
+        )
+    ).all()
+    if not rows:
+        raise HTTPException(404, "Batch not found")
+
+    statuses = {status: count for status, count, _ in rows}
+    total = sum(statuses.values())
+    # Finished jobs count as 100% whatever progress they stopped at
+    points = sum(count * 100 if status in TERMINAL_STATUSES else (progress or 0) for status, count, progress in rows)
+    return JobBatchStatus(
+        batch_id=batch_id,
+        total=total,
+        statuses=statuses,
+        progress=points // total,
+        done=all(status in TERMINAL_STATUSES for status in statuses),
+    )
+
+SUMMARY_COLUMNS = (
+    Job.id, Job.agent_id, Job.created_by, Job.status, Job.progress, Job.priority, Job.batch_id,
+    Job.created_at, Job.started_at, Job.finished_at,
+)
+PAYLOAD_FIELDS = {"input_data": Job.input_data, "output_data": Job.output_data}
+# Extracted in SQL, so only these small parts of output_data leave the database
+REPORT_REF = Job.output_data["report"]
+FINAL_REPORT = Job.output_data["final_report"].as_string()  # jobs finished before the content store
+
+
+async def _report_text(report_ref: dict | None, inline: str | None) -> str:
+    if report_ref:
+        return await run_in_threadpool(content_store.read_text, report_ref["sha256"])
+    return inline or ""
+
+
+async def _job_read(db: AsyncSession, job: Job, input_data=None, output_data=None) -> JobRead:
+    position, eta = await scheduler.estimate(db, job)
+    return JobRead(
+        id=job.id,
+        agent_id=job.agent_id,
+        created_by=job.created_by,
+        status=job.status,
+        progress=job.progress,
+        priority=job.priority,
+        batch_id=job.batch_id,
+        input_data=input_data,
+        output_data=output_data,
+        queue_position=position,
+        eta_seconds=eta,
+    )
+
+@router.get("/", response_model=list[JobSummary])
+async def list_jobs(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    cursor: str | None = None,
+    limit: int = 10,
+    skip: int = 0,
+    status: str | None = None,
+    priority: str | None = None,
+    batch_id: UUID | None = None,
+    agent_id: UUID | None = None,
+    created_by: UUID | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+):
+    """
+    Newest first; pass the X-Next-Cursor response header as `cursor` for the
+    next page. Only summary columns are selected - use GET /jobs/{id} or
+    /jobs/{id}/report for the payloads.
+    """
+    query = select(Job).options(load_only(*SUMMARY_COLUMNS, raiseload=True))
+    query = filter_created(query, Job, created_after, created_before)
+    if status:
+        query = query.where(Job.status == status)
+    if priority:
+        query = query.where(Job.priority == priority)
+    if batch_id:
+        query = query.where(Job.batch_id == batch_id)
+    if agent_id:
+        query = query.where(Job.agent_id == agent_id)
+    if created_by:
+        query = query.where(Job.created_by == created_by)
+    return await keyset_page(db, query, Job, response, cursor=cursor, limit=limit, skip=skip)
 
 @router.get("/{job_id}", response_model=JobRead)
-def get_job(job_id: UUID, db: Session = Depends(get_db)):
-    job = db.query(Job).get(job_id)
+async def get_job(job_id: UUID, fields: str | None = None, db: AsyncSession = Depends(get_async_db)):
+    """
+    Job detail. `fields` picks the JSON payloads to include (comma separated:
+    input_data, output_data); default both, `fields=` for none.
+    """
+    wanted = set(PAYLOAD_FIELDS) if fields is None else {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = wanted - set(PAYLOAD_FIELDS)
+    if unknown:
+        raise HTTPException(400, f"Unknown fields {sorted(unknown)}, expected any of {sorted(PAYLOAD_FIELDS)}")
+
+    job = await db.get(Job, job_id, options=[undefer(PAYLOAD_FIELDS[f]) for f in wanted])
     if not job:
         raise HTTPException(404, "Job not found")
-    return job
+    return await _job_read(
+        db, job,
+        input_data=job.input_data if "input_data" in wanted else None,
+        output_data=job.output_data if "output_data" in wanted else None,
+    )
+
+@router.get("/{job_id}/report", response_model=JobReport)
+async def get_job_report(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """Just the report (or error) text; the job row itself is not loaded."""
+    row = (await db.execute(
+        select(
+            Job.status,
+            REPORT_REF,
+            FINAL_REPORT,
+            Job.output_data["error"].as_string(),
+        ).where(Job.id == job_id)
+    )).first()
+    if not row:
+        raise HTTPException(404, "Job not found")
+    status, report_ref, inline, error = row
+    final_report = await _report_text(report_ref, inline) if (report_ref or inline) else None
+    return JobReport(job_id=job_id, status=status, final_report=final_report, error=error)
+
+@router.get("/{job_id}/report/content")
+async def get_job_report_content(job_id: UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Download the report body from the content store (supports Range requests)."""
+    row = (await db.execute(select(REPORT_REF, FINAL_REPORT).where(Job.id == job_id))).first()
+    if not row:
+        raise HTTPException(404, "Job not found")
+    report_ref, inline = row
+    if report_ref:
+        return content_response(request, report_ref["sha256"], "text/plain; charset=utf-8", f"{job_id}.txt")
+    if inline is not None:
+        return Response(inline, media_type="text/plain; charset=utf-8")
+    raise HTTPException(404, "Job has no report")
+
+@router.get("/{job_id}/input/content")
+async def get_job_input_content(job_id: UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Download the job's uploaded document or offloaded input text (supports Range requests)."""
+    input_data = await db.scalar(select(Job.input_data).where(Job.id == job_id))
+    document = (input_data or {}).get("document")
+    if document and "sha256" in document and "upload" not in document:
+        return content_response(request, document["sha256"], "application/octet-stream", document.get("filename"))
+    if (input_data or {}).get("text_ref"):
+        return content_response(request, input_data["text_ref"]["sha256"], "text/plain; charset=utf-8")
+    raise HTTPException(404, "Job input is not in the content store")
 
 @router.delete("/{job_id}")
-def cancel_job(job_id: UUID, db: Session = Depends(get_db)):
-    job = db.query(Job).get(job_id)
+async def cancel_job(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(404, "Job not found")
     if job.status in ["completed", "failed"]:
         raise HTTPException(400, "Cannot cancel a completed or failed job")
 
     job.status = "cancelled"
-    db.commit()
+    await job_events.apublish(job_id, {"type": "status", "status": "cancelled"}, db)
+    await db.commit()
+    # Stop it right away if it runs in this process; remote workers see it on their next heartbeat
+    cancellation.cancel(str(job_id))
     return {"message": "Job cancelled"}
+
+@router.post("/{job_id}/retry", response_model=JobRead)
+async def retry_job(job_id: UUID, from_scratch: bool = False, db: AsyncSession = Depends(get_async_db)):
+    """
+    Put a failed or cancelled job back in the queue. Stages that finished
+    before are checkpointed and not run again; `from_scratch=true` drops
+    the checkpoints first.
+    """
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    if job.status not in ["failed", "cancelled"]:
+        raise HTTPException(400, "Only failed or cancelled jobs can be retried")
+    # A cancelled job's worker notices on its next heartbeat; until its run ends it keeps heartbeating
+    if job.heartbeat_at and job.status == "cancelled":
+        heartbeat_at = job.heartbeat_at if job.heartbeat_at.tzinfo else job.heartbeat_at.replace(tzinfo=timezone.utc)
+        if datetime.now(timezone.utc) - heartbeat_at < timedelta(seconds=2 * settings.WORKER_HEARTBEAT_INTERVAL):
+            raise HTTPException(409, "Job is still stopping, retry later", headers={"Retry-After": "30"})
+    await _check_queue(db)
+
+    if from_scratch:
+        await db.run_sync(clear_checkpoints, job_id)
+    job.status = "pending"
+    job.progress = 0
+    job.output_data = None
+    job.worker_id = None
+    job.heartbeat_at = None
+    job.started_at = None
+    job.finished_at = None
+    await job_events.apublish(job_id, {"type": "status", "status": "pending", "progress": 0}, db)
+    await db.commit()
+
+    worker_pool.notify()
+    return await _job_read(db, job)
+
+@router.get("/{job_id}/stages", response_model=list[JobStageRead])
+async def list_job_stages(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """Checkpointed stages of the job's current attempt, in completion order."""
+    rows = (
+        await db.execute(
+            select(JobStage).where(JobStage.job_id == job_id).order_by(JobStage.created_at, JobStage.stage)
+        )
+    ).scalars().all()
+    if not rows and not await db.get(Job, job_id):
+        raise HTTPException(404, "Job not found")
+    return rows
+
+@router.get("/{job_id}/events")
+async def job_event_stream(job_id: UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Server-Sent Events: the current status first, then status / progress /
+    stage events as they happen. The stream ends once the job is finished.
+    """
+    # Subscribe before reading the snapshot so nothing in between is lost
+    queue = job_events.subscribe(str(job_id))
+    snapshot = (await db.execute(select(Job.status, Job.progress).where(Job.id == job_id))).first()
+    if not snapshot:
+        job_events.unsubscribe(str(job_id), queue)
+        raise HTTPException(404, "Job not found")
+
+    async def stream():
+        try:
+            status, progress = snapshot
+            yield format_sse({"job_id": str(job_id), "type": "status", "status": status, "progress": progress})
+            while status not in TERMINAL_STATUSES:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.SSE_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                status = event.get("status", status)
+                yield format_sse(event)
+        finally:
+            job_events.unsubscribe(str(job_id), queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _final_report(job_id: UUID) -> str:
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(select(REPORT_REF, FINAL_REPORT).where(Job.id == job_id))).first()
+    return await _report_text(*row) if row else ""
+
+@router.get("/{job_id}/report/stream")
+async def stream_report(job_id: UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    The final report as plain text while it is being generated. Finished
+    jobs return the stored report at once; a client that connects in the
+    middle of the final stage gets the text generated from then on.
+    """
+    queue = job_events.subscribe(str(job_id))
+    row = (await db.execute(select(Job.status, REPORT_REF, FINAL_REPORT).where(Job.id == job_id))).first()
+    if not row:
+        job_events.unsubscribe(str(job_id), queue)
+        raise HTTPException(404, "Job not found")
+    status, report_ref, inline = row
+
+    async def stream():
+        try:
+            if status in TERMINAL_STATUSES:
+                yield await _report_text(report_ref, inline)
+                return
+            streamed = False
+            while True:
+                if await request.is_disconnected():
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.SSE_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    continue
+                if event.get("type") == "token" and event.get("final"):
+                    streamed = True
+                    yield event["text"]
+                elif event.get("status") in TERMINAL_STATUSES:
+                    if event["status"] == "completed" and not streamed:
+                        # The request's session is gone by now; read the report on a fresh one
+                        yield await _final_report(job_id)
+                    return
+        finally:
+            job_events.unsubscribe(str(job_id), queue)
+
+    return StreamingResponse(stream(), media_type="text/plain; charset=utf-8", headers={"X-Accel-Buffering": "no"})
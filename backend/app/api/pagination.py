@@ -0,0 +1,99 @@
+# app/api/pagination.py
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+from sqlalchemy import func, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at: datetime, id_) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id_)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, id_type=UUID) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id_ = json.loads(raw)
+        return datetime.fromisoformat(created_at), id_type(id_)
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+
+
+def encode_rank_cursor(rank: float, id_) -> str:
+    """Cursor for result lists ordered on (rank, id) instead of (created_at, id)."""
+    raw = json.dumps([rank, str(id_)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_rank_cursor(cursor: str, id_type=UUID) -> tuple[float, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rank, id_ = json.loads(raw)
+        return float(rank), id_type(id_)
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+
+
+def _comparable_time(db, expr):
+    """
+    SQLite stores server-default timestamps without the fractional seconds
+    that bound parameters carry, so as text every row of the cursor's second
+    would sort before it; there, timestamps are compared as numbers.
+    """
+    return func.julianday(expr) if db.get_bind().dialect.name == "sqlite" else expr
+
+
+def filter_created(query, model, created_after: datetime | None, created_before: datetime | None):
+    if created_after:
+        query = query.where(model.created_at >= created_after)
+    if created_before:
+        query = query.where(model.created_at < created_before)
+    return query
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query,
+    model,
+    response: Response,
+    *,
+    cursor: str | None = None,
+    limit: int = 10,
+    skip: int = 0,
+    id_type=UUID,
+):
+    """
+    One page of `query`, newest first, ordered on (created_at, id).
+
+    The next page starts after the last row of this one (WHERE (created_at, id)
+    < cursor), so every page is an index range scan regardless of depth. The
+    cursor for it is returned in the X-Next-Cursor header; no header means
+    this was the last page. `skip` (OFFSET) is only honored without a cursor,
+    for old clients. `id_type` is the type of `model.id` (UUID or int).
+    """
+    if limit <= 0 or limit > MAX_PAGE_SIZE or skip < 0:
+        raise HTTPException(422, f"limit must be 1..{MAX_PAGE_SIZE} and skip >= 0")
+
+    created_at = _comparable_time(db, model.created_at)
+    query = query.order_by(created_at.desc(), model.id.desc())
+    if cursor:
+        after, after_id = decode_cursor(cursor, id_type)
+        after = _comparable_time(db, literal(after, model.created_at.type))
+        query = query.where(tuple_(created_at, model.id) < tuple_(after, after_id))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    rows = [row[0] if len(row) == 1 else row for row in rows]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return rows
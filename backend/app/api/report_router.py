@@ -1,37 +1,155 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.schemas.report import ReportCreate, ReportRead
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.report import ReportCreate, ReportRead, ReportSearchHit, ReportVersionCreate, ReportVersionRead
 from app.db.report import Report
-from app.dependencies import get_db
+from app.db.report_version import ReportVersion
+from app.api.content import content_response
+from app.dependencies import get_async_db
+from app.api.pagination import (
+    NEXT_CURSOR_HEADER, MAX_PAGE_SIZE, decode_rank_cursor, encode_rank_cursor, filter_created, keyset_page,
+)
+from app.services.report_versions import version_store
+from app.services.search import report_search
 from uuid import UUID
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 @router.post("/", response_model=ReportRead)
-def create_report(data: ReportCreate, db: Session = Depends(get_db)):
+async def create_report(data: ReportCreate, db: AsyncSession = Depends(get_async_db)):
     new_report = Report(**data.dict())
     db.add(new_report)
-    db.commit()
-    db.refresh(new_report)
+    await db.flush()
+    await db.refresh(new_report)
+    await report_search.index_report(db, new_report)
+    await db.commit()
     return new_report
 
 @router.get("/", response_model=list[ReportRead])
-def list_reports(db: Session = Depends(get_db), skip: int = 0, limit: int = 10):
-    return db.query(Report).offset(skip).limit(limit).all()
+async def list_reports(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    cursor: str | None = None,
+    limit: int = 10,
+    skip: int = 0,
+    created_by: UUID | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+):
+    query = filter_created(select(Report), Report, created_after, created_before)
+    if created_by:
+        query = query.where(Report.created_by == created_by)
+    return await keyset_page(db, query, Report, response, cursor=cursor, limit=limit, skip=skip)
+
+@router.get("/search", response_model=list[ReportSearchHit])
+async def search_reports(
+    q: str,
+    response: Response,
+    limit: int = 10,
+    cursor: str | None = None,
+    created_by: UUID | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Full-text search over report titles, summaries and current version text,
+    best match first, with highlighted snippets. Pass X-Next-Cursor back as
+    `cursor` for the next page.
+    """
+    if not q.strip():
+        raise HTTPException(422, "q must not be empty")
+    if limit <= 0 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(422, f"limit must be 1..{MAX_PAGE_SIZE}")
+    after = decode_rank_cursor(cursor) if cursor else None
+    hits = await report_search.search(db, q, limit=limit, after=after, created_by=created_by)
+    if len(hits) > limit:
+        hits = hits[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_rank_cursor(hits[-1]["rank"], hits[-1]["id"])
+    return hits
 
 @router.get("/{report_id}", response_model=ReportRead)
-def get_report(report_id: UUID, db: Session = Depends(get_db)):
-    report = db.query(Report).get(report_id)
+async def get_report(report_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    report = await db.get(Report, report_id)
     if not report:
         raise HTTPException(404, "Report not found")
     return report
 
 
 @router.delete("/{report_id}")
-def delete_report(report_id: str, db: Session = Depends(get_db)):
-    report = db.query(Report).get(report_id)
+async def delete_report(report_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    report = await db.get(Report, report_id)
     if not report:
         raise HTTPException(404, "Report not found")
-    db.delete(report)
-    db.commit()
+    # Its version history goes with it (report_versions.report_id is a plain foreign key)
+    await db.execute(delete(ReportVersion).where(ReportVersion.report_id == report.id))
+    await db.delete(report)
+    report_search.remove(db, report.id)
+    await db.commit()
     return {"message": "Report deleted"}
+
+@router.post("/{report_id}/versions", response_model=ReportVersionRead)
+async def create_report_version(report_id: UUID, data: ReportVersionCreate, db: AsyncSession = Depends(get_async_db)):
+    """New version, made current. Stored as a delta against the previous one unless a snapshot is due."""
+    report = await db.get(Report, report_id)
+    if not report:
+        raise HTTPException(404, "Report not found")
+    version = await version_store.add_version(db, report, data.content, data.report_metadata)
+    await report_search.index_report(db, report, data.content)
+    await db.commit()
+    version_store.remember(version.id, data.content)
+    return version
+
+@router.get("/{report_id}/versions", response_model=list[ReportVersionRead])
+async def list_report_versions(
+    report_id: UUID,
+    before: int | None = None,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Version history, newest first; pass the last version_number as `before` for the next page."""
+    if limit <= 0 or limit > 200:
+        raise HTTPException(422, "limit must be 1..200")
+    query = select(ReportVersion).where(ReportVersion.report_id == report_id)
+    if before is not None:
+        query = query.where(ReportVersion.version_number < before)
+    rows = (await db.execute(query.order_by(ReportVersion.version_number.desc()).limit(limit))).scalars().all()
+    if not rows and before is None and not await db.get(Report, report_id):
+        raise HTTPException(404, "Report not found")
+    return rows
+
+@router.get("/{report_id}/versions/diff", response_class=PlainTextResponse)
+async def diff_report_versions(
+    report_id: UUID,
+    from_version: int,
+    to_version: int,
+    context: int = 3,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Unified diff between two versions of a report."""
+    diff = await version_store.diff(db, report_id, from_version, to_version, context=max(context, 0))
+    if diff is None:
+        raise HTTPException(404, "Report version not found")
+    return PlainTextResponse(diff)
+
+@router.get("/{report_id}/versions/{version_number}/content")
+async def get_report_version_content(
+    report_id: UUID, version_number: int, request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    One version's body. Snapshots are served from the content store
+    (supports Range requests); delta versions are rebuilt first.
+    """
+    row = (await db.execute(
+        select(ReportVersion.content_ref, ReportVersion.content, ReportVersion.base_version).where(
+            ReportVersion.report_id == report_id, ReportVersion.version_number == version_number
+        )
+    )).first()
+    if not row:
+        raise HTTPException(404, "Report version not found")
+    content_ref, inline, base_version = row
+    if content_ref:
+        return content_response(request, content_ref, "text/plain; charset=utf-8", f"{report_id}-v{version_number}.txt")
+    if base_version is not None:
+        inline = await version_store.get_text(db, report_id, version_number)
+    return Response(inline or "", media_type="text/plain; charset=utf-8")
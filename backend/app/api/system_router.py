@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.services.mcp.cache import tool_cache
+from app.services.telemetry import registry
+from app.db.engine import pool_stats
+
+router = APIRouter(prefix="/system", tags=["System"])
+metrics_router = APIRouter(tags=["System"])
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint (this process only; workers serve their own)."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/cache")
+def cache_stats():
+    return tool_cache.stats()
+
+@router.get("/db-pool")
+def db_pool_stats():
+    """Connection pool utilization per engine role (api / worker)."""
+    return pool_stats()
+
+@router.delete("/cache")
+def clear_cache():
+    tool_cache.clear()
+    return {"message": "Tool cache cleared"}
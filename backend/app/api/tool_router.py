@@ -1,36 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.tool import ToolCreate, ToolRead
 from app.db.tool import Tool
-from app.dependencies import get_db
+from app.dependencies import get_async_db
+from app.api.pagination import filter_created, keyset_page
 
 router = APIRouter(prefix="/tools", tags=["Tools"])
 
 @router.post("/", response_model=ToolRead)
-def create_tool(data: ToolCreate, db: Session = Depends(get_db)):
+async def create_tool(data: ToolCreate, db: AsyncSession = Depends(get_async_db)):
     new_tool = Tool(**data.dict())
     db.add(new_tool)
-    db.commit()
-    db.refresh(new_tool)
+    await db.commit()
+    await db.refresh(new_tool)
     return new_tool
 
 
 @router.get("/", response_model=list[ToolRead])
-def list_tools(db: Session = Depends(get_db), skip: int = 0, limit: int = 10):
-    return db.query(Tool).offset(skip).limit(limit).all()
+async def list_tools(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    cursor: str | None = None,
+    limit: int = 10,
+    skip: int = 0,
+    agent_id: UUID | None = None,
+    type: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+):
+    query = filter_created(select(Tool), Tool, created_after, created_before)
+    if agent_id:
+        query = query.where(Tool.agent_id == agent_id)
+    if type:
+        query = query.where(Tool.type == type)
+    return await keyset_page(db, query, Tool, response, cursor=cursor, limit=limit, skip=skip)
 
 @router.get("/{tool_id}", response_model=ToolRead)
-def get_tool(tool_id: str, db: Session = Depends(get_db)):
-    tool = db.query(Tool).get(tool_id)
+async def get_tool(tool_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    tool = await db.get(Tool, tool_id)
     if not tool:
         raise HTTPException(404, "Tool not found")
     return tool
 
 @router.delete("/{tool_id}")
-def delete_tool(tool_id: str, db: Session = Depends(get_db)):
-    tool = db.query(Tool).get(tool_id)
+async def delete_tool(tool_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    tool = await db.get(Tool, tool_id)
     if not tool:
         raise HTTPException(404, "Tool not found")
-    db.delete(tool)
-    db.commit()
+    await db.delete(tool)
+    await db.commit()
     return {"message": "Tool deleted"}
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.user import UserCreate, UserRead
 from app.db.user import User
-from app.dependencies import get_db
+from app.dependencies import get_async_db
+from app.api.pagination import filter_created, keyset_page
 import uuid
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -10,8 +13,8 @@ router = APIRouter(prefix="/users", tags=["Users"])
 # CREATE USER
 # -----------------------------
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(data: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == data.email).first()
+async def create_user(data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = (await db.execute(select(User).where(User.email == data.email))).scalars().first()
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -26,19 +29,23 @@ def create_user(data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 # -----------------------------
 # READ USERS with Pagination + Filtering
 # -----------------------------
 @router.get("/", response_model=list[UserRead])
-def list_users(
-    db: Session = Depends(get_db),
+async def list_users(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    cursor: str | None = None,
     skip: int = 0,
     limit: int = 10,
     role: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
 ):
     if skip < 0 or limit <= 0:
         raise HTTPException(
@@ -46,17 +53,17 @@ def list_users(
             detail="Invalid pagination values"
         )
 
-    query = db.query(User)
+    query = filter_created(select(User), User, created_after, created_before)
     if role:
-        query = query.filter(User.role == role)
-    return query.offset(skip).limit(limit).all()
+        query = query.where(User.role == role)
+    return await keyset_page(db, query, User, response, cursor=cursor, limit=limit, skip=skip)
 
 # -----------------------------
 # GET USER BY ID
 # -----------------------------
 @router.get("/{user_id}", response_model=UserRead)
-def get_user(user_id: uuid.UUID, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def get_user(user_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -68,13 +75,13 @@ def get_user(user_id: uuid.UUID, db: Session = Depends(get_db)):
 # DELETE USER
 # -----------------------------
 @router.delete("/{user_id}", status_code=status.HTTP_200_OK)
-def delete_user(user_id: uuid.UUID, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def delete_user(user_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
     return {"message": "User deleted successfully"}
\ No newline at end of file
@@ -1,4 +1,5 @@
 from dotenv import load_dotenv
+import json
 import os
 from pydantic_settings import BaseSettings
 
@@ -12,6 +13,127 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 15))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
 
+    # Database connection pools (API and workers get separate pools)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 10.0))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_LOG_SAMPLE_RATE: float = float(os.getenv("DB_LOG_SAMPLE_RATE", 0.0))  # fraction of SQL statements logged
+    WORKER_DB_POOL_SIZE: int = int(os.getenv("WORKER_DB_POOL_SIZE", os.getenv("WORKER_DB_THREADS", 8)))
+    WORKER_DB_MAX_OVERFLOW: int = int(os.getenv("WORKER_DB_MAX_OVERFLOW", 4))
+
+    # Job execution
+    WORKER_CONCURRENCY: int = int(os.getenv("WORKER_CONCURRENCY", 16))  # concurrent jobs per pool (async tasks)
+    WORKER_DB_THREADS: int = int(os.getenv("WORKER_DB_THREADS", 8))
+    EMBEDDED_WORKERS: bool = os.getenv("EMBEDDED_WORKERS", "true").lower() == "true"
+    WORKER_POLL_INTERVAL: float = float(os.getenv("WORKER_POLL_INTERVAL", 2.0))
+    WORKER_HEARTBEAT_INTERVAL: float = float(os.getenv("WORKER_HEARTBEAT_INTERVAL", 10.0))
+    WORKER_ORPHAN_TIMEOUT: float = float(os.getenv("WORKER_ORPHAN_TIMEOUT", 60.0))
+    MAX_PENDING_JOBS: int = int(os.getenv("MAX_PENDING_JOBS", 0))  # 0 = unlimited
+    MAX_BATCH_JOBS: int = int(os.getenv("MAX_BATCH_JOBS", 1000))  # jobs per POST /jobs/batch
+    JOB_BATCH_PRIORITY: str = os.getenv("JOB_BATCH_PRIORITY", "bulk")
+
+    # Scheduling (priority classes, fair share between users)
+    JOB_PRIORITY_WEIGHTS: dict = json.loads(os.getenv("JOB_PRIORITY_WEIGHTS", '{"interactive": 8, "normal": 4, "bulk": 1}'))
+    JOB_DEFAULT_PRIORITY: str = os.getenv("JOB_DEFAULT_PRIORITY", "normal")
+    USER_MAX_RUNNING_JOBS: int = int(os.getenv("USER_MAX_RUNNING_JOBS", 0))  # 0 = unlimited
+    AGENT_MAX_RUNNING_JOBS: int = int(os.getenv("AGENT_MAX_RUNNING_JOBS", 0))  # 0 = unlimited
+    JOB_AGING_SECONDS: float = float(os.getenv("JOB_AGING_SECONDS", 600))  # waiting this long doubles a job's share
+    SCHEDULER_WINDOW: int = int(os.getenv("SCHEDULER_WINDOW", 500))  # queue heads considered per claim
+
+    # Inference (HuggingFace)
+    HF_TOKEN: str | None = os.getenv("HF_TOKEN")
+    HF_API_URL: str = os.getenv("HF_API_URL", "https://api-inference.huggingface.co/models")
+    HF_TIMEOUT: float = float(os.getenv("HF_TIMEOUT", 60.0))
+    HF_MODEL_TIMEOUTS: dict = json.loads(os.getenv("HF_MODEL_TIMEOUTS", "{}"))  # {"model-id": seconds}
+    HF_POOL_SIZE: int = int(os.getenv("HF_POOL_SIZE", 20))
+    HF_MAX_RETRIES: int = int(os.getenv("HF_MAX_RETRIES", 4))
+    HF_BACKOFF_BASE: float = float(os.getenv("HF_BACKOFF_BASE", 1.0))
+    HF_BACKOFF_MAX: float = float(os.getenv("HF_BACKOFF_MAX", 30.0))
+    HF_BREAKER_THRESHOLD: int = int(os.getenv("HF_BREAKER_THRESHOLD", 5))
+    HF_BREAKER_RESET: float = float(os.getenv("HF_BREAKER_RESET", 30.0))
+    HF_BATCHING_ENABLED: bool = os.getenv("HF_BATCHING_ENABLED", "false").lower() == "true"
+    HF_BATCH_MODELS: str = os.getenv("HF_BATCH_MODELS", "")  # comma separated; empty = all models
+    HF_BATCH_MAX_SIZE: int = int(os.getenv("HF_BATCH_MAX_SIZE", 8))
+    HF_BATCH_WINDOW_MS: float = float(os.getenv("HF_BATCH_WINDOW_MS", 20))
+    HF_BATCH_MAX_INFLIGHT: int = int(os.getenv("HF_BATCH_MAX_INFLIGHT", 4))
+
+    # Job event stream (GET /jobs/{id}/events)
+    JOB_EVENTS_NOTIFY: bool = os.getenv("JOB_EVENTS_NOTIFY", "true").lower() == "true"  # Postgres LISTEN/NOTIFY fan-out
+    JOB_EVENTS_CHANNEL: str = os.getenv("JOB_EVENTS_CHANNEL", "job_events")
+    JOB_EVENTS_RECONNECT_DELAY: float = float(os.getenv("JOB_EVENTS_RECONNECT_DELAY", 2.0))
+    SSE_KEEPALIVE_INTERVAL: float = float(os.getenv("SSE_KEEPALIVE_INTERVAL", 15.0))
+    STREAM_ALL_STAGES: bool = os.getenv("STREAM_ALL_STAGES", "false").lower() == "true"  # default: output stage only
+    TOKEN_FLUSH_INTERVAL: float = float(os.getenv("TOKEN_FLUSH_INTERVAL", 0.1))  # coalesce tokens into events
+    TOKEN_FLUSH_CHARS: int = int(os.getenv("TOKEN_FLUSH_CHARS", 512))
+
+    # Job event bus (state transitions and stage completions for downstream consumers)
+    EVENT_BUS_BACKEND: str = os.getenv("EVENT_BUS_BACKEND", "local")  # local | kafka
+    EVENT_BUS_FILE: str = os.getenv("EVENT_BUS_FILE", "var/event_bus/job_events.jsonl")  # local backend; empty = in-process only
+    EVENT_BUS_FILE_MAX_BYTES: int = int(os.getenv("EVENT_BUS_FILE_MAX_BYTES", 64 * 1024 * 1024))  # then rotated; 0 = never
+    EVENT_BUS_FILE_BACKUPS: int = int(os.getenv("EVENT_BUS_FILE_BACKUPS", 3))  # rotated segments kept (.1 newest)
+    EVENT_BUS_TOPIC: str = os.getenv("EVENT_BUS_TOPIC", "job-events")
+    EVENT_BUS_QUEUE_SIZE: int = int(os.getenv("EVENT_BUS_QUEUE_SIZE", 10000))  # events beyond this are dropped
+    EVENT_BUS_BATCH_SIZE: int = int(os.getenv("EVENT_BUS_BATCH_SIZE", 500))
+    EVENT_BUS_FLUSH_INTERVAL: float = float(os.getenv("EVENT_BUS_FLUSH_INTERVAL", 0.5))
+    KAFKA_BOOTSTRAP_SERVERS: str = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "kafka:9092")
+    KAFKA_LINGER_MS: int = int(os.getenv("KAFKA_LINGER_MS", 50))
+
+    # Event log (GET /events), written from the event bus
+    EVENT_LOG_ENABLED: bool = os.getenv("EVENT_LOG_ENABLED", "true").lower() == "true"
+    EVENT_LOG_RETENTION_DAYS: float = float(os.getenv("EVENT_LOG_RETENTION_DAYS", 30))  # 0 = keep forever
+    EVENT_LOG_COMPACT_DAYS: float = float(os.getenv("EVENT_LOG_COMPACT_DAYS", 7))  # older stage events dropped; 0 = never
+    EVENT_LOG_MAINTENANCE_INTERVAL: float = float(os.getenv("EVENT_LOG_MAINTENANCE_INTERVAL", 3600))
+    EVENT_LOG_DELETE_BATCH: int = int(os.getenv("EVENT_LOG_DELETE_BATCH", 5000))
+    EVENT_LOG_TAIL_INTERVAL: float = float(os.getenv("EVENT_LOG_TAIL_INTERVAL", 1.0))  # long-poll recheck period
+
+    # Audit log (create/update/delete of users, agents, tools, reports and jobs)
+    AUDIT_ENABLED: bool = os.getenv("AUDIT_ENABLED", "true").lower() == "true"
+    AUDIT_QUEUE_SIZE: int = int(os.getenv("AUDIT_QUEUE_SIZE", 10000))  # entries beyond this are dropped
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", 500))
+    AUDIT_FLUSH_INTERVAL: float = float(os.getenv("AUDIT_FLUSH_INTERVAL", 1.0))
+
+    # Uploaded documents
+    UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+    MAX_UPLOAD_BYTES: int = int(os.getenv("MAX_UPLOAD_BYTES", 100 * 1024 * 1024))  # 0 = unlimited
+    EXTRACT_PROCESSES: int = int(os.getenv("EXTRACT_PROCESSES", 2))  # PDF/DOCX text extraction, per worker
+    EXTRACT_DIR: str = os.getenv("EXTRACT_DIR", "var/extracted")  # extracted text of uploads, one file per document
+
+    # Content store for uploads, large inputs and reports (rows keep references only)
+    CONTENT_STORE_BACKEND: str = os.getenv("CONTENT_STORE_BACKEND", "local")
+    CONTENT_STORE_DIR: str = os.getenv("CONTENT_STORE_DIR", "var/content")
+    INLINE_TEXT_MAX_BYTES: int = int(os.getenv("INLINE_TEXT_MAX_BYTES", 4096))
+    REPORT_PREVIEW_CHARS: int = int(os.getenv("REPORT_PREVIEW_CHARS", 280))
+
+    # Report version history (snapshots + deltas)
+    REPORT_SNAPSHOT_INTERVAL: int = int(os.getenv("REPORT_SNAPSHOT_INTERVAL", 10))  # every Nth version is stored in full
+    REPORT_VERSION_CACHE_SIZE: int = int(os.getenv("REPORT_VERSION_CACHE_SIZE", 128))  # materialized versions kept in memory
+
+    # Report search (GET /reports/search)
+    SEARCH_CONFIG: str = os.getenv("SEARCH_CONFIG", "english")  # Postgres text search configuration
+    SEARCH_MAX_CHARS: int = int(os.getenv("SEARCH_MAX_CHARS", 200000))  # of each report's text that is indexed
+
+    # Large documents: chunked map-reduce pipeline
+    CHUNK_MAX_TOKENS: int = int(os.getenv("CHUNK_MAX_TOKENS", 1500))
+    CHUNK_OVERLAP_TOKENS: int = int(os.getenv("CHUNK_OVERLAP_TOKENS", 100))
+    CHUNK_THRESHOLD_TOKENS: int = int(os.getenv("CHUNK_THRESHOLD_TOKENS", 2500))  # larger inputs use the chunked pipeline
+    CHUNK_CONCURRENCY: int = int(os.getenv("CHUNK_CONCURRENCY", 8))  # per stage of one job
+    REDUCE_MAX_INPUT_TOKENS: int = int(os.getenv("REDUCE_MAX_INPUT_TOKENS", 2500))
+
+    # MCP tool result cache
+    TOOL_CACHE_ENABLED: bool = os.getenv("TOOL_CACHE_ENABLED", "true").lower() == "true"
+    TOOL_CACHE_MAX_ENTRIES: int = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", 1024))
+    TOOL_CACHE_TTL: float = float(os.getenv("TOOL_CACHE_TTL", 24 * 3600))
+    TOOL_CACHE_PERSISTENT: bool = os.getenv("TOOL_CACHE_PERSISTENT", "false").lower() == "true"
+    TOOL_CACHE_PERSISTENT_MAX_ROWS: int = int(os.getenv("TOOL_CACHE_PERSISTENT_MAX_ROWS", 100000))
+
+    # Telemetry
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "")  # JSONL span export; empty = tracing off
+    MODEL_COSTS: dict = json.loads(os.getenv("MODEL_COSTS", "{}"))  # {"model-id": price per 1k tokens}
+    WORKER_METRICS_PORT: int = int(os.getenv("WORKER_METRICS_PORT", 0))  # 0 = no /metrics server in workers
+
 settings = Settings()
 
 # ------------------------------------------
@@ -1,15 +1,9 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
 
-
-# Database engine
-engine = create_engine(DATABASE_URL)
-
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Database engine and session factory (shared with app.db.base)
+from .engine import engine, SessionLocal
 
 # Import your models
 from .base import Base
@@ -20,6 +14,9 @@ from .agent import Agent
 from .tool import Tool
 from .job import Job
 from .audit_log import AuditLog
+from .tool_cache import ToolCacheEntry
+from .job_stage import JobStage
+from .event_log import EventLogEntry
 
 __all__ = [
     "Base",
@@ -30,6 +27,9 @@ __all__ = [
     "Tool",
     "Job",
     "AuditLog",
+    "ToolCacheEntry",
+    "JobStage",
+    "EventLogEntry",
     "SessionLocal",
     "engine"
 ]
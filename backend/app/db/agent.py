@@ -1,12 +1,18 @@
 import sqlalchemy as sa
+import uuid
 import sqlalchemy.dialects.postgresql as pg
 from .base import Base
 from sqlalchemy.sql import func
 
 class Agent(Base):
     __tablename__ = "agents"
+    __table_args__ = (
+        # keyset pagination / list filters
+        sa.Index("ix_agents_created_at_id", "created_at", "id"),
+        sa.Index("ix_agents_created_by_created_at", "created_by", "created_at", "id"),
+    )
 
-    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=sa.text("gen_random_uuid()"))
+    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = sa.Column(sa.String(256), nullable=False)
     description = sa.Column(sa.Text)
     created_by = sa.Column(pg.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False)
@@ -1,20 +1,28 @@
 import sqlalchemy as sa
+import uuid
 import sqlalchemy.dialects.postgresql as pg
-from .base import Base
+from .base import Base, JSONB
 from sqlalchemy.sql import func
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # keyset pagination / list filters
+        sa.Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        sa.Index("ix_audit_logs_entity_created_at", "entity", "entity_id", "created_at"),
+        sa.Index("ix_audit_logs_user_id_created_at", "user_id", "created_at"),
+    )
 
-    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=sa.text("gen_random_uuid()"))
+    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    user_id = sa.Column(pg.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True)
+    # Entries outlive the user who made the change
+    user_id = sa.Column(pg.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
     entity = sa.Column(sa.String(64), nullable=False)        # user, report, job, tool, agent
     entity_id = sa.Column(pg.UUID(as_uuid=True), nullable=False)
 
     action = sa.Column(sa.String(64), nullable=False)        # create, update, delete
-    old_values = sa.Column(pg.JSONB)
-    new_values = sa.Column(pg.JSONB)
+    old_values = sa.Column(JSONB)
+    new_values = sa.Column(JSONB)
 
     created_at = sa.Column(sa.DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -1,18 +1,18 @@
 import os
-from sqlalchemy import create_engine
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
 load_dotenv()  # Load .env variables
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, echo=True)  # echo=True optional for logging
-
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# The one engine/session factory for the API lives in app.db.engine
+from app.db.engine import engine, SessionLocal
 
 # Base class for models
 Base = declarative_base()
+
+# JSONB on Postgres, plain JSON elsewhere (SQLite for local benchmarks)
+JSONB = sa.JSON().with_variant(pg.JSONB(), "postgresql")
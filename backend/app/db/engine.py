@@ -0,0 +1,189 @@
+# app/db/engine.py
+import logging
+import random
+import threading
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.services.telemetry.metrics import registry
+
+logger = logging.getLogger("app.db.sql")
+
+_engines: dict[str, Engine] = {}
+_stats: dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def _pool_options(role: str) -> dict:
+    """
+    Pool sizing per role. API requests and worker jobs get separate pools so
+    a burst of jobs can never starve request handling (and vice versa).
+    """
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return {}
+    if role == "worker":
+        size, overflow = settings.WORKER_DB_POOL_SIZE, settings.WORKER_DB_MAX_OVERFLOW
+    else:
+        size, overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    return {
+        "pool_size": size,
+        "max_overflow": overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def _connect_args() -> dict:
+    # SQLite (local benchmarks): connections move between API/worker threads
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return {"check_same_thread": False, "timeout": 30}
+    return {}
+
+
+def _sqlite_pragmas(engine: Engine):
+    """WAL lets readers run while a job writes; otherwise SQLite serializes everything."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=30000")
+        cursor.close()
+
+
+def _instrument(engine: Engine, role: str):
+    stats = _stats[role] = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidated": 0, "max_checked_out": 0}
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, record):
+        stats["connects"] += 1
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_conn, record, proxy):
+        stats["checkouts"] += 1
+        stats["max_checked_out"] = max(stats["max_checked_out"], stats["checkouts"] - stats["checkins"])
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_conn, record):
+        stats["checkins"] += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_conn, record, exception):
+        stats["invalidated"] += 1
+
+    if settings.DB_LOG_SAMPLE_RATE > 0:
+        # Replaces echo=True: only a sample of statements is logged
+        @event.listens_for(engine, "before_cursor_execute")
+        def _log_statement(conn, cursor, statement, parameters, context, executemany):
+            if random.random() < settings.DB_LOG_SAMPLE_RATE:
+                logger.info("[%s] %s", role, statement)
+
+
+def make_engine(role: str = "api") -> Engine:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(),
+        **_pool_options(role),
+    )
+    _sqlite_pragmas(engine)
+    _instrument(engine, role)
+    return engine
+
+
+def get_engine(role: str = "api") -> Engine:
+    """The process-wide engine for a role ("api" or "worker")."""
+    with _lock:
+        if role not in _engines:
+            _engines[role] = make_engine(role)
+        return _engines[role]
+
+
+# -----------------------------
+# ASYNC (API routers)
+# -----------------------------
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+_async_engine = None
+_async_sessionmaker = None
+
+
+def async_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the asyncio one (asyncpg)."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    return parsed.set(drivername=driver).render_as_string(hide_password=False) if driver else url
+
+
+def get_async_engine():
+    """
+    AsyncEngine for the API. Created on first use so scripts, alembic and
+    workers (sync path) do not need the asyncio driver installed.
+    """
+    global _async_engine
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    with _lock:
+        if _async_engine is None:
+            _async_engine = create_async_engine(
+                async_url(settings.DATABASE_URL),
+                echo=False,
+                pool_pre_ping=settings.DB_POOL_PRE_PING,
+                **_pool_options("api"),
+            )
+            _sqlite_pragmas(_async_engine.sync_engine)
+            _instrument(_async_engine.sync_engine, "api_async")
+            _engines["api_async"] = _async_engine.sync_engine
+        return _async_engine
+
+
+def AsyncSessionLocal():
+    """New AsyncSession; objects stay usable after commit (no implicit IO on access)."""
+    global _async_sessionmaker
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(get_async_engine(), expire_on_commit=False, autoflush=False)
+    return _async_sessionmaker()
+
+
+def pool_stats() -> dict:
+    result = {}
+    with _lock:
+        engines = dict(_engines)
+    for role, engine in engines.items():
+        pool = engine.pool
+        stats = dict(_stats.get(role, {}))
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, name):
+                stats[name] = getattr(pool, name)()
+        if "size" in stats and "checkedout" in stats:
+            capacity = stats["size"] + max(_pool_options(role.removesuffix("_async")).get("max_overflow", 0), 0)
+            stats["utilization"] = round(stats["checkedout"] / capacity, 4) if capacity else 0.0
+        result[role] = stats
+    return result
+
+
+engine = get_engine("api")
+worker_engine = get_engine("worker")
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+WorkerSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=worker_engine)
+
+
+DB_POOL_CONNECTIONS = registry.gauge("db_pool_connections", "Pooled DB connections by engine role and state", ("role", "state"))
+
+
+def _collect_pool_stats():
+    for role, stats in pool_stats().items():
+        for state in ("checkedout", "checkedin", "overflow"):
+            if state in stats:
+                DB_POOL_CONNECTIONS.set(stats[state], role=role, state=state)
+
+
+registry.add_collector(_collect_pool_stats)
@@ -0,0 +1,27 @@
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+from .base import Base, JSONB
+from sqlalchemy.sql import func
+
+class EventLogEntry(Base):
+    """Job lifecycle events from the event bus (GET /events)."""
+    __tablename__ = "event_log"
+    __table_args__ = (
+        # keyset pagination / time range
+        sa.Index("ix_event_log_created_at_id", "created_at", "id"),
+        sa.Index("ix_event_log_job_id_created_at", "job_id", "created_at"),
+        sa.Index("ix_event_log_user_id_created_at", "user_id", "created_at"),
+    )
+
+    # Insertion order, so live tails can ask for everything after an id
+    id = sa.Column(sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True)
+
+    job_id = sa.Column(pg.UUID(as_uuid=True), nullable=True)
+    user_id = sa.Column(pg.UUID(as_uuid=True), nullable=True)
+
+    type = sa.Column(sa.String(32), nullable=False)      # status, stage
+    status = sa.Column(sa.String(32))
+    stage = sa.Column(sa.String(64))
+    data = sa.Column(JSONB)                              # the rest of the event
+
+    created_at = sa.Column(sa.DateTime(timezone=True), server_default=func.now())  # when the event happened
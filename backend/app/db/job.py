@@ -1,11 +1,24 @@
 import sqlalchemy as sa
 import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from .base import Base
 import uuid
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        sa.Index("ix_jobs_status_created_at", "status", "created_at"),
+        # scheduler: queue position
+        sa.Index("ix_jobs_status_priority_created_at", "status", "priority", "created_at"),
+        # scheduler: seek from one pending queue head to the next
+        sa.Index("ix_jobs_status_queue_created_at", "status", "created_by", "agent_id", "priority", "created_at", "id"),
+        # keyset pagination / list filters
+        sa.Index("ix_jobs_created_at_id", "created_at", "id"),
+        sa.Index("ix_jobs_created_by_created_at", "created_by", "created_at", "id"),
+        sa.Index("ix_jobs_agent_id_created_at", "agent_id", "created_at", "id"),
+        sa.Index("ix_jobs_batch_id_status", "batch_id", "status"),
+    )
 
     id = sa.Column(
         pg.UUID(as_uuid=True),
@@ -16,12 +29,27 @@ class Job(Base):
 
     agent_id = sa.Column(pg.UUID(as_uuid=True), sa.ForeignKey("agents.id"), nullable=False)
     created_by = sa.Column(pg.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False)
+    batch_id = sa.Column(pg.UUID(as_uuid=True), nullable=True)  # set for jobs created by POST /jobs/batch
 
-    input_data = sa.Column(sa.JSON)
-    output_data = sa.Column(sa.JSON)
+    # Documents and reports can be large: only loaded when accessed or undeferred
+    input_data = deferred(sa.Column(sa.JSON), group="payload")
+    output_data = deferred(sa.Column(sa.JSON), group="payload")
+    options = sa.Column(sa.JSON)   # per-job execution flags, e.g. {"bypass_cache": true}
 
     status = sa.Column(sa.String(32), server_default="pending")
     progress = sa.Column(sa.Integer, server_default="0")
+    priority = sa.Column(sa.String(16), nullable=False, server_default="normal")  # JOB_PRIORITY_WEIGHTS class
+
+    # Worker bookkeeping (claimed_by / liveness for orphan recovery)
+    worker_id = sa.Column(sa.String(128), nullable=True)
+    heartbeat_at = sa.Column(sa.DateTime(timezone=True), nullable=True)
+    started_at = sa.Column(sa.DateTime(timezone=True), nullable=True)
+    finished_at = sa.Column(sa.DateTime(timezone=True), nullable=True)
 
     created_at = sa.Column(sa.DateTime(timezone=True), server_default=func.now())
     updated_at = sa.Column(sa.DateTime(timezone=True), onupdate=func.now())
+
+
+def job_uuid(job_id) -> uuid.UUID:
+    """A job id (UUID or its string form) as the UUID columns expect it; SQLite rejects strings."""
+    return job_id if isinstance(job_id, uuid.UUID) else uuid.UUID(str(job_id))
@@ -0,0 +1,17 @@
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+from .base import Base
+from sqlalchemy.sql import func
+
+class JobStage(Base):
+    """Checkpoint of one finished pipeline stage; a retried job skips these stages."""
+    __tablename__ = "job_stages"
+
+    job_id = sa.Column(pg.UUID(as_uuid=True), sa.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    stage = sa.Column(sa.String(64), primary_key=True)
+    pipeline = sa.Column(sa.String(32), nullable=False)
+
+    output_ref = sa.Column(sa.String(64), nullable=False)  # sha256 in the content store (JSON encoded output)
+    output_size = sa.Column(sa.BigInteger)
+
+    created_at = sa.Column(sa.DateTime(timezone=True), server_default=func.now())
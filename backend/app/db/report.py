@@ -1,15 +1,28 @@
 import sqlalchemy as sa
+import uuid
 import sqlalchemy.dialects.postgresql as pg
-from .base import Base
+from .base import Base, JSONB
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 class Report(Base):
     __tablename__ = "reports"
-    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=sa.text("gen_random_uuid()"))
+    __table_args__ = (
+        # keyset pagination / list filters
+        sa.Index("ix_reports_created_at_id", "created_at", "id"),
+        sa.Index("ix_reports_created_by_created_at", "created_by", "created_at", "id"),
+        sa.Index("ix_reports_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = sa.Column(sa.String(512), nullable=False)
     summary = sa.Column(sa.Text)
     created_by = sa.Column(pg.UUID(as_uuid=True), sa.ForeignKey("users.id"))
     current_version_id = sa.Column(pg.UUID(as_uuid=True), nullable=True)
-    report_metadata= sa.Column(pg.JSONB)
+    report_metadata= sa.Column(JSONB)
+
+    # Full-text search (GET /reports/search): title (A), summary (B) and the
+    # current version's text (C); kept up to date by app.services.search
+    search_vector = deferred(sa.Column(pg.TSVECTOR().with_variant(sa.Text(), "sqlite")))
+
     created_at = sa.Column(sa.DateTime(timezone=True), server_default=func.now())
     updated_at = sa.Column(sa.DateTime(timezone=True), onupdate=func.now())
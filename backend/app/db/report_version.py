@@ -1,16 +1,31 @@
 import sqlalchemy as sa
+import uuid
 import sqlalchemy.dialects.postgresql as pg
-from .base import Base
+from .base import Base, JSONB
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 class ReportVersion(Base):
     __tablename__ = "report_versions"
+    __table_args__ = (
+        # keyset pagination / list filters
+        sa.Index("ix_report_versions_report_id_version", "report_id", "version_number"),
+        sa.Index("ix_report_versions_created_at_id", "created_at", "id"),
+    )
 
-    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=sa.text("gen_random_uuid()"))
+    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     report_id = sa.Column(pg.UUID(as_uuid=True), sa.ForeignKey("reports.id"), nullable=False)
 
-    content = sa.Column(sa.Text)
-    report_metadata = sa.Column(pg.JSONB)   # <- fixed indentation
+    content = sa.Column(sa.Text)            # legacy inline body
+    content_ref = sa.Column(sa.String(64))  # sha256 in the content store (snapshots)
+    content_size = sa.Column(sa.BigInteger)  # full text size, also for deltas
+
+    # Delta versions: zlib-compressed edit script against version `base_version`
+    # (NULL delta = full snapshot in content / content_ref)
+    base_version = sa.Column(sa.Integer)
+    delta = deferred(sa.Column(sa.LargeBinary))
+
+    report_metadata = sa.Column(JSONB)   # <- fixed indentation
 
     version_number = sa.Column(sa.Integer, nullable=False)
 
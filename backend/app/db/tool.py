@@ -1,15 +1,21 @@
 import sqlalchemy as sa
+import uuid
 import sqlalchemy.dialects.postgresql as pg
-from .base import Base
+from .base import Base, JSONB
 from sqlalchemy.sql import func
 
 class Tool(Base):
     __tablename__ = "tools"
+    __table_args__ = (
+        # keyset pagination / list filters
+        sa.Index("ix_tools_created_at_id", "created_at", "id"),
+        sa.Index("ix_tools_agent_id_created_at", "agent_id", "created_at", "id"),
+    )
 
-    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=sa.text("gen_random_uuid()"))
+    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = sa.Column(sa.String(256), nullable=False)
     type = sa.Column(sa.String(128), nullable=False)
-    config = sa.Column(pg.JSONB)
+    config = sa.Column(JSONB)
 
     agent_id = sa.Column(pg.UUID(as_uuid=True), sa.ForeignKey("agents.id"), nullable=True)
 
@@ -0,0 +1,15 @@
+import sqlalchemy as sa
+from .base import Base
+from sqlalchemy.sql import func
+
+class ToolCacheEntry(Base):
+    __tablename__ = "tool_cache"
+
+    key = sa.Column(sa.String(64), primary_key=True)   # sha256 of (tool, model, prompt, params)
+    tool = sa.Column(sa.String(128), nullable=False)
+    model = sa.Column(sa.String(256), nullable=False)
+    value = sa.Column(sa.Text, nullable=False)
+
+    hits = sa.Column(sa.Integer, nullable=False, server_default="0")
+    created_at = sa.Column(sa.DateTime(timezone=True), server_default=func.now())
+    expires_at = sa.Column(sa.DateTime(timezone=True), nullable=False, index=True)
@@ -1,12 +1,17 @@
 import sqlalchemy as sa
+import uuid
 import sqlalchemy.dialects.postgresql as pg
 from .base import Base
 from sqlalchemy.sql import func
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # keyset pagination / list filters
+        sa.Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
-    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=sa.text("gen_random_uuid()"))
+    id = sa.Column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     full_name = sa.Column(sa.String(256), nullable=False)
     email = sa.Column(sa.String(256), unique=True, nullable=False, index=True)
     role = sa.Column(sa.String(32), nullable=False, server_default="analyst")
@@ -3,8 +3,9 @@ from fastapi import Header, HTTPException, status
 from app.auth import verify_token
 
 from app.db.base import SessionLocal
+from app.db.engine import AsyncSessionLocal
 
-# Database dependency
+# Database dependency (sync; scripts and legacy callers)
 def get_db():
     db = SessionLocal()
     try:
@@ -12,6 +13,11 @@ def get_db():
     finally:
         db.close()
 
+# Async database dependency used by the API routers
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Role-based access dependency
 def require_role(token: str = Header(...), allowed_roles: list = []):
     if token.startswith("Bearer "):
@@ -6,12 +6,49 @@ from app.api.agent_router import router as agent_router
 from app.api.report_router import router as report_router
 from app.api.tool_router import router as tool_router
 from app.api.job_router import router as job_router
+from app.api.system_router import router as system_router, metrics_router
+from app.api.event_router import router as event_router
+from app.config import settings
+from app.services.worker_pool import worker_pool
+from app.services.event_bus import event_bus
+from app.services.event_log import event_log
+from app.services.audit import AuditContextMiddleware, audit_writer
 
 app = FastAPI(title="Multi Agent Research Backend")
+app.add_middleware(AuditContextMiddleware)
 
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(agent_router)
 app.include_router(report_router)
 app.include_router(tool_router)
-app.include_router(job_router)
\ No newline at end of file
+app.include_router(job_router)
+app.include_router(system_router)
+app.include_router(event_router)
+app.include_router(metrics_router)
+
+# Run a worker pool inside the API process unless workers are deployed
+# separately (`python -m app.worker`)
+@app.on_event("startup")
+def start_workers():
+    if settings.EMBEDDED_WORKERS:
+        worker_pool.start()
+
+@app.on_event("shutdown")
+def stop_workers():
+    if settings.EMBEDDED_WORKERS:
+        worker_pool.stop()
+
+@app.on_event("startup")
+def start_event_log():
+    if settings.EVENT_LOG_ENABLED:
+        event_log.start()
+
+@app.on_event("shutdown")
+def close_event_bus():
+    event_bus.close()
+
+# After the workers stopped, so their last writes are in
+@app.on_event("shutdown")
+def flush_audit_log():
+    audit_writer.close()
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+class EventRead(BaseModel):
+    id: int
+    job_id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    type: str
+    status: Optional[str] = None
+    stage: Optional[str] = None
+    data: Optional[Any] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
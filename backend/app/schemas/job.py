@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID
 
@@ -7,6 +8,49 @@ class JobCreate(BaseModel):
     created_by: UUID
     input_data: Optional[Any] = None
 
+class JobSummary(BaseModel):
+    """List view: scalar columns only, never the input document or report."""
+    id: UUID
+    agent_id: UUID
+    created_by: UUID
+    status: str
+    progress: int
+    priority: Optional[str] = None
+    batch_id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JobBatchCreated(BaseModel):
+    batch_id: UUID
+    job_ids: list[UUID]
+
+class JobBatchStatus(BaseModel):
+    batch_id: UUID
+    total: int
+    statuses: dict[str, int]   # job count per status
+    progress: int              # 0-100 over the whole batch
+    done: bool
+
+class JobStageRead(BaseModel):
+    """A checkpointed pipeline stage; retries resume after these."""
+    stage: str
+    pipeline: str
+    output_size: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JobReport(BaseModel):
+    job_id: UUID
+    status: str
+    final_report: Optional[str] = None
+    error: Optional[str] = None
+
 class JobRead(BaseModel):
     id: UUID
     agent_id: UUID
@@ -15,6 +59,11 @@ class JobRead(BaseModel):
     output_data: Optional[Any] = None
     status: str
     progress: int
+    priority: Optional[str] = None
+    batch_id: Optional[UUID] = None
+    # Pending jobs only: estimated place in the queue and seconds until it starts
+    queue_position: Optional[int] = None
+    eta_seconds: Optional[float] = None
 
     class Config:
         from_attributes = True  # Pydantic v2
@@ -1,4 +1,6 @@
 from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Optional
 from uuid import UUID
 
 class ReportCreate(BaseModel):
@@ -16,3 +18,32 @@ class ReportRead(BaseModel):
     model_config = {
         "from_attributes": True
     }
+
+
+class ReportSearchHit(BaseModel):
+    id: UUID
+    title: str
+    summary: Optional[str] = None
+    created_by: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    rank: float
+    snippet: str = ""   # matched terms wrapped in <b>...</b>
+
+
+class ReportVersionCreate(BaseModel):
+    content: str
+    report_metadata: Optional[Any] = None
+
+
+class ReportVersionRead(BaseModel):
+    id: UUID
+    report_id: UUID
+    version_number: int
+    content_size: Optional[int] = None
+    base_version: Optional[int] = None   # set for delta-stored versions
+    report_metadata: Optional[Any] = None
+    created_at: Optional[datetime] = None
+
+    model_config = {
+        "from_attributes": True
+    }
@@ -1,73 +1,224 @@
+import asyncio
+import time
 from app.services.mcp.registry import tool_registry
+from app.services.mcp.base import stream_tokens
+# Importing the tool modules registers them
 from app.services.mcp.ingestion import IngestionInput
 from app.services.mcp.research import ResearchInput
 from app.services.mcp.citation import CitationInput
 from app.services.mcp.formatter import FormatterInput
 from app.services.mcp.compliance import ComplianceInput
+from app.services.mcp.reducer import ReducerInput
+from app.config import settings
+from app.services.chunking import group_for_reduce, iter_chunks
+from app.services.pipeline import DEFAULT_PIPELINE, PipelineDAG, Stage, split_sections
+from app.services.telemetry import tracer
+from app.services.telemetry.metrics import STAGE_DURATION
 
-class AgentOrchestrator:
 
-    # Run a single tool for debugging
-    def run_single(self, tool_name: str, text: str):
-        tool = tool_registry.get(tool_name)
+def _output_text(result) -> str:
+    # Every tool output schema has exactly one text field
+    return next(iter(result.dict().values())) if result else ""
+
 
-        input_map = {
-            "ingestion": IngestionInput(text=text),
-            "research": ResearchInput(text=text),
-            "citation": CitationInput(text=text),
-            "formatting": FormatterInput(text=text),
-            "compliance": ComplianceInput(text=text),
-        }
+class AgentOrchestrator:
 
-        result = tool.run(input_map[tool_name])
+    def _tool(self, tool_name: str):
+        tool = tool_registry.get(tool_name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {tool_name}")
+        return tool
 
-        # Return the one output field
-        return next(iter(result.dict().values()))
+    # Run a single tool for debugging
+    def run_single(self, tool_name: str, text: str):
+        tool = self._tool(tool_name)
+        return _output_text(tool.run(tool.InputSchema(text=text)))
 
     # -----------------------------
     # FULL ORCHESTRATION PIPELINE
     # -----------------------------
-    def run(self, raw_text: str) -> str:
+    def run(self, raw_text: str, dag: PipelineDAG = DEFAULT_PIPELINE) -> str:
         """
-        Runs the full 5-step LLM pipeline and returns ONLY
-        the final safe report text (string).
-        This ensures job_runner can save the report properly.
+        Runs the full pipeline and returns ONLY the final safe report text
+        (string). Blocking wrapper around execute() for scripts/debugging.
         """
+        return asyncio.run(self.execute(dag, raw_text))
+
+    async def execute(
+        self,
+        dag: PipelineDAG,
+        raw_text: str,
+        *,
+        on_stage_complete=None,
+        before_stage=None,
+        on_token=None,
+        completed: dict | None = None,
+    ) -> str:
+        """
+        Run a pipeline DAG on the current event loop.
+
+        Every stage starts as soon as all of its dependencies finished, so
+        independent branches (and the sections of a split stage) run
+        concurrently. A split stage fed by another split stage goes section
+        by section instead: its section k starts when section k upstream is
+        done. `before_stage(stage)` may raise to abort (cancellation);
+        `on_stage_complete(stage, output)` is awaited after each stage.
+        With `on_token(stage, text)`, the output stage (every single-call
+        stage with STREAM_ALL_STAGES) streams its generated text through it.
+        `completed` ({stage: output}, from checkpoints) marks stages that
+        already ran: they are skipped and their outputs fed to the rest.
+        """
+        outputs: dict[str, str | list[str]] = dict(completed or {})
+        tasks: dict[str, asyncio.Task] = {}
+        # Split stages publish their per-section tasks here once they start
+        loop = asyncio.get_running_loop()
+        sections = {stage.name: loop.create_future() for stage in dag.stages if stage.split_sections}
+
+        async def run_stage(stage: Stage):
+            if stage.name in outputs:
+                return
+            source = self._section_source(dag, stage, outputs)
+            if source:
+                upstream = await sections[source]
+            elif stage.depends_on:
+                await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+            if before_stage:
+                before_stage(stage)
+            text = upstream if source else self._stage_input(stage, raw_text, outputs)
+            started = time.monotonic()
+            with tracer.span("stage", pipeline=dag.name, stage=stage.name, tool=stage.tool) as span:
+                if on_token and self._streams(dag, stage):
+                    async def sink(piece, stage=stage):
+                        await on_token(stage, piece)
+
+                    with stream_tokens(sink):
+                        output = await self._arun_stage(stage, text)
+                else:
+                    output = await self._arun_stage(stage, text, sections.get(stage.name))
+                if source:
+                    # Every upstream section is done; wait for its completion hooks too
+                    await tasks[source]
+                outputs[stage.name] = self._check(stage, output)
+                if span is not None:
+                    span.set_attribute("items", len(output) if isinstance(output, list) else 1)
+            STAGE_DURATION.observe(time.monotonic() - started, pipeline=dag.name, stage=stage.name, tool=stage.tool)
+            if on_stage_complete:
+                await on_stage_complete(stage, outputs[stage.name])
+
+        for stage in dag.order:
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return outputs[dag.output]
+
+    @staticmethod
+    def _section_source(dag: PipelineDAG, stage: Stage, outputs: dict) -> str | None:
+        """The split stage whose sections `stage` takes over one to one, if any."""
+        if not stage.split_sections or len(stage.depends_on) != 1:
+            return None
+        dep = next(s for s in dag.stages if s.name == stage.depends_on[0])
+        # Restored from a checkpoint: only the joined text is left, split it again
+        if not dep.split_sections or dep.name in outputs:
+            return None
+        return dep.name
+
+    @staticmethod
+    def _streams(dag: PipelineDAG, stage: Stage) -> bool:
+        # Fan-out stages produce many interleaved generations; only single calls stream
+        if stage.split_sections or stage.map_chunks or stage.reduce:
+            return False
+        return stage.name == dag.output or settings.STREAM_ALL_STAGES
+
+    async def _arun_stage(self, stage: Stage, text, published: asyncio.Future | None = None) -> str | list[str]:
+        """
+        `text` is the stage input, or for a split stage fed section by section
+        the upstream section tasks. A split stage publishes its own section
+        tasks to `published`.
+        """
+        tool = self._tool(stage.tool)
+
+        if stage.split_sections:
+            if not (text and isinstance(text[0], asyncio.Future)):
+                text = split_sections("\n\n".join(text) if isinstance(text, list) else text)
+            return "\n\n".join(await self._sections(tool, text, published))
+
+        if stage.reduce:
+            return await self._reduce(tool, text if isinstance(text, list) else [text])
+
+        if stage.map_chunks:
+            chunks = text if isinstance(text, list) else list(
+                iter_chunks(text, settings.CHUNK_MAX_TOKENS, settings.CHUNK_OVERLAP_TOKENS)
+            )
+            return await self._map(tool, chunks)
+
+        if isinstance(text, list):
+            text = "\n\n".join(text)
+        return _output_text(await tool.arun(tool.InputSchema(text=text)))
+
+    async def _map(self, tool, texts: list[str]) -> list[str]:
+        """Run the tool over every text concurrently (bounded per stage)."""
+        limit = asyncio.Semaphore(settings.CHUNK_CONCURRENCY)
+
+        async def one(text):
+            async with limit:
+                return _output_text(await tool.arun(tool.InputSchema(text=text)))
+
+        return list(await asyncio.gather(*(one(t) for t in texts)))
+
+    async def _sections(self, tool, parts: list, published: asyncio.Future | None) -> list[str]:
+        """
+        Like _map, but `parts` may be tasks yielding the texts: every section
+        starts as soon as its own input is ready.
+        """
+        limit = asyncio.Semaphore(settings.CHUNK_CONCURRENCY)
+
+        async def one(part):
+            text = await part if isinstance(part, asyncio.Future) else part
+            async with limit:
+                return _output_text(await tool.arun(tool.InputSchema(text=text)))
+
+        section_tasks = [asyncio.ensure_future(one(part)) for part in parts]
+        if published is not None and not published.done():
+            published.set_result(section_tasks)
+        try:
+            return list(await asyncio.gather(*section_tasks))
+        except BaseException:
+            for task in section_tasks:
+                task.cancel()
+            raise
+
+    async def _reduce(self, tool, texts: list[str]) -> str:
+        """
+        Tree reduction: merge groups of partial results that fit one prompt,
+        level by level, until a single text is left.
+        """
+        while len(texts) > 1:
+            groups = group_for_reduce(texts, settings.REDUCE_MAX_INPUT_TOKENS)
+            if len(groups) == len(texts):
+                # Every text alone fills the budget; still merge pairwise so we converge
+                groups = [texts[i:i + 2] for i in range(0, len(texts), 2)]
+            texts = await self._map(tool, ["\n\n---\n\n".join(g) for g in groups])
+        return texts[0] if texts else ""
+
+    @staticmethod
+    def _stage_input(stage: Stage, raw_text: str, outputs: dict) -> str | list[str]:
+        if not stage.depends_on:
+            return raw_text
+        if len(stage.depends_on) == 1:
+            return outputs[stage.depends_on[0]]
+        parts = []
+        for dep in stage.depends_on:
+            out = outputs[dep]
+            parts.append("\n\n".join(out) if isinstance(out, list) else out)
+        return "\n\n".join(parts)
 
-        # 1. INGESTION
-        ingestion = tool_registry.get("ingestion").run(
-            IngestionInput(text=raw_text)
-        )
-        if not ingestion or not ingestion.content:
-            raise ValueError("Ingestion tool produced no content")
-
-        # 2. RESEARCH
-        research = tool_registry.get("research").run(
-            ResearchInput(text=ingestion.content)
-        )
-        if not research or not research.notes:
-            raise ValueError("Research tool failed to generate notes")
-
-        # 3. CITATION CHECKING
-        citation = tool_registry.get("citation").run(
-            CitationInput(text=research.notes)
-        )
-        if not citation or not citation.cited_text:
-            raise ValueError("Citation tool failed to generate cited text")
-
-        # 4. FORMATTING
-        formatted = tool_registry.get("formatter").run(
-            FormatterInput(text=citation.cited_text)
-        )
-        if not formatted or not formatted.formatted:
-            raise ValueError("Formatter tool failed to format text")
-
-        # 5. COMPLIANCE (PII removal, safe output)
-        compliance = tool_registry.get("compliance").run(
-            ComplianceInput(text=formatted.formatted)
-        )
-        if not compliance or not compliance.safe_text:
-            raise ValueError("Compliance tool failed to produce safe text")
-
-        # Return ONLY the final safe text so DB can store it
-        return compliance.safe_text
+    @staticmethod
+    def _check(stage: Stage, output: str | list[str]) -> str | list[str]:
+        if not output or (isinstance(output, list) and not all(output)):
+            raise ValueError(f"{stage.name} stage ({stage.tool} tool) produced no output")
+        return output
@@ -0,0 +1,351 @@
+# app/services/audit.py
+import logging
+import queue
+import threading
+import uuid
+from contextvars import ContextVar
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import event as sa_event
+from sqlalchemy import inspect, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import BindParameter
+
+from app.auth import verify_token
+from app.config import settings
+from app.db.agent import Agent
+from app.db.audit_log import AuditLog
+from app.db.engine import WorkerSessionLocal
+from app.db.job import Job
+from app.db.report import Report
+from app.db.tool import Tool
+from app.db.user import User
+from app.services.telemetry.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+AUDIT_ENTRIES = registry.counter("audit_entries_total", "Audit log entries by outcome", ("result",))
+
+# Audited models -> AuditLog.entity, and columns never copied into the log
+AUDITED = {User: "user", Agent: "agent", Tool: "tool", Report: "report", Job: "job"}
+EXCLUDED_COLUMNS = {
+    User: {"hashed_password"},
+    Job: {"input_data", "output_data", "progress", "heartbeat_at"},
+    Report: {"search_vector"},
+}
+
+# Session.info key for entries held back until the transaction commits
+_PENDING_KEY = "audit_pending"
+
+# Authorization header of the current request (set by AuditContextMiddleware);
+# only decoded when the request actually writes something audited
+_authorization: ContextVar[bytes | None] = ContextVar("audit_authorization", default=None)
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return str(value)
+
+
+def _actor() -> uuid.UUID | None:
+    header = _authorization.get()
+    if not header:
+        return None
+    header = header.decode("latin-1")
+    payload = verify_token(header[len("Bearer "):]) if header.startswith("Bearer ") else None
+    try:
+        return uuid.UUID(payload["sub"]) if payload else None
+    except (KeyError, ValueError):
+        return None
+
+
+class AuditContextMiddleware:
+    """ASGI middleware that makes the caller's identity available to audit entries."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = _authorization.set(dict(scope["headers"]).get(b"authorization"))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _authorization.reset(token)
+
+
+class AuditWriter:
+    """
+    Writes audit entries off the request path.
+
+    Entries are collected from ORM flushes, multi-row INSERTs and bulk
+    UPDATE / DELETE statements of the audited models, held on the session
+    until it commits (dropped on rollback), then put on a bounded queue. A
+    background thread writes them with one multi-row INSERT per batch
+    (AUDIT_BATCH_SIZE, at least every AUDIT_FLUSH_INTERVAL). A full queue
+    drops entries and counts them rather than slowing requests down;
+    close() flushes what is left on shutdown.
+    """
+
+    def __init__(self, queue_size: int = 10000, batch_size: int = 500, flush_interval: float = 1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def submit(self, entries: list[dict]):
+        self._ensure_flusher()
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                AUDIT_ENTRIES.inc(result="dropped")
+
+    def _ensure_flusher(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._flush_forever, name="audit-flusher", daemon=True)
+            self._thread.start()
+
+    def _next_batch(self) -> list[dict]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush_forever(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._write(batch)
+                AUDIT_ENTRIES.inc(len(batch), result="written")
+            except Exception:
+                AUDIT_ENTRIES.inc(len(batch), result="failed")
+                logger.exception("Failed to write %d audit entries", len(batch))
+
+    def _write(self, batch: list[dict]):
+        db = WorkerSessionLocal()
+        try:
+            try:
+                db.execute(insert(AuditLog), batch)
+                db.commit()
+            except IntegrityError:
+                # An actor that no longer exists (user_id is a foreign key); keep the entries without it
+                db.rollback()
+                actors = {entry["user_id"] for entry in batch if entry["user_id"]}
+                existing = set(db.scalars(select(User.id).where(User.id.in_(actors)))) if actors else set()
+                batch = [
+                    {**entry, "user_id": entry["user_id"] if entry["user_id"] in existing else None}
+                    for entry in batch
+                ]
+                db.execute(insert(AuditLog), batch)
+                db.commit()
+        finally:
+            db.close()
+
+    def close(self, timeout: float = 10.0):
+        """Flush what is queued and stop the flusher thread."""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+audit_writer = AuditWriter(
+    queue_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+)
+
+
+# -----------------------------
+# CAPTURE (ORM events)
+# -----------------------------
+def _entry(model, entity_id, action: str, actor, old_values=None, new_values=None) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "user_id": actor,
+        "entity": AUDITED[model],
+        "entity_id": entity_id,
+        "action": action,
+        "old_values": old_values,
+        "new_values": new_values,
+    }
+
+
+def _values(model, values: dict) -> dict:
+    excluded = EXCLUDED_COLUMNS.get(model, ())
+    return {k: _jsonable(v) for k, v in values.items() if k not in excluded}
+
+
+def _loaded_columns(obj) -> dict:
+    # Only what is already loaded; never emits SQL from inside a flush
+    state = inspect(obj)
+    return {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+
+
+def _changes(obj) -> tuple[dict, dict]:
+    state = inspect(obj)
+    old, new = {}, {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if history.has_changes():
+            old[attr.key] = history.deleted[0] if history.deleted else None
+            new[attr.key] = history.added[0] if history.added else None
+    return old, new
+
+
+def _hold(session, entries: list[dict]):
+    if entries:
+        session.info.setdefault(_PENDING_KEY, []).extend(entries)
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _capture_flush(session, flush_context):
+    if not settings.AUDIT_ENABLED:
+        return
+    audited = [obj for obj in (*session.new, *session.dirty, *session.deleted) if type(obj) in AUDITED]
+    if not audited:
+        return
+    # Without a caller (workers, scripts) the owner of the row is the actor
+    actor = _actor()
+    entries = []
+    for obj in audited:
+        model = type(obj)
+        values = _loaded_columns(obj)
+        who = actor or values.get("created_by")
+        if obj in session.new:
+            entries.append(_entry(model, obj.id, "create", who, new_values=_values(model, values)))
+        elif obj in session.deleted:
+            entries.append(_entry(model, obj.id, "delete", who, old_values=_values(model, values)))
+        else:
+            old, new = _changes(obj)
+            new = _values(model, new)
+            if new:
+                entries.append(_entry(model, obj.id, "update", who, old_values=_values(model, old), new_values=new))
+    _hold(session, entries)
+
+
+@sa_event.listens_for(Session, "do_orm_execute")
+def _capture_bulk(orm_execute_state):
+    """
+    Statements that bypass the flush: multi-row INSERTs (POST /jobs/batch)
+    and bulk UPDATE / DELETE, such as the worker's job state transitions.
+    """
+    if not settings.AUDIT_ENABLED:
+        return
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    model = mapper.class_ if mapper is not None else None
+    if model not in AUDITED:
+        return
+    if orm_execute_state.is_insert:
+        _capture_insert(orm_execute_state, model)
+    elif orm_execute_state.is_update:
+        _capture_update(orm_execute_state, mapper, model)
+    else:
+        _capture_delete(orm_execute_state, mapper, model)
+
+
+def _capture_insert(orm_execute_state, model):
+    params = orm_execute_state.parameters
+    rows = params if isinstance(params, list) else [params] if params else []
+    actor = _actor()
+    _hold(orm_execute_state.session, [
+        _entry(model, row["id"], "create", actor or row.get("created_by"), new_values=_values(model, row))
+        for row in rows
+        if row.get("id")
+    ])
+
+
+def _affected(orm_execute_state, mapper, model, columns: list):
+    """
+    The rows a bulk UPDATE / DELETE is about to change, read with its own
+    WHERE clause before it runs. On Postgres they are locked (FOR UPDATE),
+    so the statement changes exactly these rows and their old values hold.
+    """
+    statement = orm_execute_state.statement
+    owner = [mapper.columns["created_by"]] if "created_by" in mapper.columns else []
+    query = select(mapper.columns["id"], *owner, *columns)
+    if statement.whereclause is not None:
+        query = query.where(statement.whereclause)
+    session = orm_execute_state.session
+    if session.get_bind(mapper=mapper).dialect.name == "postgresql":
+        query = query.with_for_update()
+    return session.execute(query).mappings().all()
+
+
+def _capture_update(orm_execute_state, mapper, model):
+    # Literal SET values only; expressions (hits + 1, progress kept as is) are not recorded
+    assigned = {}
+    for column, value in orm_execute_state.statement._values.items():
+        if isinstance(value, BindParameter):
+            key = column if isinstance(column, str) else mapper.get_property_by_column(column).key
+            assigned[key] = value.value
+    assigned = {k: v for k, v in assigned.items() if k not in EXCLUDED_COLUMNS.get(model, ())}
+    # Heartbeats and progress writes change excluded columns only: no extra query
+    if not assigned:
+        return
+
+    rows = _affected(orm_execute_state, mapper, model, [mapper.columns[key] for key in assigned])
+    actor = _actor()
+    entries = []
+    for row in rows:
+        old = {k: row[k] for k in assigned if row[k] != assigned[k]}
+        if old:
+            new = {k: assigned[k] for k in old}
+            entries.append(_entry(
+                model, row["id"], "update", actor or row.get("created_by"),
+                old_values=_values(model, old), new_values=_values(model, new),
+            ))
+    _hold(orm_execute_state.session, entries)
+
+
+def _capture_delete(orm_execute_state, mapper, model):
+    excluded = EXCLUDED_COLUMNS.get(model, ())
+    columns = [column for key, column in mapper.columns.items() if key not in excluded and key not in ("id", "created_by")]
+    rows = _affected(orm_execute_state, mapper, model, columns)
+    actor = _actor()
+    _hold(orm_execute_state.session, [
+        _entry(model, row["id"], "delete", actor or row.get("created_by"), old_values=_values(model, dict(row)))
+        for row in rows
+    ])
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _submit_pending(session):
+    entries = session.info.pop(_PENDING_KEY, None)
+    if entries:
+        audit_writer.submit(entries)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _drop_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,102 @@
+# app/services/checkpoints.py
+import json
+import logging
+
+from sqlalchemy import delete, select
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from app.db.engine import WorkerSessionLocal
+from app.db.job import job_uuid
+from app.db.job_stage import JobStage
+from app.services.content_store import ContentNotFound, content_store
+from app.services.pipeline import PipelineDAG
+
+logger = logging.getLogger(__name__)
+
+# Session.info key for checkpoint blobs deleted once the transaction commits
+_PENDING_KEY = "checkpoint_blobs"
+
+
+def save_checkpoint(job_id, pipeline: str, stage: str, output: str | list[str]):
+    """Persist a finished stage's output; the row keeps a content store reference."""
+    ref = content_store.put_text(json.dumps(output))
+    db = WorkerSessionLocal()
+    try:
+        db.merge(JobStage(
+            job_id=job_uuid(job_id),
+            stage=stage,
+            pipeline=pipeline,
+            output_ref=ref["sha256"],
+            output_size=ref["size"],
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def load_checkpoints(job_id, dag: PipelineDAG) -> dict:
+    """
+    {stage: output} for the stages of `dag` an earlier attempt finished.
+
+    Only outputs that a remaining stage (or the report) still reads are
+    fetched from the content store; the others map to None. If a needed blob
+    is gone, the job starts over rather than resuming half-way.
+    """
+    db = WorkerSessionLocal()
+    try:
+        rows = db.execute(
+            select(JobStage.stage, JobStage.output_ref)
+            .where(JobStage.job_id == job_uuid(job_id), JobStage.pipeline == dag.name)
+        ).all()
+    finally:
+        db.close()
+
+    names = {stage.name for stage in dag.stages}
+    done = {stage: ref for stage, ref in rows if stage in names}
+    needed = {dag.output}
+    for stage in dag.stages:
+        if stage.name not in done:
+            needed.update(stage.depends_on)
+
+    completed = {}
+    for stage, ref in done.items():
+        if stage not in needed:
+            completed[stage] = None
+            continue
+        try:
+            completed[stage] = json.loads(content_store.read_text(ref))
+        except ContentNotFound:
+            logger.warning("Checkpoint of stage %s of job %s is missing, starting over", stage, job_id)
+            return {}
+    return completed
+
+
+def clear_checkpoints(db, job_id):
+    """
+    Drop a job's checkpoints (sync session; the caller commits). Their blobs
+    are deleted from the content store after the commit, unless another
+    job's checkpoint has the same output. Checkpoints are JSON encoded, so
+    they do not share blobs with uploads or reports.
+    """
+    job_id = job_uuid(job_id)
+    refs = set(db.scalars(select(JobStage.output_ref).where(JobStage.job_id == job_id)))
+    db.execute(delete(JobStage).where(JobStage.job_id == job_id))
+    if refs:
+        shared = set(db.scalars(select(JobStage.output_ref).where(JobStage.output_ref.in_(refs)).distinct()))
+        session = getattr(db, "sync_session", db)
+        session.info.setdefault(_PENDING_KEY, set()).update(refs - shared)
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _delete_blobs(session):
+    for ref in session.info.pop(_PENDING_KEY, ()):
+        try:
+            content_store.delete(ref)
+        except Exception:
+            logger.exception("Failed to delete checkpoint blob %s", ref)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _keep_blobs(session):
+    session.info.pop(_PENDING_KEY, None)
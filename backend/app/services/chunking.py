@@ -0,0 +1,106 @@
+# app/services/chunking.py
+import re
+from typing import Iterable, Iterator
+
+# Rough token estimate for the HF models we use; avoids pulling in a
+# tokenizer per model. ~4 characters per token for English prose.
+CHARS_PER_TOKEN = 4
+
+_HEADING = re.compile(r"^(#{1,6}\s|\d+(\.\d+)*[.)]\s|[A-Z][A-Z0-9 ,&-]{3,}$)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _blocks(lines: Iterable[str]) -> Iterator[str]:
+    """Yield paragraphs/sections: split at blank lines and before headings."""
+    buf: list[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped or (_HEADING.match(stripped) and buf):
+            if buf:
+                yield "\n".join(buf)
+                buf = []
+            if not stripped:
+                continue
+        buf.append(line)
+    if buf:
+        yield "\n".join(buf)
+
+
+def _split_oversized(block: str, max_tokens: int) -> Iterator[str]:
+    """Break a block that alone exceeds the budget at sentence, then word, boundaries."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    piece = ""
+    for sentence in _SENTENCE_END.split(block):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if piece:
+                yield piece
+                piece = ""
+            yield sentence[:cut]
+            sentence = sentence[cut:].lstrip()
+        if piece and len(piece) + 1 + len(sentence) > max_chars:
+            yield piece
+            piece = ""
+        piece = f"{piece} {sentence}" if piece else sentence
+    if piece:
+        yield piece
+
+
+def iter_chunks(source: str | Iterable[str], max_tokens: int = 1500, overlap_tokens: int = 100) -> Iterator[str]:
+    """
+    Lazily split a document into chunks of at most ~`max_tokens` tokens.
+
+    `source` may be a string or any iterable of lines (e.g. an open file),
+    so large documents never have to be held in memory twice. Chunks are
+    packed from whole sections/paragraphs where possible; each chunk starts
+    with the tail (`overlap_tokens`) of the previous one to keep context.
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+    overlap_chars = overlap_tokens * CHARS_PER_TOKEN
+    budget = max_tokens - overlap_tokens
+
+    current: list[str] = []
+    size = 0
+    tail = ""
+
+    def flush():
+        nonlocal current, size, tail
+        body = "\n\n".join(current)
+        chunk = f"{tail}\n\n{body}" if tail else body
+        tail = body[-overlap_chars:] if overlap_chars else ""
+        current, size = [], 0
+        return chunk
+
+    for block in _blocks(lines):
+        pieces = [block] if estimate_tokens(block) <= budget else list(_split_oversized(block, budget))
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if current and size + tokens > budget:
+                yield flush()
+            current.append(piece)
+            size += tokens
+    if current:
+        yield flush()
+
+
+def group_for_reduce(texts: list[str], max_tokens: int) -> list[list[str]]:
+    """Pack consecutive texts into groups whose combined size fits one prompt."""
+    groups: list[list[str]] = []
+    group: list[str] = []
+    size = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if group and size + tokens > max_tokens:
+            groups.append(group)
+            group, size = [], 0
+        group.append(text)
+        size += tokens
+    if group:
+        groups.append(group)
+    return groups
@@ -0,0 +1,160 @@
+# app/services/content_store.py
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Iterator
+
+from app.config import settings
+
+
+class ContentTooLarge(Exception):
+    pass
+
+
+class ContentNotFound(Exception):
+    pass
+
+
+class ContentStore:
+    """
+    Immutable blobs addressed by their SHA-256. Writing the same bytes twice
+    stores them once; rows only keep the returned reference
+    ({"sha256": ..., "size": ...}).
+
+    The interface mirrors an object store (put / open a byte range / size),
+    so an S3-compatible backend can implement it without callers changing.
+    """
+
+    def put_stream(self, fileobj: BinaryIO, max_bytes: int = 0) -> dict:
+        raise NotImplementedError
+
+    def put_bytes(self, data: bytes) -> dict:
+        raise NotImplementedError
+
+    def put_text(self, text: str) -> dict:
+        return self.put_bytes(text.encode("utf-8"))
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def iter_range(self, key: str, start: int = 0, end: int | None = None, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Bytes [start, end] (inclusive, like HTTP Range) in chunks."""
+        raise NotImplementedError
+
+    def read_bytes(self, key: str) -> bytes:
+        return b"".join(self.iter_range(key))
+
+    def read_text(self, key: str) -> str:
+        return self.read_bytes(key).decode("utf-8")
+
+    def local_path(self, key: str) -> str | None:
+        """Filesystem path if the blob is on local disk (zero-copy serving, child processes)."""
+        return None
+
+    def delete(self, key: str):
+        """
+        Remove a blob (a no-op if it is not there). Blobs are shared by
+        content, so callers only delete what no row references any more.
+        """
+        raise NotImplementedError
+
+
+class LocalContentStore(ContentStore):
+    """Blobs as files under `root`, fanned out as ab/cd/<sha256>."""
+
+    def __init__(self, root: str, chunk_size: int = 1024 * 1024):
+        self.root = root
+        self.chunk_size = chunk_size
+
+    def _path(self, key: str) -> str:
+        if len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+            raise ContentNotFound(key)
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def put_stream(self, fileobj, max_bytes=0):
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := fileobj.read(self.chunk_size):
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise ContentTooLarge(f"Content exceeds {max_bytes} bytes")
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            key = digest.hexdigest()
+            path = self._path(key)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return {"sha256": key, "size": size}
+
+    def put_bytes(self, data):
+        key = hashlib.sha256(data).hexdigest()
+        path = self._path(key)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+            with os.fdopen(fd, "wb") as out:
+                out.write(data)
+            os.replace(tmp_path, path)
+        return {"sha256": key, "size": len(data)}
+
+    def exists(self, key):
+        try:
+            return os.path.exists(self._path(key))
+        except ContentNotFound:
+            return False
+
+    def size(self, key):
+        try:
+            return os.path.getsize(self._path(key))
+        except OSError:
+            raise ContentNotFound(key)
+
+    def iter_range(self, key, start=0, end=None, chunk_size=64 * 1024):
+        try:
+            f = open(self._path(key), "rb")
+        except OSError:
+            raise ContentNotFound(key)
+        with f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def local_path(self, key):
+        path = self._path(key)
+        return path if os.path.exists(path) else None
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except (FileNotFoundError, ContentNotFound):
+            pass
+
+
+def _build_store() -> ContentStore:
+    if settings.CONTENT_STORE_BACKEND != "local":
+        raise ValueError(f"Unsupported CONTENT_STORE_BACKEND: {settings.CONTENT_STORE_BACKEND}")
+    return LocalContentStore(settings.CONTENT_STORE_DIR, chunk_size=settings.UPLOAD_CHUNK_SIZE)
+
+
+content_store = _build_store()
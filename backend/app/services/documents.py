@@ -0,0 +1,150 @@
+# app/services/documents.py
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import settings
+from app.services.content_store import ContentTooLarge, content_store
+
+logger = logging.getLogger(__name__)
+
+TEXT_EXTENSIONS = {".txt", ".md", ".csv"}
+SUPPORTED_EXTENSIONS = TEXT_EXTENSIONS | {".pdf", ".docx"}
+
+# Raised by save_upload when MAX_UPLOAD_BYTES is exceeded
+UploadTooLarge = ContentTooLarge
+
+
+def _text_dir() -> str:
+    return settings.EXTRACT_DIR
+
+
+# -----------------------------
+# UPLOADS (API side)
+# -----------------------------
+def save_upload(fileobj, filename: str) -> dict:
+    """
+    Stream an upload into the content store in fixed-size chunks.
+
+    Blobs are content addressed, so the same document uploaded twice is
+    stored - and later extracted - only once. Returns the document reference
+    that goes into the job's input_data.
+    """
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported file type '{ext or filename}', expected one of {sorted(SUPPORTED_EXTENSIONS)}")
+
+    ref = content_store.put_stream(fileobj, max_bytes=settings.MAX_UPLOAD_BYTES)
+    return {**ref, "filename": filename, "ext": ext}
+
+
+def offload_input(input_data):
+    """Move a large inline `text` of a JSON job input into the content store."""
+    if not isinstance(input_data, dict) or not isinstance(input_data.get("text"), str):
+        return input_data
+    data = input_data["text"].encode("utf-8")
+    if len(data) <= settings.INLINE_TEXT_MAX_BYTES:
+        return input_data
+    rest = {k: v for k, v in input_data.items() if k != "text"}
+    return {**rest, "text_ref": content_store.put_bytes(data)}
+
+
+# -----------------------------
+# EXTRACTION (worker side, separate processes)
+# -----------------------------
+def _extract_pdf(path: str) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise RuntimeError("PDF extraction requires the 'pypdf' package") from e
+    reader = PdfReader(path)
+    return "\n\n".join((page.extract_text() or "").strip() for page in reader.pages)
+
+
+def _extract_docx(path: str) -> str:
+    try:
+        import docx
+    except ImportError as e:
+        raise RuntimeError("DOCX extraction requires the 'python-docx' package") from e
+    document = docx.Document(path)
+    return "\n".join(p.text for p in document.paragraphs)
+
+
+def _extract_to_file(src: str, dest: str, ext: str) -> int:
+    """Runs in a child process: extract plain text from `src` into `dest`."""
+    if ext == ".pdf":
+        text = _extract_pdf(src)
+    elif ext == ".docx":
+        text = _extract_docx(src)
+    else:
+        with open(src, "rb") as f:
+            text = f.read().decode("utf-8", errors="replace")
+
+    # Write-then-rename so concurrent extractions of the same file are harmless
+    tmp = f"{dest}.{os.getpid()}.part"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, dest)
+    return len(text)
+
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _extract_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: the worker process runs threads, forking it is not safe
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.EXTRACT_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_extractors():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+async def extract_document(document: dict) -> str:
+    """Return the path of the document's extracted text, extracting it once if needed."""
+    os.makedirs(_text_dir(), exist_ok=True)
+    text_path = os.path.join(_text_dir(), f"{document['sha256']}.txt")
+    if os.path.exists(text_path):
+        return text_path
+
+    if "upload" in document:
+        # Uploads made before the content store
+        src = os.path.join(settings.UPLOAD_DIR, document["upload"])
+        ext = os.path.splitext(document["upload"])[1].lower()
+    else:
+        src = content_store.local_path(document["sha256"])
+        ext = document["ext"]
+        if src is None:
+            raise FileNotFoundError(f"Document {document['sha256']} is missing from the content store")
+    loop = asyncio.get_running_loop()
+    chars = await loop.run_in_executor(_extract_pool(), _extract_to_file, src, text_path, ext)
+    logger.info("Extracted %d chars from %s", chars, document.get("filename") or document["sha256"])
+    return text_path
+
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+async def load_job_text(input_data: dict | None) -> str:
+    """The text a job runs on: inline `text`, offloaded `text_ref`, or the extracted text of its uploaded document."""
+    if not input_data:
+        return ""
+    document = input_data.get("document")
+    if document:
+        return await asyncio.to_thread(_read, await extract_document(document))
+    if input_data.get("text_ref"):
+        return await asyncio.to_thread(content_store.read_text, input_data["text_ref"]["sha256"])
+    return input_data.get("text", "")
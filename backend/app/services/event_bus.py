@@ -0,0 +1,277 @@
+# app/services/event_bus.py
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.telemetry.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+EVENT_BUS_EVENTS = registry.counter("event_bus_events_total", "Events handed to the event bus", ("backend", "result"))
+
+# Session.info key for events held back until the transaction commits
+_PENDING_KEY = "event_bus_pending"
+
+
+class EventBus:
+    """
+    Job lifecycle events (state transitions, stage completions) for
+    downstream consumers: progress streams, audit, analytics.
+
+    publish() never blocks the caller: events go into a bounded queue and a
+    background thread hands them to the backend in batches (up to
+    EVENT_BUS_BATCH_SIZE, at least every EVENT_BUS_FLUSH_INTERVAL). When the
+    queue is full, events are dropped and counted rather than stalling jobs.
+    Consumers register with subscribe(handler); handlers get lists of events.
+    """
+
+    name = ""
+
+    def __init__(self, queue_size: int = 10000, batch_size: int = 500, flush_interval: float = 0.5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._handlers = []
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # PRODUCING
+    # -----------------------------
+    def publish(self, event: dict):
+        event.setdefault("ts", datetime.now(timezone.utc).isoformat())
+        self._ensure_flusher()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            EVENT_BUS_EVENTS.inc(backend=self.name, result="dropped")
+
+    def _ensure_flusher(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._flush_forever, name="event-bus-flusher", daemon=True)
+            self._thread.start()
+
+    def _next_batch(self) -> list[dict]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush_forever(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._write(batch)
+                EVENT_BUS_EVENTS.inc(len(batch), backend=self.name, result="published")
+            except Exception:
+                EVENT_BUS_EVENTS.inc(len(batch), backend=self.name, result="failed")
+                logger.exception("Failed to publish %d event(s)", len(batch))
+
+    def _write(self, batch: list[dict]):
+        """Hand one batch to the backend (flusher thread)."""
+        raise NotImplementedError
+
+    def close(self, timeout: float = 10.0):
+        """Flush what is queued and stop the flusher thread."""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # -----------------------------
+    # CONSUMING
+    # -----------------------------
+    def subscribe(self, handler, group_id: str | None = None):
+        """
+        Call `handler(events)` with every batch of events. Handlers of the
+        in-process backends run on the flusher thread, so they must be quick.
+        """
+        self._handlers.append(handler)
+
+    def _deliver(self, batch: list[dict]):
+        for handler in list(self._handlers):
+            try:
+                handler(batch)
+            except Exception:
+                logger.exception("Event handler %r failed", handler)
+
+
+class LocalEventBus(EventBus):
+    """
+    Single node and tests: events are appended to a JSON lines file (if
+    `path` is set; one write per batch) and delivered to in-process
+    subscribers. Once the file reaches `max_bytes` it is rotated like a log:
+    `path.1` is the newest old segment, at most `backups` are kept.
+    """
+
+    name = "local"
+
+    def __init__(self, path: str = "", max_bytes: int = 0, backups: int = 3, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def _write(self, batch):
+        if self.path:
+            if self.max_bytes and os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(e, default=str) + "\n" for e in batch))
+        self._deliver(batch)
+
+    def _rotate(self):
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+class KafkaEventBus(EventBus):
+    """
+    Events go to one Kafka topic, keyed by job id so every job's events stay
+    ordered within a partition. The producer batches on its own
+    (KAFKA_LINGER_MS); sends are asynchronous and failures are counted.
+    """
+
+    name = "kafka"
+
+    def __init__(self, bootstrap_servers: str, topic: str, linger_ms: int = 50, **kwargs):
+        try:
+            from kafka import KafkaProducer
+        except ImportError as e:
+            raise RuntimeError("The Kafka event bus requires the 'kafka-python' package") from e
+        super().__init__(**kwargs)
+        self.bootstrap_servers = bootstrap_servers
+        self.topic = topic
+        self._producer = KafkaProducer(
+            bootstrap_servers=bootstrap_servers.split(","),
+            key_serializer=lambda key: key.encode("utf-8") if key else None,
+            value_serializer=lambda value: json.dumps(value, default=str).encode("utf-8"),
+            linger_ms=linger_ms,
+            acks=1,
+        )
+        self._consumers: list[threading.Thread] = []
+
+    def _write(self, batch):
+        for event in batch:
+            self._producer.send(self.topic, key=event.get("job_id"), value=event).add_errback(self._on_send_error)
+
+    def _on_send_error(self, exc):
+        EVENT_BUS_EVENTS.inc(backend=self.name, result="failed")
+        logger.warning("Kafka send failed: %s", exc)
+
+    def close(self, timeout: float = 10.0):
+        super().close(timeout)
+        self._producer.flush(timeout)
+        self._producer.close(timeout)
+
+    def subscribe(self, handler, group_id: str | None = None):
+        """
+        Consume the topic from a background thread. Without `group_id` every
+        subscriber sees every event (fan-out, e.g. progress streams in each
+        API process); with one, the group shares the partitions.
+        """
+        from kafka import KafkaConsumer
+
+        def consume():
+            consumer = KafkaConsumer(
+                self.topic,
+                bootstrap_servers=self.bootstrap_servers.split(","),
+                group_id=group_id,
+                auto_offset_reset="latest",
+                value_deserializer=lambda value: json.loads(value.decode("utf-8")),
+            )
+            try:
+                while not self._stopping.is_set():
+                    records = consumer.poll(timeout_ms=1000, max_records=self.batch_size)
+                    events = [record.value for part in records.values() for record in part]
+                    if events:
+                        try:
+                            handler(events)
+                        except Exception:
+                            logger.exception("Event handler %r failed", handler)
+            finally:
+                consumer.close()
+
+        thread = threading.Thread(target=consume, name="event-bus-consumer", daemon=True)
+        thread.start()
+        self._consumers.append(thread)
+
+
+def _build_bus() -> EventBus:
+    options = dict(
+        queue_size=settings.EVENT_BUS_QUEUE_SIZE,
+        batch_size=settings.EVENT_BUS_BATCH_SIZE,
+        flush_interval=settings.EVENT_BUS_FLUSH_INTERVAL,
+    )
+    local = dict(
+        path=settings.EVENT_BUS_FILE,
+        max_bytes=settings.EVENT_BUS_FILE_MAX_BYTES,
+        backups=settings.EVENT_BUS_FILE_BACKUPS,
+    )
+    backend = settings.EVENT_BUS_BACKEND
+    if backend == "kafka":
+        try:
+            return KafkaEventBus(
+                settings.KAFKA_BOOTSTRAP_SERVERS, settings.EVENT_BUS_TOPIC, settings.KAFKA_LINGER_MS, **options
+            )
+        except Exception:
+            logger.exception("Kafka unavailable at %s, using the local event bus", settings.KAFKA_BOOTSTRAP_SERVERS)
+            return LocalEventBus(**local, **options)
+    if backend != "local":
+        raise ValueError(f"Unknown EVENT_BUS_BACKEND: {backend}")
+    return LocalEventBus(**local, **options)
+
+
+event_bus = _build_bus()
+
+
+# -----------------------------
+# TRANSACTIONAL PUBLISHING
+# -----------------------------
+def publish_on_commit(db, event: dict):
+    """
+    Publish once `db` (Session or AsyncSession) commits; dropped on rollback,
+    so consumers never see a transition that did not happen.
+    """
+    event.setdefault("ts", datetime.now(timezone.utc).isoformat())
+    session = getattr(db, "sync_session", db)
+    session.info.setdefault(_PENDING_KEY, []).append(event)
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _publish_pending(session):
+    for event in session.info.pop(_PENDING_KEY, ()):
+        event_bus.publish(event)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _drop_pending(session):
+    session.info.pop(_PENDING_KEY, None)
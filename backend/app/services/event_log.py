@@ -0,0 +1,155 @@
+# app/services/event_log.py
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select
+
+from app.config import settings
+from app.db.engine import WorkerSessionLocal
+from app.db.event_log import EventLogEntry
+from app.db.job import Job
+from app.services.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+# Event keys stored in their own columns; everything else goes to `data`
+_COLUMN_KEYS = {"job_id", "user_id", "type", "status", "stage", "ts"}
+
+# Advisory lock serializing event_log inserts across processes
+_WRITE_LOCK_ID = 0x65766C67
+
+
+def _uuid(value) -> uuid.UUID | None:
+    try:
+        return uuid.UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _timestamp(value) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.now(timezone.utc)
+
+
+class EventLogWriter:
+    """
+    Writes event bus batches to the `event_log` table, one multi-row INSERT
+    per batch. Events without a user_id get their job's owner (looked up
+    once per job, then cached) so the log can be filtered by user.
+
+    Writers of all processes take turns: on Postgres each batch takes an
+    advisory lock before its INSERT and keeps it until commit. Ids are handed out at INSERT
+    time, so without it a batch could commit id N+1 while N is still in
+    flight, and a live tail (GET /events?after=) would step past N for
+    good. With it, ids become visible in id order.
+
+    Every EVENT_LOG_MAINTENANCE_INTERVAL the writer also prunes: events older
+    than EVENT_LOG_RETENTION_DAYS are deleted, and stage events older than
+    EVENT_LOG_COMPACT_DAYS are compacted away (status transitions are kept).
+    Deletes go in batches so they never hold long locks.
+    """
+
+    def __init__(self, owner_cache_size: int = 10000):
+        self.owner_cache_size = owner_cache_size
+        self._owners: OrderedDict = OrderedDict()
+        self._started = False
+        self._last_maintenance = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        # With Kafka, the writers of all processes share the topic's partitions
+        event_bus.subscribe(self.write, group_id="event-log")
+
+    # -----------------------------
+    # WRITING
+    # -----------------------------
+    def _job_owners(self, db, job_ids: set) -> dict:
+        missing = [job_id for job_id in job_ids if job_id not in self._owners]
+        if missing:
+            for job_id, owner in db.execute(select(Job.id, Job.created_by).where(Job.id.in_(missing))).all():
+                self._owners[job_id] = owner
+                while len(self._owners) > self.owner_cache_size:
+                    self._owners.popitem(last=False)
+        return {job_id: self._owners.get(job_id) for job_id in job_ids}
+
+    def _rows(self, db, events: list[dict]) -> list[dict]:
+        rows = []
+        for event in events:
+            rows.append({
+                "job_id": _uuid(event.get("job_id")),
+                "user_id": _uuid(event.get("user_id")),
+                "type": str(event.get("type") or "event")[:32],
+                "status": event.get("status"),
+                "stage": event.get("stage"),
+                "data": {k: v for k, v in event.items() if k not in _COLUMN_KEYS} or None,
+                "created_at": _timestamp(event.get("ts")),
+            })
+        unowned = {row["job_id"] for row in rows if row["job_id"] and not row["user_id"]}
+        if unowned:
+            owners = self._job_owners(db, unowned)
+            for row in rows:
+                if row["job_id"] and not row["user_id"]:
+                    row["user_id"] = owners.get(row["job_id"])
+        return rows
+
+    def write(self, events: list[dict]):
+        db = WorkerSessionLocal()
+        try:
+            rows = self._rows(db, events)
+            if db.get_bind().dialect.name == "postgresql":
+                db.execute(select(func.pg_advisory_xact_lock(_WRITE_LOCK_ID)))
+            db.execute(insert(EventLogEntry), rows)
+            db.commit()
+        finally:
+            db.close()
+        if time.monotonic() - self._last_maintenance >= settings.EVENT_LOG_MAINTENANCE_INTERVAL:
+            self._last_maintenance = time.monotonic()
+            try:
+                self.maintain()
+            except Exception:
+                logger.exception("Event log maintenance failed")
+
+    # -----------------------------
+    # RETENTION / COMPACTION
+    # -----------------------------
+    def _delete_batched(self, *conditions) -> int:
+        deleted = 0
+        while True:
+            db = WorkerSessionLocal()
+            try:
+                ids = select(EventLogEntry.id).where(*conditions).limit(settings.EVENT_LOG_DELETE_BATCH)
+                count = db.execute(
+                    delete(EventLogEntry).where(EventLogEntry.id.in_(ids)).execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+            finally:
+                db.close()
+            deleted += count
+            if count < settings.EVENT_LOG_DELETE_BATCH:
+                return deleted
+
+    def maintain(self) -> dict:
+        now = datetime.now(timezone.utc)
+        result = {"expired": 0, "compacted": 0}
+        if settings.EVENT_LOG_RETENTION_DAYS:
+            cutoff = now - timedelta(days=settings.EVENT_LOG_RETENTION_DAYS)
+            result["expired"] = self._delete_batched(EventLogEntry.created_at < cutoff)
+        if settings.EVENT_LOG_COMPACT_DAYS:
+            cutoff = now - timedelta(days=settings.EVENT_LOG_COMPACT_DAYS)
+            result["compacted"] = self._delete_batched(EventLogEntry.created_at < cutoff, EventLogEntry.type == "stage")
+        if result["expired"] or result["compacted"]:
+            logger.info("Event log maintenance: %s", result)
+        return result
+
+
+event_log = EventLogWriter()
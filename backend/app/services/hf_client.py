@@ -1,19 +1,21 @@
-import requests
-import os
+import asyncio
+
+from app.services.inference import batching_enabled, get_async_client, get_batcher, get_client
 
-HF_TOKEN = os.getenv("HF_TOKEN")
 
 def hf_generate(model, prompt, max_tokens=500):
-    url = f"https://api-inference.huggingface.co/models/{model}"
-    headers = {"Authorization": f"Bearer {HF_TOKEN}"}
+    if batching_enabled(model):
+        return get_batcher().generate(model, prompt, max_tokens=max_tokens)
+    return get_client().generate(model, prompt, max_tokens=max_tokens)
+
 
-    payload = {
-        "inputs": prompt,
-        "parameters": {"max_new_tokens": max_tokens}
-    }
+async def ahf_generate(model, prompt, max_tokens=500):
+    if batching_enabled(model):
+        return await asyncio.wrap_future(get_batcher().submit(model, prompt, max_tokens=max_tokens))
+    return await get_async_client().generate(model, prompt, max_tokens=max_tokens)
 
-    response = requests.post(url, headers=headers, json=payload)
-    response.raise_for_status()
 
-    data = response.json()
-    return data[0]["generated_text"]
+async def ahf_stream(model, prompt, max_tokens=500):
+    """Yield the generated text piece by piece (never batched)."""
+    async for piece in get_async_client().stream(model, prompt, max_tokens=max_tokens):
+        yield piece
@@ -0,0 +1,22 @@
+from .breaker import CircuitBreaker, CircuitOpenError
+from .client import (
+    AsyncHFInferenceClient,
+    HFInferenceClient,
+    InferenceError,
+    batching_enabled,
+    get_async_client,
+    get_batcher,
+    get_client,
+)
+
+__all__ = [
+    "AsyncHFInferenceClient",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "HFInferenceClient",
+    "InferenceError",
+    "batching_enabled",
+    "get_async_client",
+    "get_batcher",
+    "get_client",
+]
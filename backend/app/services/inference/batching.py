@@ -0,0 +1,93 @@
+# app/services/inference/batching.py
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from app.services.inference.client import HFInferenceClient, InferenceError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Request:
+    prompt: str
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent prompts for the same model into one batched request.
+
+    Every (model, max_tokens) pair gets its own queue and dispatcher thread.
+    The dispatcher blocks for the first prompt, keeps collecting until
+    `max_batch_size` prompts arrived or `max_wait` seconds passed, then hands
+    the batch to a small sender pool (so the next batch can form while this
+    one is in flight) and resolves every caller's future from the response.
+    Prompts whose caller cancelled before the batch went out are left out.
+    """
+
+    def __init__(self, client: HFInferenceClient, max_batch_size: int = 8,
+                 max_wait: float = 0.02, max_inflight: int = 4):
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queues: dict[tuple[str, int], queue.Queue] = {}
+        self._lock = threading.Lock()
+        self._senders = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix="hf-batch")
+
+    def submit(self, model: str, prompt: str, max_tokens: int = 500) -> Future:
+        request = _Request(prompt)
+        self._queue_for(model, max_tokens).put(request)
+        return request.future
+
+    def generate(self, model: str, prompt: str, max_tokens: int = 500) -> str:
+        return self.submit(model, prompt, max_tokens).result()
+
+    def _queue_for(self, model: str, max_tokens: int) -> queue.Queue:
+        key = (model, max_tokens)
+        with self._lock:
+            q = self._queues.get(key)
+            if q is None:
+                q = queue.Queue()
+                self._queues[key] = q
+                threading.Thread(
+                    target=self._dispatch_loop, args=(model, max_tokens, q),
+                    name=f"hf-batcher-{model}", daemon=True,
+                ).start()
+            return q
+
+    def _dispatch_loop(self, model: str, max_tokens: int, q: queue.Queue):
+        while True:
+            batch = [q.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._senders.submit(self._send, model, max_tokens, batch)
+
+    def _send(self, model: str, max_tokens: int, batch: list[_Request]):
+        # Drop callers that gave up while queued; the rest can no longer be cancelled
+        batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            # A single prompt keeps the plain string form the API always accepted
+            inputs = batch[0].prompt if len(batch) == 1 else [r.prompt for r in batch]
+            data = self.client.request(model, self.client.build_payload(inputs, max_tokens))
+            outputs = [data] if len(batch) == 1 else data
+            if not isinstance(outputs, list) or len(outputs) != len(batch):
+                raise InferenceError(model, f"batched response does not match {len(batch)} prompts")
+            for request, output in zip(batch, outputs):
+                request.future.set_result(self.client.parse_generated(output))
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
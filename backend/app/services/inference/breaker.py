@@ -0,0 +1,104 @@
+# app/services/inference/breaker.py
+import itertools
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised when calls to a model are short-circuited by its breaker."""
+
+    def __init__(self, model: str, retry_in: float):
+        super().__init__(f"Circuit open for model {model}, retry in {retry_in:.0f}s")
+        self.model = model
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Classic closed -> open -> half-open breaker for one model endpoint.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    rejects calls for `reset_timeout` seconds; then a single trial call is
+    let through and its outcome closes or re-opens the circuit. A trial
+    that ends without an outcome (rate limited, model loading, cancelled)
+    hands its slot back through release_trial(), with the token
+    before_call() gave it, so a late release cannot free a newer trial.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, model: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial: int | None = None  # token of the half-open trial in flight
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def before_call(self) -> int | None:
+        """
+        Raise CircuitOpenError if the call must not go out. Returns a token
+        when the call is the half-open trial (None otherwise); the caller then
+        calls release_trial(token) once the attempt is over, whatever happened.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                elapsed = time.monotonic() - self._opened_at
+                if elapsed < self.reset_timeout:
+                    raise CircuitOpenError(self.model, self.reset_timeout - elapsed)
+                self.state = self.HALF_OPEN
+                self._trial = None
+
+            if self.state == self.HALF_OPEN:
+                if self._trial is not None:
+                    raise CircuitOpenError(self.model, self.reset_timeout)
+                self._trial = next(self._tokens)
+                return self._trial
+            return None
+
+    def release_trial(self, token: int):
+        """
+        Free the half-open trial slot held by `token`; a no-op once an outcome
+        was recorded or another trial took the slot.
+        """
+        with self._lock:
+            if self._trial == token:
+                self._trial = None
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial = None
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class BreakerRegistry:
+    """One breaker per model id, created on first use."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(model)
+            if breaker is None:
+                breaker = CircuitBreaker(model, self.failure_threshold, self.reset_timeout)
+                self._breakers[model] = breaker
+            return breaker
@@ -0,0 +1,328 @@
+# app/services/inference/client.py
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import settings
+from app.services.inference.breaker import BreakerRegistry
+from app.services.telemetry.metrics import INFERENCE_LATENCY, INFERENCE_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# 503 is also how the inference API says "model is loading"
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class InferenceError(Exception):
+    """A model call failed for good (non-retryable status or retries exhausted)."""
+
+    def __init__(self, model: str, message: str, status_code: int | None = None):
+        super().__init__(f"{model}: {message}")
+        self.model = model
+        self.status_code = status_code
+
+
+class _BaseClient:
+    """Config, payload building and retry policy shared by the sync/async clients."""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        token: str | None = None,
+        pool_size: int | None = None,
+        max_retries: int | None = None,
+        breakers: BreakerRegistry | None = None,
+    ):
+        self.base_url = (base_url or settings.HF_API_URL).rstrip("/")
+        self.token = token if token is not None else settings.HF_TOKEN
+        self.pool_size = pool_size or settings.HF_POOL_SIZE
+        self.max_retries = settings.HF_MAX_RETRIES if max_retries is None else max_retries
+        self.breakers = breakers or BreakerRegistry(settings.HF_BREAKER_THRESHOLD, settings.HF_BREAKER_RESET)
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def url_for(self, model: str) -> str:
+        return f"{self.base_url}/{model}"
+
+    def timeout_for(self, model: str) -> float:
+        return float(settings.HF_MODEL_TIMEOUTS.get(model, settings.HF_TIMEOUT))
+
+    @staticmethod
+    def build_payload(inputs, max_tokens: int = 500, **parameters) -> dict:
+        return {"inputs": inputs, "parameters": {"max_new_tokens": max_tokens, **parameters}}
+
+    @staticmethod
+    def parse_generated(data: Any) -> str:
+        if isinstance(data, list):
+            data = data[0]
+        return data["generated_text"]
+
+    def retry_delay(self, attempt: int, response=None) -> float:
+        """
+        Seconds to wait before the next attempt. Honors Retry-After and the
+        `estimated_time` the inference API returns while a model loads;
+        otherwise exponential backoff with full jitter.
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), settings.HF_BACKOFF_MAX)
+                except ValueError:
+                    pass
+            if response.status_code == 503:
+                estimated = self._estimated_time(response)
+                if estimated:
+                    return min(estimated, settings.HF_BACKOFF_MAX)
+        backoff = min(settings.HF_BACKOFF_BASE * (2 ** attempt), settings.HF_BACKOFF_MAX)
+        return random.uniform(0, backoff)
+
+    @staticmethod
+    def _estimated_time(response) -> float | None:
+        try:
+            return float(response.json().get("estimated_time"))
+        except Exception:
+            return None
+
+    def _counts_against_breaker(self, response) -> bool:
+        # Rate limits and "model loading" are expected, not signs of a broken endpoint
+        if response.status_code == 429:
+            return False
+        if response.status_code == 503 and self._estimated_time(response):
+            return False
+        return response.status_code >= 500
+
+    @staticmethod
+    def _observe(model: str, started: float, outcome, retrying: bool = False):
+        """Per-attempt latency by outcome (HTTP status or "transport_error")."""
+        INFERENCE_LATENCY.observe(time.monotonic() - started, model=model, outcome=outcome)
+        if retrying:
+            INFERENCE_RETRIES.inc(model=model, reason=outcome)
+
+    def _error_for(self, model: str, response) -> InferenceError:
+        return InferenceError(model, f"HTTP {response.status_code}: {response.text[:200]}", response.status_code)
+
+    def _check(self, model: str, breaker, response, attempt: int, started: float, last_attempt: bool) -> float | None:
+        """
+        Record one attempt's response. Returns None if it is final (success),
+        the delay before the next attempt if it is retryable; raises for errors
+        and on the last attempt.
+        """
+        retryable = response.status_code in RETRYABLE_STATUS
+        self._observe(model, started, response.status_code, retrying=retryable and not last_attempt)
+        if retryable:
+            if self._counts_against_breaker(response):
+                breaker.record_failure()
+            if last_attempt:
+                raise self._error_for(model, response)
+            delay = self.retry_delay(attempt, response)
+            logger.info("%s returned %s, retrying in %.1fs", model, response.status_code, delay)
+            return delay
+
+        breaker.record_success()
+        if response.status_code >= 400:
+            raise self._error_for(model, response)
+        return None
+
+
+class HFInferenceClient(_BaseClient):
+    """Blocking client on a shared keep-alive `requests.Session`."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.session = requests.Session()
+        # Retries are handled here (with the breaker), not by urllib3
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self.headers)
+
+    def request(self, model: str, payload: dict) -> Any:
+        breaker = self.breakers.get(model)
+        timeout = self.timeout_for(model)
+
+        for attempt in range(self.max_retries + 1):
+            trial = breaker.before_call()
+            last_attempt = attempt == self.max_retries
+            started = time.monotonic()
+            try:
+                try:
+                    response = self.session.post(self.url_for(model), json=payload, timeout=timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    breaker.record_failure()
+                    self._observe(model, started, "transport_error", retrying=not last_attempt)
+                    if last_attempt:
+                        raise InferenceError(model, f"request failed: {e}") from e
+                    delay = self.retry_delay(attempt)
+                else:
+                    delay = self._check(model, breaker, response, attempt, started, last_attempt)
+                    if delay is None:
+                        return response.json()
+            finally:
+                if trial is not None:
+                    breaker.release_trial(trial)
+            time.sleep(delay)
+
+    def generate(self, model: str, prompt: str, max_tokens: int = 500, **parameters) -> str:
+        data = self.request(model, self.build_payload(prompt, max_tokens, **parameters))
+        return self.parse_generated(data)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncHFInferenceClient(_BaseClient):
+    """asyncio client on a pooled `httpx.AsyncClient`; bind one per event loop."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        import httpx  # only needed by async callers
+
+        self._httpx = httpx
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+        )
+
+    async def request(self, model: str, payload: dict) -> Any:
+        breaker = self.breakers.get(model)
+        timeout = self.timeout_for(model)
+
+        for attempt in range(self.max_retries + 1):
+            trial = breaker.before_call()
+            last_attempt = attempt == self.max_retries
+            started = time.monotonic()
+            try:
+                try:
+                    response = await self.client.post(self.url_for(model), json=payload, timeout=timeout)
+                except (self._httpx.TransportError, self._httpx.TimeoutException) as e:
+                    breaker.record_failure()
+                    self._observe(model, started, "transport_error", retrying=not last_attempt)
+                    if last_attempt:
+                        raise InferenceError(model, f"request failed: {e}") from e
+                    delay = self.retry_delay(attempt)
+                else:
+                    delay = self._check(model, breaker, response, attempt, started, last_attempt)
+                    if delay is None:
+                        return response.json()
+            finally:
+                if trial is not None:
+                    breaker.release_trial(trial)
+            await asyncio.sleep(delay)
+
+    async def generate(self, model: str, prompt: str, max_tokens: int = 500, **parameters) -> str:
+        data = await self.request(model, self.build_payload(prompt, max_tokens, **parameters))
+        return self.parse_generated(data)
+
+    async def stream(self, model: str, prompt: str, max_tokens: int = 500, **parameters):
+        """
+        Yield generated text as the backend produces it (TGI-style SSE with
+        `"stream": true`). Retries only apply until the response starts;
+        backends that ignore streaming answer with one JSON body instead.
+        """
+        payload = {**self.build_payload(prompt, max_tokens, **parameters), "stream": True}
+        breaker = self.breakers.get(model)
+        timeout = self.timeout_for(model)
+
+        for attempt in range(self.max_retries + 1):
+            trial = breaker.before_call()
+            last_attempt = attempt == self.max_retries
+            started = time.monotonic()
+            delay = None
+            try:
+                async with self.client.stream("POST", self.url_for(model), json=payload, timeout=timeout) as response:
+                    # Time to first byte; the rest of a stream is generation time
+                    if response.status_code >= 400:
+                        await response.aread()
+                    delay = self._check(model, breaker, response, attempt, started, last_attempt)
+                    if delay is None:
+                        if "text/event-stream" not in response.headers.get("content-type", ""):
+                            await response.aread()
+                            yield self.parse_generated(response.json())
+                            return
+
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = json.loads(line[len("data:"):])
+                            if "error" in data:
+                                raise InferenceError(model, f"stream error: {data['error']}")
+                            token = data.get("token") or {}
+                            if token.get("text") and not token.get("special"):
+                                yield token["text"]
+                        return
+            except (self._httpx.TransportError, self._httpx.TimeoutException) as e:
+                breaker.record_failure()
+                self._observe(model, started, "transport_error", retrying=not last_attempt)
+                if last_attempt:
+                    raise InferenceError(model, f"request failed: {e}") from e
+                delay = self.retry_delay(attempt)
+            finally:
+                if trial is not None:
+                    breaker.release_trial(trial)
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+# -----------------------------
+# SHARED INSTANCES
+# -----------------------------
+_breakers = BreakerRegistry(settings.HF_BREAKER_THRESHOLD, settings.HF_BREAKER_RESET)
+_client: HFInferenceClient | None = None
+_async_clients: dict[int, AsyncHFInferenceClient] = {}
+_batcher = None
+_lock = threading.Lock()
+
+
+def get_client() -> HFInferenceClient:
+    global _client
+    with _lock:
+        if _client is None:
+            _client = HFInferenceClient(breakers=_breakers)
+        return _client
+
+
+def get_async_client() -> AsyncHFInferenceClient:
+    """Per-loop async client; all of them share the per-model breakers."""
+    loop_id = id(asyncio.get_running_loop())
+    with _lock:
+        client = _async_clients.get(loop_id)
+        if client is None:
+            client = AsyncHFInferenceClient(breakers=_breakers)
+            _async_clients[loop_id] = client
+        return client
+
+
+def batching_enabled(model: str) -> bool:
+    if not settings.HF_BATCHING_ENABLED:
+        return False
+    models = [m.strip() for m in settings.HF_BATCH_MODELS.split(",") if m.strip()]
+    return not models or model in models
+
+
+def get_batcher():
+    """Shared MicroBatcher on top of the shared sync client."""
+    from app.services.inference.batching import MicroBatcher
+
+    global _batcher
+    client = get_client()
+    with _lock:
+        if _batcher is None:
+            _batcher = MicroBatcher(
+                client,
+                max_batch_size=settings.HF_BATCH_MAX_SIZE,
+                max_wait=settings.HF_BATCH_WINDOW_MS / 1000,
+                max_inflight=settings.HF_BATCH_MAX_INFLIGHT,
+            )
+        return _batcher
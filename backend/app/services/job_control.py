@@ -0,0 +1,50 @@
+# app/services/job_control.py
+import threading
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once it has been cancelled."""
+
+
+class CancellationRegistry:
+    """
+    In-memory cancel flags for the jobs running in this process.
+
+    The cancel endpoint flips the flag directly when the job runs in the API
+    process; worker processes get it from the pool heartbeat, which checks all
+    of its active jobs in one query. Either way the pipeline only ever reads
+    a threading.Event between (and during) stages.
+    """
+
+    def __init__(self):
+        self._events: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def register(self, job_id: str) -> threading.Event:
+        with self._lock:
+            return self._events.setdefault(str(job_id), threading.Event())
+
+    def unregister(self, job_id: str):
+        with self._lock:
+            self._events.pop(str(job_id), None)
+
+    def cancel(self, job_id: str) -> bool:
+        """Flag a job as cancelled. Returns False if it is not running here."""
+        with self._lock:
+            event = self._events.get(str(job_id))
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    def is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            event = self._events.get(str(job_id))
+        return bool(event and event.is_set())
+
+    def raise_if_cancelled(self, job_id: str):
+        if self.is_cancelled(job_id):
+            raise JobCancelled(job_id)
+
+
+cancellation = CancellationRegistry()
@@ -0,0 +1,219 @@
+# app/services/job_events.py
+import asyncio
+import json
+import logging
+import os
+import select
+import socket
+import threading
+from collections import defaultdict
+
+from sqlalchemy import event as sa_event
+from sqlalchemy import func, select as sa_select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.engine import engine, worker_engine
+from app.services.event_bus import event_bus, publish_on_commit
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+# Lifecycle events that also go to the event bus (progress and token events stay local)
+BUS_EVENT_TYPES = {"status", "stage"}
+# Tags bus events with the process that produced them
+EVENT_SOURCE = f"{socket.gethostname()}:{os.getpid()}"
+# Session.info key for in-process events held back until the transaction commits
+_PENDING_KEY = "job_events_pending"
+
+
+class JobEventBroker:
+    """
+    Fan-out of job events (status / progress / stage completion) to the
+    clients streaming `GET /jobs/{id}/events`.
+
+    With Postgres, events go out through NOTIFY on one channel and every API
+    process LISTENs on it, so clients see jobs run by any worker process.
+    Otherwise delivery is in-process only (embedded workers), likewise once
+    the publishing session commits. Subscribers are asyncio queues;
+    publishing is thread-safe.
+
+    Status and stage events are also put on the event bus, after the
+    publishing session commits, for consumers outside the API. Without
+    NOTIFY but with the Kafka bus, the bus is what carries other processes'
+    status and stage events to the streams.
+    """
+
+    def __init__(self, channel: str, use_notify: bool):
+        self.channel = channel
+        self.use_notify = use_notify
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._listener: threading.Thread | None = None
+        self._bus_consumer = False
+
+    # -----------------------------
+    # PUBLISHING
+    # -----------------------------
+    def publish(self, job_id: str, event: dict, db=None):
+        """
+        Emit an event for a job. Passing the caller's session makes the
+        event part of its transaction: sent when `db` commits, dropped on
+        rollback.
+        """
+        event = {"job_id": str(job_id), **event}
+        self._to_bus(event, db)
+        if not self.use_notify:
+            self._dispatch_on_commit(event, db)
+            return
+
+        stmt = self._notify_stmt(event)
+        try:
+            if db is not None:
+                db.execute(stmt)
+            else:
+                # Session-less publishes come from jobs (token relay)
+                with worker_engine.begin() as conn:
+                    conn.execute(stmt)
+        except Exception:
+            logger.exception("Failed to publish event for job %s", job_id)
+
+    async def apublish(self, job_id: str, event: dict, db):
+        """publish() for an AsyncSession; the event is sent when `db` commits."""
+        event = {"job_id": str(job_id), **event}
+        self._to_bus(event, db)
+        if not self.use_notify:
+            self._dispatch_on_commit(event, db)
+            return
+        try:
+            await db.execute(self._notify_stmt(event))
+        except Exception:
+            logger.exception("Failed to publish event for job %s", job_id)
+
+    @staticmethod
+    def _to_bus(event: dict, db):
+        if event.get("type") not in BUS_EVENT_TYPES:
+            return
+        event = {**event, "source": EVENT_SOURCE}
+        if db is None:
+            event_bus.publish(event)
+        else:
+            publish_on_commit(db, event)
+
+    def _notify_stmt(self, event: dict):
+        return sa_select(func.pg_notify(self.channel, json.dumps(event, default=str)))
+
+    def _dispatch_on_commit(self, event: dict, db):
+        # Like NOTIFY: a subscriber reacting to the event must find its transaction committed
+        if db is None:
+            self._dispatch(event)
+        else:
+            getattr(db, "sync_session", db).info.setdefault(_PENDING_KEY, []).append(event)
+
+    def _dispatch(self, event: dict):
+        with self._lock:
+            targets = list(self._subscribers.get(event["job_id"], ()))
+        for loop, queue in targets:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    # -----------------------------
+    # SUBSCRIBING
+    # -----------------------------
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        if self.use_notify:
+            self._ensure_listener()
+        elif event_bus.name == "kafka":
+            self._ensure_bus_consumer()
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers[str(job_id)].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        with self._lock:
+            subs = self._subscribers.get(str(job_id))
+            if subs:
+                subs.discard((asyncio.get_running_loop(), queue))
+                if not subs:
+                    del self._subscribers[str(job_id)]
+
+    # -----------------------------
+    # EVENT BUS BRIDGE
+    # -----------------------------
+    def _ensure_bus_consumer(self):
+        with self._lock:
+            if self._bus_consumer:
+                return
+            self._bus_consumer = True
+        event_bus.subscribe(self._from_bus)
+
+    def _from_bus(self, events: list[dict]):
+        for event in events:
+            # Our own events were dispatched when they were published
+            if event.get("source") != EVENT_SOURCE and event.get("job_id"):
+                self._dispatch(event)
+
+    # -----------------------------
+    # LISTEN/NOTIFY BRIDGE
+    # -----------------------------
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen_forever, name="job-events-listener", daemon=True)
+            self._listener.start()
+
+    def _listen_forever(self):
+        while True:
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Job event listener failed, reconnecting")
+            threading.Event().wait(settings.JOB_EVENTS_RECONNECT_DELAY)
+
+    def _listen(self):
+        conn = engine.raw_connection()
+        # A LISTEN connection is long-lived and autocommit; keep it out of the pool
+        conn.detach()
+        try:
+            dbapi_conn = conn.driver_connection if hasattr(conn, "driver_connection") else conn.connection
+            dbapi_conn.autocommit = True
+            with dbapi_conn.cursor() as cur:
+                cur.execute(f'LISTEN "{self.channel}"')
+            logger.info("Listening for job events on channel %s", self.channel)
+            while True:
+                if select.select([dbapi_conn], [], [], 5.0) == ([], [], []):
+                    continue
+                dbapi_conn.poll()
+                while dbapi_conn.notifies:
+                    notify = dbapi_conn.notifies.pop(0)
+                    try:
+                        self._dispatch(json.loads(notify.payload))
+                    except ValueError:
+                        logger.warning("Dropping malformed job event: %r", notify.payload)
+        finally:
+            conn.close()
+
+
+job_events = JobEventBroker(
+    channel=settings.JOB_EVENTS_CHANNEL,
+    use_notify=settings.JOB_EVENTS_NOTIFY and engine.dialect.name == "postgresql",
+)
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _dispatch_pending(session):
+    for event in session.info.pop(_PENDING_KEY, ()):
+        job_events._dispatch(event)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _drop_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def format_sse(event: dict, event_type: str | None = None) -> str:
+    lines = [f"event: {event_type or event.get('type', 'message')}"]
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return "\n".join(lines) + "\n\n"
@@ -1,74 +1,214 @@
-import threading
+import asyncio
+import logging
 import time
-from sqlalchemy.orm import sessionmaker
-from app.db.base import engine
-from app.db.job import Job
+from datetime import datetime, timezone
+from sqlalchemy import update
+from app.db.engine import WorkerSessionLocal
+from app.db.job import Job, job_uuid
 from app.services.agent_orchestrator import AgentOrchestrator
+from app.services.job_control import JobCancelled, cancellation
+from app.services.mcp.cache import cache_bypass
+from app.config import settings
+from app.services.chunking import CHARS_PER_TOKEN, estimate_tokens
+from app.services.documents import load_job_text
+from app.services.content_store import content_store
+from app.services.checkpoints import clear_checkpoints, load_checkpoints, save_checkpoint
+from app.services.job_events import job_events
+from app.services.pipeline import CHUNKED_PIPELINE, get_pipeline
+from app.services.telemetry import tracer
+from app.services.telemetry.metrics import JOB_DURATION
+
+logger = logging.getLogger(__name__)
 
-SessionLocal = sessionmaker(bind=engine)
 orchestrator = AgentOrchestrator()
 
-def run_job_in_background(job_id: str):
-    thread = threading.Thread(target=_process_job, args=(job_id,), daemon=True)
-    thread.start()
-
-def _update_job(job: Job, db, *, status=None, progress=None, output_data=None):
-    if status:
-        job.status = status
-    if progress is not None:
-        job.progress = progress
-    if output_data is not None:
-        job.output_data = output_data
-    db.commit()
+# Intra-stage progress (e.g. token streaming) is throttled to this rate
+PROGRESS_MIN_INTERVAL = 1.0
+
+
+class ProgressReporter:
+    """
+    Writes job progress with one conditional UPDATE on the job's own session.
+
+    The UPDATE only matches while the job is still `running`, so a zero
+    rowcount means someone cancelled it and doubles as the DB-side check.
+    Stages of one job may finish concurrently, so writes are serialized.
+    """
+
+    def __init__(self, db, job_id, total_stages: int):
+        self.db = db
+        self.job_id = job_uuid(job_id)
+        self.total_stages = total_stages
+        self.stage_index = 0
+        self._last_value = -1
+        self._last_write = 0.0
+        self._lock = asyncio.Lock()
+
+    def _write(self, value: int, stage: str | None = None):
+        result = self.db.execute(
+            update(Job)
+            .where(Job.id == self.job_id, Job.status == "running")
+            .values(progress=value)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            event = {"type": "stage", "stage": stage} if stage else {"type": "progress"}
+            job_events.publish(self.job_id, {**event, "status": "running", "progress": value}, db=self.db)
+        self.db.commit()
+        self._last_value = value
+        self._last_write = time.monotonic()
+        if result.rowcount == 0:
+            cancellation.cancel(self.job_id)
+            raise JobCancelled(self.job_id)
+
+    async def stage_progress(self, fraction: float):
+        """Progress inside the current stage (0..1); throttled."""
+        cancellation.raise_if_cancelled(self.job_id)
+        value = int((self.stage_index + min(max(fraction, 0.0), 1.0)) / self.total_stages * 100)
+        if value <= self._last_value or time.monotonic() - self._last_write < PROGRESS_MIN_INTERVAL:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._write, value)
+
+    async def stage_completed(self, stage: str | None = None):
+        async with self._lock:
+            self.stage_index += 1
+            await asyncio.to_thread(self._write, int(self.stage_index / self.total_stages * 100), stage)
+
+
+class TokenRelay:
+    """
+    Forwards streamed stage output to job event subscribers.
 
-def _process_job(job_id: str):
-    db = SessionLocal()
-    job = db.get(Job, job_id)
-    if not job:
-        db.close()
-        print(f"[ERROR] Job {job_id} not found")
-        return
-    if job.status != "pending":
-        db.close()
-        return
+    Tokens are coalesced (TOKEN_FLUSH_INTERVAL / TOKEN_FLUSH_CHARS) so a
+    stream costs a few events per second, not one NOTIFY per token, and
+    the generated length drives intra-stage progress.
+    """
 
-    # Mark as running
-    _update_job(job, db, status="running", progress=0)
+    def __init__(self, job_id, dag, progress: ProgressReporter):
+        self.job_id = job_id
+        self.dag = dag
+        self.progress = progress
+        self._buffers: dict[str, list[str]] = {}
+        self._chars: dict[str, int] = {}
+        self._last_flush: dict[str, float] = {}
+        self._lock = asyncio.Lock()
 
-    stages = ["ingestion", "research", "citation", "formatting", "compliance"]
-    total_stages = len(stages)
-    current_text = job.input_data.get("text", "") if job.input_data else ""
+    async def on_token(self, stage, text: str):
+        self._buffers.setdefault(stage.name, []).append(text)
+        self._chars[stage.name] = self._chars.get(stage.name, 0) + len(text)
+        pending = sum(len(t) for t in self._buffers[stage.name])
+        if (
+            pending >= settings.TOKEN_FLUSH_CHARS
+            or time.monotonic() - self._last_flush.get(stage.name, 0.0) >= settings.TOKEN_FLUSH_INTERVAL
+        ):
+            await self.flush(stage)
+            # Tools generate up to 500 new tokens; stay below 100% until the stage is done
+            await self.progress.stage_progress(min(self._chars[stage.name] / CHARS_PER_TOKEN / 500, 0.95))
 
+    async def flush(self, stage):
+        async with self._lock:
+            pieces = self._buffers.pop(stage.name, None)
+            self._last_flush[stage.name] = time.monotonic()
+            if not pieces:
+                return
+            event = {"type": "token", "stage": stage.name, "final": stage.name == self.dag.output, "text": "".join(pieces)}
+            await asyncio.to_thread(job_events.publish, self.job_id, event)
+
+
+def _finish_job(db, job_id, *, status: str, output_data: dict):
+    """Final state write; never overwrites a job that was cancelled meanwhile."""
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job_uuid(job_id), Job.status == "running")
+        .values(
+            status=status,
+            progress=100 if status == "completed" else Job.progress,
+            output_data=output_data,
+            finished_at=datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        job_events.publish(job_id, {"type": "status", "status": status}, db=db)
+        if status == "completed":
+            clear_checkpoints(db, job_id)
+    db.commit()
+
+
+async def _process_job(job_id):
+    """
+    Run a job that a worker has already claimed (status == "running").
+    Many of these share the worker pool's event loop; DB work goes to threads.
+
+    Every finished stage is checkpointed, so a retried or requeued job
+    (POST /jobs/{id}/retry, orphan recovery) resumes after its last
+    finished stage instead of paying for those model calls again.
+    """
+    job_id = job_uuid(job_id)
+    db = WorkerSessionLocal()
     try:
-        for idx, stage in enumerate(stages):
-            stage_output = orchestrator.run_single(stage, current_text)
-            current_text = stage_output
-
-            # smooth progress update
-            for tick in range(1, 21):
-                time.sleep(0.2)
-                db_inner = SessionLocal()
-                job_inner = db_inner.get(Job, job_id)
-                stage_progress = ((idx + tick/20)/total_stages) * 100
-                _update_job(job_inner, db_inner, progress=int(stage_progress))
-                db_inner.close()
-
-                db_inner = SessionLocal()
-                job_inner = db_inner.get(Job, job_id)
-                if job_inner.status == "cancelled":
-                    db_inner.close()
-                    return
-                db_inner.close()
-
-        db_final = SessionLocal()
-        job_final = db_final.get(Job, job_id)
-        if job_final.status != "cancelled":
-            _update_job(job_final, db_final, status="completed", progress=100,
-                        output_data={"final_report": current_text})
-        db_final.close()
-    except Exception as e:
-        db_error = SessionLocal()
-        job_error = db_error.get(Job, job_id)
-        if job_error:
-            _update_job(job_error, db_error, status="failed", output_data={"error": str(e)})
-        db_error.close()
+        job = await asyncio.to_thread(db.get, Job, job_id)
+        if not job:
+            logger.error("Job %s not found", job_id)
+            return
+        if job.status != "running":
+            return
+
+        options = job.options or {}
+        cancellation.register(job_id)
+
+        started = time.monotonic()
+        pipeline, status = options.get("pipeline") or "default", "failed"
+        with tracer.span("job", job_id=str(job_id), agent_id=str(job.agent_id)) as span:
+            try:
+                current_text = await load_job_text(job.input_data)
+                dag = get_pipeline(options.get("pipeline"))
+                # Documents that cannot fit a model context go through map-reduce
+                if not options.get("pipeline") and estimate_tokens(current_text) > settings.CHUNK_THRESHOLD_TOKENS:
+                    dag = CHUNKED_PIPELINE
+                pipeline = dag.name
+                completed = await asyncio.to_thread(load_checkpoints, job_id, dag)
+                progress = ProgressReporter(db, job_id, len(dag.stages))
+                relay = TokenRelay(job_id, dag, progress)
+                if completed:
+                    logger.info("Job %s resumes after stage(s) %s", job_id, ", ".join(completed))
+                    progress.stage_index = len(completed)
+                    await progress.stage_progress(0.0)
+
+                async def on_stage_complete(stage, output):
+                    await relay.flush(stage)
+                    await asyncio.to_thread(save_checkpoint, job_id, dag.name, stage.name, output)
+                    await progress.stage_completed(stage.name)
+
+                with cache_bypass(options.get("bypass_cache", False)):
+                    report = await orchestrator.execute(
+                        dag, current_text,
+                        on_stage_complete=on_stage_complete,
+                        before_stage=lambda stage: cancellation.raise_if_cancelled(job_id),
+                        on_token=relay.on_token,
+                        completed=completed,
+                    )
+                # The report body lives in the content store; the row keeps a reference
+                ref = await asyncio.to_thread(content_store.put_text, report)
+                await asyncio.to_thread(
+                    _finish_job, db, job_id, status="completed",
+                    output_data={"report": ref, "preview": report[:settings.REPORT_PREVIEW_CHARS]},
+                )
+                status = "completed"
+            except JobCancelled:
+                status = "cancelled"
+                logger.info("Job %s cancelled", job_id)
+            except Exception as e:
+                logger.exception("Job %s failed", job_id)
+                await asyncio.to_thread(db.rollback)
+                await asyncio.to_thread(
+                    _finish_job, db, job_id, status="failed", output_data={"error": str(e)}
+                )
+            if span is not None:
+                span.set_attribute("pipeline", pipeline)
+                span.set_attribute("status", status)
+        JOB_DURATION.observe(time.monotonic() - started, pipeline=pipeline, status=status)
+    finally:
+        cancellation.unregister(job_id)
+        await asyncio.to_thread(db.close)
@@ -1,10 +1,34 @@
 # app/services/mcp/base.py
+import contextvars
+import time
+from contextlib import contextmanager
 from pydantic import BaseModel
+from app.services.hf_client import ahf_generate, ahf_stream, hf_generate
+from app.services.mcp.cache import tool_cache
+from app.services.telemetry import record_model_call, tracer
+
+# Set by the orchestrator around a stage whose output is streamed to clients
+_token_sink = contextvars.ContextVar("token_sink", default=None)
+
+
+@contextmanager
+def stream_tokens(sink):
+    """
+    Within this block, .agenerate() streams from the model and awaits
+    `sink(text)` for every generated piece (a cache hit is one piece).
+    """
+    token = _token_sink.set(sink)
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
 
 class MCPTool:
     """
     Base class for all MCP tools.
-    Each tool should inherit from this and implement .run()
+    Each tool should inherit from this and implement .run() and,
+    for the async orchestrator, .arun()
     """
 
     name: str
@@ -18,3 +42,58 @@ class MCPTool:
         Must return an instance of OutputSchema
         """
         raise NotImplementedError("Tool must implement .run()")
+
+    async def arun(self, input_data: BaseModel):
+        """
+        Async version of .run(). Must return an instance of OutputSchema
+        """
+        raise NotImplementedError("Tool must implement .arun()")
+
+    def generate(self, model: str, prompt: str, max_tokens: int = 500) -> str:
+        """
+        Call the model through the tool result cache.
+        Tools should use this instead of hf_generate directly.
+        """
+        def compute():
+            with tracer.span("model_call", tool=self.name, model=model, prompt_chars=len(prompt)) as span:
+                started = time.monotonic()
+                value = hf_generate(model, prompt, max_tokens=max_tokens)
+                self._record(span, model, prompt, value, started)
+            return value
+
+        return tool_cache.get_or_compute(self.name, model, prompt, {"max_new_tokens": max_tokens}, compute)
+
+    async def agenerate(self, model: str, prompt: str, max_tokens: int = 500) -> str:
+        """Async version of .generate(); streams tokens inside stream_tokens()"""
+        sink = _token_sink.get()
+        streamed = False
+
+        async def compute():
+            nonlocal streamed
+            with tracer.span("model_call", tool=self.name, model=model, prompt_chars=len(prompt)) as span:
+                started = time.monotonic()
+                if sink is None:
+                    value = await ahf_generate(model, prompt, max_tokens=max_tokens)
+                else:
+                    streamed = True
+                    parts = []
+                    async for piece in ahf_stream(model, prompt, max_tokens=max_tokens):
+                        parts.append(piece)
+                        await sink(piece)
+                    value = "".join(parts)
+                self._record(span, model, prompt, value, started)
+            return value
+
+        if sink is None:
+            return await tool_cache.aget_or_compute(self.name, model, prompt, {"max_new_tokens": max_tokens}, compute)
+
+        value = await tool_cache.aget_or_compute(self.name, model, prompt, {"max_new_tokens": max_tokens}, compute)
+        if not streamed:
+            await sink(value)
+        return value
+
+    def _record(self, span, model: str, prompt: str, output: str, started: float):
+        """Usage metrics for one real model call (cache hits never get here)."""
+        record_model_call(self.name, model, prompt, output, time.monotonic() - started)
+        if span is not None:
+            span.set_attribute("output_chars", len(output or ""))
@@ -0,0 +1,304 @@
+# app/services/mcp/cache.py
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.config import settings
+# Lookups happen inside jobs, so the persistent tier uses the worker pool
+from app.db.engine import WorkerSessionLocal as SessionLocal
+from app.db.tool_cache import ToolCacheEntry
+from app.services.telemetry.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# Set per job by the runner; when True every lookup is a miss and nothing is stored
+_bypass = contextvars.ContextVar("tool_cache_bypass", default=False)
+
+
+@contextmanager
+def cache_bypass(enabled: bool = True):
+    token = _bypass.set(bool(enabled))
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def cache_key(tool: str, model: str, prompt: str, params: dict | None = None) -> str:
+    """Content address of a tool call: identical inputs give the same key."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    material = json.dumps([tool, model, prompt_hash, params or {}], sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# TIERS
+# -----------------------------
+class CacheTier:
+    name = "base"
+
+    def get(self, key: str) -> str | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, *, tool: str, model: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LRUCacheTier(CacheTier):
+    """In-process LRU with a TTL per entry."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                self.evictions += 1
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, *, tool, model):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class PostgresCacheTier(CacheTier):
+    """
+    Shared tier in the `tool_cache` table so results survive restarts and are
+    visible to every worker process. Expired rows and rows beyond `max_rows`
+    (oldest first) are pruned every `prune_every` writes.
+    """
+
+    name = "postgres"
+
+    def __init__(self, ttl: float, max_rows: int, prune_every: int = 200):
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        db = SessionLocal()
+        try:
+            value = db.execute(
+                update(ToolCacheEntry)
+                .where(ToolCacheEntry.key == key, ToolCacheEntry.expires_at > datetime.now(timezone.utc))
+                .values(hits=ToolCacheEntry.hits + 1)
+                .returning(ToolCacheEntry.value)
+                .execution_options(synchronize_session=False)
+            ).scalar_one_or_none()
+            db.commit()
+            return value
+        finally:
+            db.close()
+
+    def set(self, key, value, *, tool, model):
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        stmt = pg_insert(ToolCacheEntry).values(key=key, tool=tool, model=model, value=value, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ToolCacheEntry.key],
+            set_={"value": stmt.excluded.value, "expires_at": stmt.excluded.expires_at},
+        )
+        db = SessionLocal()
+        try:
+            db.execute(stmt)
+            db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.prune_every == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        db = SessionLocal()
+        try:
+            db.execute(delete(ToolCacheEntry).where(ToolCacheEntry.expires_at <= datetime.now(timezone.utc)))
+            overflow = (
+                select(ToolCacheEntry.key)
+                .order_by(ToolCacheEntry.created_at.desc())
+                .offset(self.max_rows)
+                .scalar_subquery()
+            )
+            db.execute(delete(ToolCacheEntry).where(ToolCacheEntry.key.in_(overflow)))
+            db.commit()
+        finally:
+            db.close()
+
+    def clear(self):
+        db = SessionLocal()
+        try:
+            db.execute(delete(ToolCacheEntry))
+            db.commit()
+        finally:
+            db.close()
+
+
+# -----------------------------
+# CACHE
+# -----------------------------
+class ToolResultCache:
+    """
+    Read-through cache in front of model calls made by MCP tools.
+    Tiers are checked in order; a hit in a slower tier is copied into the
+    faster ones. Empty results are returned but never stored: a blank model
+    response fails its stage, and caching it would fail every identical job
+    until the entry expires.
+    """
+
+    def __init__(self, tiers: list[CacheTier], enabled: bool = True):
+        self.tiers = tiers
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats = {"misses": 0, "bypassed": 0, "stores": 0, "skipped": 0, "errors": 0}
+        for tier in tiers:
+            self._stats[f"hits_{tier.name}"] = 0
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _lookup(self, tool: str, result: str, stat: str):
+        self._count(stat)
+        CACHE_LOOKUPS.inc(tool=tool, result=result)
+
+    @staticmethod
+    def cacheable(value) -> bool:
+        return isinstance(value, str) and bool(value.strip())
+
+    def get_or_compute(self, tool: str, model: str, prompt: str, params: dict, compute):
+        if not self.enabled or _bypass.get():
+            if self.enabled:
+                self._lookup(tool, "bypass", "bypassed")
+            return compute()
+
+        key = cache_key(tool, model, prompt, params)
+        for i, tier in enumerate(self.tiers):
+            try:
+                value = tier.get(key)
+            except Exception:
+                logger.exception("Cache tier %s lookup failed", tier.name)
+                self._count("errors")
+                continue
+            if value is not None:
+                self._lookup(tool, f"hit_{tier.name}", f"hits_{tier.name}")
+                for faster in self.tiers[:i]:
+                    faster.set(key, value, tool=tool, model=model)
+                return value
+
+        self._lookup(tool, "miss", "misses")
+        value = compute()
+        if not self.cacheable(value):
+            self._count("skipped")
+            return value
+        for tier in self.tiers:
+            try:
+                tier.set(key, value, tool=tool, model=model)
+            except Exception:
+                logger.exception("Cache tier %s store failed", tier.name)
+                self._count("errors")
+        self._count("stores")
+        return value
+
+    async def aget_or_compute(self, tool: str, model: str, prompt: str, params: dict, acompute):
+        """Async variant; tier I/O runs in a thread so the event loop never blocks on the DB."""
+        if not self.enabled or _bypass.get():
+            if self.enabled:
+                self._lookup(tool, "bypass", "bypassed")
+            return await acompute()
+
+        key = cache_key(tool, model, prompt, params)
+        for i, tier in enumerate(self.tiers):
+            try:
+                value = tier.get(key) if isinstance(tier, LRUCacheTier) else await asyncio.to_thread(tier.get, key)
+            except Exception:
+                logger.exception("Cache tier %s lookup failed", tier.name)
+                self._count("errors")
+                continue
+            if value is not None:
+                self._lookup(tool, f"hit_{tier.name}", f"hits_{tier.name}")
+                for faster in self.tiers[:i]:
+                    faster.set(key, value, tool=tool, model=model)
+                return value
+
+        self._lookup(tool, "miss", "misses")
+        value = await acompute()
+        if not self.cacheable(value):
+            self._count("skipped")
+            return value
+        for tier in self.tiers:
+            try:
+                if isinstance(tier, LRUCacheTier):
+                    tier.set(key, value, tool=tool, model=model)
+                else:
+                    await asyncio.to_thread(tier.set, key, value, tool=tool, model=model)
+            except Exception:
+                logger.exception("Cache tier %s store failed", tier.name)
+                self._count("errors")
+        self._count("stores")
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        hits = sum(v for k, v in stats.items() if k.startswith("hits_"))
+        lookups = hits + stats["misses"]
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        for tier in self.tiers:
+            if isinstance(tier, LRUCacheTier):
+                stats["memory_entries"] = len(tier)
+                stats["memory_evictions"] = tier.evictions
+        return stats
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+
+def _build_cache() -> ToolResultCache:
+    tiers: list[CacheTier] = [LRUCacheTier(settings.TOOL_CACHE_MAX_ENTRIES, settings.TOOL_CACHE_TTL)]
+    if settings.TOOL_CACHE_PERSISTENT:
+        tiers.append(PostgresCacheTier(settings.TOOL_CACHE_TTL, settings.TOOL_CACHE_PERSISTENT_MAX_ROWS))
+    return ToolResultCache(tiers, enabled=settings.TOOL_CACHE_ENABLED)
+
+
+tool_cache = _build_cache()
@@ -1,7 +1,6 @@
 # app/services/mcp/citation.py
 from pydantic import BaseModel
 from app.services.mcp.base import MCPTool
-from app.services.hf_client import hf_generate
 from app.services.mcp.registry import tool_registry
 
 MODEL = "google/flan-t5-large"
@@ -18,9 +17,15 @@ class CitationTool(MCPTool):
     InputSchema = CitationInput
     OutputSchema = CitationOutput
 
+    def build_prompt(self, input_data: CitationInput) -> str:
+        return f"Add citation markers:\n{input_data.text}"
+
     def run(self, input_data: CitationInput):
-        prompt = f"Add citation markers:\n{input_data.text}"
-        output = hf_generate(MODEL, prompt)
+        output = self.generate(MODEL, self.build_prompt(input_data))
+        return CitationOutput(cited_text=output)
+
+    async def arun(self, input_data: CitationInput):
+        output = await self.agenerate(MODEL, self.build_prompt(input_data))
         return CitationOutput(cited_text=output)
 
 tool_registry.register(CitationTool())
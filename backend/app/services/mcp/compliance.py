@@ -1,7 +1,6 @@
 # app/services/mcp/compliance.py
 from pydantic import BaseModel
 from app.services.mcp.base import MCPTool
-from app.services.hf_client import hf_generate
 from app.services.mcp.registry import tool_registry
 
 MODEL = "meta-llama/Llama-3.2-1B-Instruct"
@@ -18,9 +17,15 @@ class ComplianceTool(MCPTool):
     InputSchema = ComplianceInput
     OutputSchema = ComplianceOutput
 
+    def build_prompt(self, input_data: ComplianceInput) -> str:
+        return f"Neutralize and ensure safety compliance:\n{input_data.text}"
+
     def run(self, input_data: ComplianceInput):
-        prompt = f"Neutralize and ensure safety compliance:\n{input_data.text}"
-        output = hf_generate(MODEL, prompt)
+        output = self.generate(MODEL, self.build_prompt(input_data))
+        return ComplianceOutput(safe_text=output)
+
+    async def arun(self, input_data: ComplianceInput):
+        output = await self.agenerate(MODEL, self.build_prompt(input_data))
         return ComplianceOutput(safe_text=output)
 
 tool_registry.register(ComplianceTool())
@@ -1,7 +1,6 @@
 # app/services/mcp/formatter.py
 from pydantic import BaseModel
 from app.services.mcp.base import MCPTool
-from app.services.hf_client import hf_generate
 from app.services.mcp.registry import tool_registry
 
 MODEL = "facebook/bart-large-cnn"
@@ -18,9 +17,15 @@ class FormatterTool(MCPTool):
     InputSchema = FormatterInput
     OutputSchema = FormatterOutput
 
+    def build_prompt(self, input_data: FormatterInput) -> str:
+        return f"Format professionally:\n{input_data.text}"
+
     def run(self, input_data: FormatterInput):
-        prompt = f"Format professionally:\n{input_data.text}"
-        output = hf_generate(MODEL, prompt)
+        output = self.generate(MODEL, self.build_prompt(input_data))
+        return FormatterOutput(formatted=output)
+
+    async def arun(self, input_data: FormatterInput):
+        output = await self.agenerate(MODEL, self.build_prompt(input_data))
         return FormatterOutput(formatted=output)
 
 tool_registry.register(FormatterTool())
@@ -2,7 +2,6 @@
 
 from pydantic import BaseModel
 from app.services.mcp.base import MCPTool
-from app.services.hf_client import hf_generate
 from app.services.mcp.registry import tool_registry
 
 MODEL = "meta-llama/Llama-3.2-1B-Instruct"
@@ -19,9 +18,15 @@ class IngestionTool(MCPTool):
     InputSchema = IngestionInput
     OutputSchema = IngestionOutput
 
+    def build_prompt(self, input_data: IngestionInput) -> str:
+        return f"Extract clean structured content:\n\n{input_data.text}"
+
     def run(self, input_data: IngestionInput):
-        prompt = f"Extract clean structured content:\n\n{input_data.text}"
-        output = hf_generate(MODEL, prompt)
+        output = self.generate(MODEL, self.build_prompt(input_data))
+        return IngestionOutput(content=output)
+
+    async def arun(self, input_data: IngestionInput):
+        output = await self.agenerate(MODEL, self.build_prompt(input_data))
         return IngestionOutput(content=output)
 
 tool_registry.register(IngestionTool())
@@ -0,0 +1,35 @@
+# app/services/mcp/reducer.py
+from pydantic import BaseModel
+from app.services.mcp.base import MCPTool
+from app.services.mcp.registry import tool_registry
+
+MODEL = "microsoft/Phi-3-mini-4k-instruct"
+
+class ReducerInput(BaseModel):
+    text: str
+
+class ReducerOutput(BaseModel):
+    notes: str
+
+class ReducerTool(MCPTool):
+    name = "reducer"
+    description = "Merge partial research notes into one set of notes"
+    InputSchema = ReducerInput
+    OutputSchema = ReducerOutput
+
+    def build_prompt(self, input_data: ReducerInput) -> str:
+        return (
+            "Merge these research notes into one coherent set of notes. "
+            "Keep every distinct fact, drop duplicates:\n"
+            f"{input_data.text}"
+        )
+
+    def run(self, input_data: ReducerInput):
+        output = self.generate(MODEL, self.build_prompt(input_data))
+        return ReducerOutput(notes=output)
+
+    async def arun(self, input_data: ReducerInput):
+        output = await self.agenerate(MODEL, self.build_prompt(input_data))
+        return ReducerOutput(notes=output)
+
+tool_registry.register(ReducerTool())
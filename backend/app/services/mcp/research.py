@@ -1,7 +1,6 @@
 # app/services/mcp/research.py
 from pydantic import BaseModel
 from app.services.mcp.base import MCPTool
-from app.services.hf_client import hf_generate
 from app.services.mcp.registry import tool_registry
 
 MODEL = "microsoft/Phi-3-mini-4k-instruct"
@@ -18,9 +17,15 @@ class ResearchTool(MCPTool):
     InputSchema = ResearchInput
     OutputSchema = ResearchOutput
 
+    def build_prompt(self, input_data: ResearchInput) -> str:
+        return f"Research this topic:\n{input_data.text}"
+
     def run(self, input_data: ResearchInput):
-        prompt = f"Research this topic:\n{input_data.text}"
-        output = hf_generate(MODEL, prompt)
+        output = self.generate(MODEL, self.build_prompt(input_data))
+        return ResearchOutput(notes=output)
+
+    async def arun(self, input_data: ResearchInput):
+        output = await self.agenerate(MODEL, self.build_prompt(input_data))
         return ResearchOutput(notes=output)
 
 tool_registry.register(ResearchTool())
@@ -0,0 +1,167 @@
+# app/services/pipeline.py
+import re
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Stage:
+    """
+    One node of a pipeline DAG.
+
+    name        -- unique node id (also what progress/checkpoints refer to)
+    tool        -- MCP tool name in the registry
+    depends_on  -- nodes whose outputs (joined in order) form this node's input;
+                   a node without dependencies receives the job's input text
+    split_sections -- run the tool concurrently over the sections of the
+                   input and join the results instead of one call on the whole;
+                   fed by another split stage, it takes over that stage's
+                   sections and starts each as soon as it is done there
+    map_chunks  -- split the input into token-bounded chunks (or keep the
+                   chunk list produced upstream) and run the tool per chunk
+                   in parallel; the output stays a list of chunk results
+    reduce      -- merge a list of chunk results hierarchically with the tool
+                   until a single text is left
+    """
+
+    name: str
+    tool: str
+    depends_on: list[str] = field(default_factory=list)
+    split_sections: bool = False
+    map_chunks: bool = False
+    reduce: bool = False
+
+
+@dataclass
+class PipelineDAG:
+    name: str
+    stages: list[Stage]
+    output: str
+
+    def __post_init__(self):
+        self._order = self._toposort()
+
+    def _toposort(self) -> list[Stage]:
+        by_name = {s.name: s for s in self.stages}
+        if len(by_name) != len(self.stages):
+            raise ValueError(f"Pipeline {self.name}: duplicate stage names")
+        if self.output not in by_name:
+            raise ValueError(f"Pipeline {self.name}: unknown output stage {self.output}")
+
+        order, state = [], {}
+
+        def visit(stage: Stage):
+            if state.get(stage.name) == "done":
+                return
+            if state.get(stage.name) == "visiting":
+                raise ValueError(f"Pipeline {self.name}: cycle at stage {stage.name}")
+            state[stage.name] = "visiting"
+            for dep in stage.depends_on:
+                if dep not in by_name:
+                    raise ValueError(f"Pipeline {self.name}: {stage.name} depends on unknown stage {dep}")
+                visit(by_name[dep])
+            state[stage.name] = "done"
+            order.append(stage)
+
+        for stage in self.stages:
+            visit(stage)
+        return order
+
+    @property
+    def order(self) -> list[Stage]:
+        """Stages in dependency order (every stage after its dependencies)."""
+        return list(self._order)
+
+
+# -----------------------------
+# SECTION SPLITTING
+# -----------------------------
+_HEADING = re.compile(r"^(#{1,6}\s|\d+(\.\d+)*[.)]\s|[A-Z][A-Z0-9 ,&-]{3,}$)")
+
+
+def split_sections(text: str, max_sections: int = 8) -> list[str]:
+    """
+    Split text at headings (falling back to blank lines) and merge the pieces
+    into at most `max_sections` sections of roughly equal size.
+    """
+    blocks, current = [], []
+    for line in text.splitlines():
+        if _HEADING.match(line.strip()) and current:
+            blocks.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current).strip())
+    if len(blocks) <= 1:
+        blocks = [b.strip() for b in re.split(r"\n\s*\n", text)]
+    blocks = [b for b in blocks if b]
+    if len(blocks) <= max_sections:
+        return blocks or [text]
+
+    target = sum(len(b) for b in blocks) / max_sections
+    sections, buf, size = [], [], 0
+    for block in blocks:
+        buf.append(block)
+        size += len(block)
+        if size >= target and len(sections) < max_sections - 1:
+            sections.append("\n\n".join(buf))
+            buf, size = [], 0
+    if buf:
+        sections.append("\n\n".join(buf))
+    return sections
+
+
+# -----------------------------
+# PIPELINE CONFIGS
+# -----------------------------
+# The original strictly serial 5-step pipeline
+DEFAULT_PIPELINE = PipelineDAG(
+    name="default",
+    stages=[
+        Stage("ingestion", "ingestion"),
+        Stage("research", "research", ["ingestion"]),
+        Stage("citation", "citation", ["research"]),
+        Stage("formatting", "formatter", ["citation"]),
+        Stage("compliance", "compliance", ["formatting"]),
+    ],
+    output="compliance",
+)
+
+# Same tools, but citation checking and formatting fan out over the
+# sections of the research notes and run concurrently; a section is
+# formatted as soon as its own citation check is done
+SECTIONED_PIPELINE = PipelineDAG(
+    name="sectioned",
+    stages=[
+        Stage("ingestion", "ingestion"),
+        Stage("research", "research", ["ingestion"]),
+        Stage("citation", "citation", ["research"], split_sections=True),
+        Stage("formatting", "formatter", ["citation"], split_sections=True),
+        Stage("compliance", "compliance", ["formatting"]),
+    ],
+    output="compliance",
+)
+
+# Large documents: ingestion and research run per chunk in parallel, the
+# notes are reduced hierarchically, then the usual tail of the pipeline
+CHUNKED_PIPELINE = PipelineDAG(
+    name="chunked",
+    stages=[
+        Stage("ingestion", "ingestion", map_chunks=True),
+        Stage("research", "research", ["ingestion"], map_chunks=True),
+        Stage("reduce", "reducer", ["research"], reduce=True),
+        Stage("citation", "citation", ["reduce"]),
+        Stage("formatting", "formatter", ["citation"]),
+        Stage("compliance", "compliance", ["formatting"]),
+    ],
+    output="compliance",
+)
+
+PIPELINES = {p.name: p for p in (DEFAULT_PIPELINE, SECTIONED_PIPELINE, CHUNKED_PIPELINE)}
+
+
+def get_pipeline(name: str | None) -> PipelineDAG:
+    if not name:
+        return DEFAULT_PIPELINE
+    if name not in PIPELINES:
+        raise ValueError(f"Unknown pipeline: {name}")
+    return PIPELINES[name]
@@ -0,0 +1,220 @@
+# app/services/report_versions.py
+import asyncio
+import difflib
+import json
+import threading
+import zlib
+from collections import OrderedDict
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import undefer
+
+from app.config import settings
+from app.db.report import Report
+from app.db.report_version import ReportVersion
+from app.services.content_store import content_store
+
+
+def make_delta(old: str, new: str) -> bytes:
+    """
+    Line-level edit script turning `old` into `new`, zlib-compressed JSON:
+    [start, end] copies old lines, a list of strings inserts new ones.
+    """
+    old_lines, new_lines = old.splitlines(keepends=True), new.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:  # replace / insert; deletes just skip old lines
+            ops.append(new_lines[j1:j2])
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    lines = base.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(zlib.decompress(delta)):
+        if op and isinstance(op[0], int):
+            parts.extend(lines[op[0]:op[1]])
+        else:
+            parts.extend(op)
+    return "".join(parts)
+
+
+class ReportVersionStore:
+    """
+    Version history as periodic full snapshots plus deltas.
+
+    A version is a snapshot (text in the content store, like before) every
+    `snapshot_interval` versions, or when its delta would not be much
+    smaller than the text; the versions in between only keep a compressed
+    line delta against their predecessor. Reading version N replays the
+    deltas from the closest snapshot (or from the closest version in the
+    LRU of materialized texts), so a read applies at most
+    `snapshot_interval - 1` small deltas.
+
+    The LRU is per process and keyed by version id: versions never change,
+    and every read looks the id up in the database first, so a report
+    deleted by another process is never served from memory.
+    """
+
+    def __init__(self, snapshot_interval: int = 10, cache_size: int = 128):
+        self.snapshot_interval = max(snapshot_interval, 1)
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()  # version id -> text
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # LRU OF MATERIALIZED VERSIONS
+    # -----------------------------
+    def _cached(self, version_id) -> str | None:
+        with self._lock:
+            text = self._cache.get(version_id)
+            if text is not None:
+                self._cache.move_to_end(version_id)
+            return text
+
+    def _remember(self, version_id, text: str):
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[version_id] = text
+            self._cache.move_to_end(version_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # -----------------------------
+    # READ
+    # -----------------------------
+    @staticmethod
+    def _snapshot_text(row) -> str:
+        if row.content_ref:
+            return content_store.read_text(row.content_ref)
+        return row.content or ""
+
+    async def get_text(self, db, report_id, version_number: int) -> str | None:
+        """Full text of one version, or None if it does not exist."""
+        version_id = await db.scalar(
+            select(ReportVersion.id).where(
+                ReportVersion.report_id == report_id, ReportVersion.version_number == version_number
+            )
+        )
+        if version_id is None:
+            return None
+        text = self._cached(version_id)
+        if text is not None:
+            return text
+
+        # Closest snapshot at or below the version; deltas from there on
+        snapshot = (
+            select(func.max(ReportVersion.version_number))
+            .where(
+                ReportVersion.report_id == report_id,
+                ReportVersion.version_number <= version_number,
+                ReportVersion.delta.is_(None),
+            )
+            .scalar_subquery()
+        )
+        rows = (
+            await db.execute(
+                select(ReportVersion)
+                .options(undefer(ReportVersion.delta))
+                .where(
+                    ReportVersion.report_id == report_id,
+                    ReportVersion.version_number >= func.coalesce(snapshot, 1),
+                    ReportVersion.version_number <= version_number,
+                )
+                .order_by(ReportVersion.version_number)
+            )
+        ).scalars().all()
+        if not rows or rows[-1].version_number != version_number:
+            return None
+
+        # Start from the newest version we already have in memory, if any
+        start, text = 0, None
+        for i in range(len(rows) - 1, -1, -1):
+            text = self._cached(rows[i].id)
+            if text is not None:
+                start = i + 1
+                break
+        if text is None:
+            if rows[0].delta is not None:
+                raise ValueError(f"Report {report_id} version {rows[0].version_number} has no snapshot to start from")
+            text = await asyncio.to_thread(self._snapshot_text, rows[0])
+            start = 1
+
+        deltas = [row.delta for row in rows[start:]]
+        if deltas:
+            text = await asyncio.to_thread(self._replay, text, deltas)
+        self._remember(version_id, text)
+        return text
+
+    @staticmethod
+    def _replay(text: str, deltas: list[bytes]) -> str:
+        for delta in deltas:
+            text = apply_delta(text, delta)
+        return text
+
+    async def diff(self, db, report_id, from_version: int, to_version: int, context: int = 3) -> str | None:
+        """Unified diff between two versions; None if either does not exist."""
+        old = await self.get_text(db, report_id, from_version)
+        new = await self.get_text(db, report_id, to_version)
+        if old is None or new is None:
+            return None
+        return "".join(difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            fromfile=f"v{from_version}",
+            tofile=f"v{to_version}",
+            n=context,
+        ))
+
+    # -----------------------------
+    # WRITE
+    # -----------------------------
+    async def add_version(self, db, report: Report, content: str, metadata=None) -> ReportVersion:
+        """
+        Append a version to `report` and make it current. The caller
+        commits (then calls remember()); the report row is locked until
+        then so version numbers stay consecutive.
+        """
+        await db.execute(select(Report.id).where(Report.id == report.id).with_for_update())
+        previous = await db.scalar(
+            select(func.max(ReportVersion.version_number)).where(ReportVersion.report_id == report.id)
+        )
+        number = (previous or 0) + 1
+        version = ReportVersion(
+            report_id=report.id,
+            version_number=number,
+            report_metadata=metadata,
+            content_size=len(content.encode("utf-8")),
+        )
+
+        delta = None
+        if previous and (number - 1) % self.snapshot_interval:
+            previous_text = await self.get_text(db, report.id, previous)
+            if previous_text is not None:
+                delta = await asyncio.to_thread(make_delta, previous_text, content)
+                # Mostly rewritten: a snapshot is cheaper to read back
+                if len(delta) > version.content_size // 2:
+                    delta = None
+        if delta is not None:
+            version.delta, version.base_version = delta, previous
+        else:
+            version.content_ref = (await asyncio.to_thread(content_store.put_text, content))["sha256"]
+
+        db.add(version)
+        await db.flush()
+        report.current_version_id = version.id
+        return version
+
+    def remember(self, version_id, text: str):
+        """Seed the LRU with a committed version (the next delta is made against it)."""
+        self._remember(version_id, text)
+
+
+version_store = ReportVersionStore(
+    snapshot_interval=settings.REPORT_SNAPSHOT_INTERVAL,
+    cache_size=settings.REPORT_VERSION_CACHE_SIZE,
+)
@@ -0,0 +1,198 @@
+# app/services/scheduler.py
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.db.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Any constant works; it only has to be the same in every worker process
+_SCHEDULER_LOCK_ID = 0x6A6F6273
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class FairScheduler:
+    """
+    Decides which pending job a worker claims next.
+
+    Candidates are the heads of the pending queues, one queue per
+    (user, agent, priority class). Users and agents at their running-job
+    quota are skipped. Among the rest, weighted fair queuing: a job's score
+    is (jobs its user already runs + 1) / class weight, lowest first, so a
+    user's third concurrent job waits behind everyone else's first one, and
+    an interactive job beats bulk work. Waiting divides the score
+    (1 + waited / JOB_AGING_SECONDS), so bulk jobs are never starved.
+    """
+
+    def __init__(
+        self,
+        weights: dict[str, float],
+        user_quota: int = 0,
+        agent_quota: int = 0,
+        aging_seconds: float = 600.0,
+        window: int = 500,
+    ):
+        self.weights = weights
+        self.user_quota = user_quota
+        self.agent_quota = agent_quota
+        self.aging_seconds = aging_seconds
+        self.window = window
+
+    @property
+    def priorities(self) -> list[str]:
+        """Priority classes, most important first."""
+        return sorted(self.weights, key=self.weights.get, reverse=True)
+
+    def weight(self, priority: str | None) -> float:
+        return float(self.weights.get(priority or settings.JOB_DEFAULT_PRIORITY) or 1.0)
+
+    def score(self, priority: str | None, running: int, created_at: datetime | None, now: datetime) -> float:
+        waited = max((now - _aware(created_at)).total_seconds(), 0.0) if created_at else 0.0
+        return (running + 1) / self.weight(priority) / (1 + waited / self.aging_seconds)
+
+    # -----------------------------
+    # CLAIMING (worker, sync session)
+    # -----------------------------
+    def lock(self, db):
+        """
+        Serialize claims across workers for the rest of the transaction, so
+        quotas are exact. Taken after ranking, around admit() and the
+        conditional UPDATE only: a few primary key lookups.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(select(func.pg_advisory_xact_lock(_SCHEDULER_LOCK_ID)))
+
+    def _queue_heads(self):
+        """
+        Oldest pending job of every queue, as a loose index scan on
+        ix_jobs_status_queue_created_at: each step seeks the first pending
+        job of the next (user, agent, priority) queue, so the cost grows with
+        the number of queues, not with the number of pending jobs.
+        """
+        queue = (Job.created_by, Job.agent_id, Job.priority)
+        order = (*queue, Job.created_at, Job.id)
+        columns = (Job.id, Job.created_by, Job.agent_id, Job.priority, Job.created_at)
+
+        first = select(Job.id).where(Job.status == "pending").order_by(*order).limit(1).scalar_subquery()
+        heads = select(*columns).where(Job.id == first).cte("queue_heads", recursive=True)
+
+        following = (
+            select(Job.id)
+            .where(Job.status == "pending", tuple_(*queue) > tuple_(heads.c.created_by, heads.c.agent_id, heads.c.priority))
+            .order_by(*order)
+            .limit(1)
+            .correlate(heads)
+            .scalar_subquery()
+        )
+        head = aliased(Job, name="head")
+        heads = heads.union_all(
+            select(head.id, head.created_by, head.agent_id, head.priority, head.created_at)
+            .select_from(heads)
+            .join(head, head.id == following)
+        )
+        return select(heads).order_by(heads.c.created_at).limit(self.window)
+
+    @staticmethod
+    def _running_by(db, column) -> dict:
+        return dict(db.execute(select(column, func.count()).where(Job.status == "running").group_by(column)).all())
+
+    def rank(self, db, now: datetime | None = None) -> list:
+        """Queue heads within quota (id, created_by, agent_id, priority, created_at), best first."""
+        heads = db.execute(self._queue_heads()).all()
+        if not heads:
+            return []
+
+        now = now or datetime.now(timezone.utc)
+        by_user = self._running_by(db, Job.created_by)
+        by_agent = self._running_by(db, Job.agent_id) if self.agent_quota else {}
+
+        ranked = []
+        for head in heads:
+            running = by_user.get(head.created_by, 0)
+            if self.user_quota and running >= self.user_quota:
+                continue
+            if self.agent_quota and by_agent.get(head.agent_id, 0) >= self.agent_quota:
+                continue
+            key = (self.score(head.priority, running, head.created_at, now), _aware(head.created_at) if head.created_at else now)
+            ranked.append((key, head))
+        ranked.sort(key=lambda item: item[0])
+        return [head for _, head in ranked]
+
+    def pick(self, db, now: datetime | None = None):
+        """The pending job to run next, or None."""
+        ranked = self.rank(db, now)
+        return ranked[0] if ranked else None
+
+    def admit(self, db, head) -> bool:
+        """
+        Re-check the quotas of a ranked head under lock(): other workers may
+        have claimed jobs of the same user or agent since rank() counted.
+        """
+        for quota, column, value in (
+            (self.user_quota, Job.created_by, head.created_by),
+            (self.agent_quota, Job.agent_id, head.agent_id),
+        ):
+            if quota:
+                running = db.scalar(select(func.count()).select_from(Job).where(Job.status == "running", column == value))
+                if running >= quota:
+                    return False
+        return True
+
+    # -----------------------------
+    # ESTIMATES (API, async session)
+    # -----------------------------
+    async def estimate(self, db, job: Job) -> tuple[int | None, float | None]:
+        """
+        (queue position, ETA seconds) for a pending job; (None, None) otherwise.
+
+        The position counts pending jobs of more important classes plus older
+        ones of the same class. Fair share can reorder users, so it is an
+        estimate. The ETA is position / running jobs (the current capacity)
+        times the mean run time of recent completed jobs.
+        """
+        if job.status != "pending":
+            return None, None
+
+        priorities = self.priorities
+        priority = job.priority or settings.JOB_DEFAULT_PRIORITY
+        higher = priorities[:priorities.index(priority)] if priority in priorities else []
+        ahead = await db.scalar(
+            select(func.count())
+            .select_from(Job)
+            .where(
+                Job.status == "pending",
+                Job.priority.in_(higher) | ((Job.priority == priority) & (Job.created_at < job.created_at)),
+            )
+        )
+        position = (ahead or 0) + 1
+
+        recent = (
+            await db.execute(
+                select(Job.started_at, Job.finished_at)
+                .where(Job.status == "completed", Job.started_at.is_not(None), Job.finished_at.is_not(None))
+                .order_by(Job.created_at.desc())
+                .limit(50)
+            )
+        ).all()
+        if not recent:
+            return position, None
+        mean_duration = sum((_aware(f) - _aware(s)).total_seconds() for s, f in recent) / len(recent)
+        running = await db.scalar(select(func.count()).select_from(Job).where(Job.status == "running"))
+        return position, round(position / max(running or 0, 1) * mean_duration, 1)
+
+
+scheduler = FairScheduler(
+    settings.JOB_PRIORITY_WEIGHTS,
+    user_quota=settings.USER_MAX_RUNNING_JOBS,
+    agent_quota=settings.AGENT_MAX_RUNNING_JOBS,
+    aging_seconds=settings.JOB_AGING_SECONDS,
+    window=settings.SCHEDULER_WINDOW,
+)
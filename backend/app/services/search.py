@@ -0,0 +1,301 @@
+# app/services/search.py
+import asyncio
+import math
+import re
+import threading
+from collections import Counter
+
+from sqlalchemy import event as sa_event
+from sqlalchemy import func, literal_column, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.report import Report
+from app.db.report_version import ReportVersion
+from app.services.report_versions import version_store
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were with".split()
+)
+
+# Field weights, as setweight() A / B / C
+FIELD_WEIGHTS = (1.0, 0.4, 0.2)  # title, summary, content
+HEADLINE_OPTIONS = "StartSel=<b>, StopSel=</b>, MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter= … "
+SNIPPET_WORDS = 30
+
+# Session.info key for in-memory index updates held back until the transaction commits
+_PENDING_KEY = "search_pending"
+
+
+def tokenize(text: str | None) -> list[str]:
+    return [t for t in _TOKEN.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+class InvertedIndex:
+    """
+    In-memory stand-in for the tsvector index (SQLite / tests): term ->
+    {report_id: term frequency per field}. Queries match reports containing
+    every term, scored tf-idf with the same field weights as Postgres.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict] = {}
+        self._docs: dict = {}  # report_id -> (terms, fields, row)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, report_id, fields: tuple, row: dict):
+        counts = [Counter(tokenize(text)) for text in fields]
+        terms = set().union(*counts)
+        with self._lock:
+            self._remove(report_id)
+            for term in terms:
+                self._postings.setdefault(term, {})[report_id] = tuple(c[term] for c in counts)
+            self._docs[report_id] = (terms, fields, row)
+
+    def remove(self, report_id):
+        with self._lock:
+            self._remove(report_id)
+
+    def content(self, report_id) -> str:
+        """The indexed version text of a report ("" if none)."""
+        with self._lock:
+            doc = self._docs.get(report_id)
+            return doc[1][2] if doc else ""
+
+    def _remove(self, report_id):
+        doc = self._docs.pop(report_id, None)
+        if doc:
+            for term in doc[0]:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(report_id, None)
+                    if not postings:
+                        del self._postings[term]
+
+    def search(self, query: str) -> list[tuple[float, object, dict, str]]:
+        """(score, report_id, row, snippet) of every match, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            postings = [self._postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return []
+            matches = set.intersection(*(set(p) for p in sorted(postings, key=len)))
+            total = len(self._docs)
+            hits = []
+            for report_id in matches:
+                score = 0.0
+                for term_postings in postings:
+                    idf = math.log(1 + total / len(term_postings))
+                    tfs = term_postings[report_id]
+                    score += idf * sum(w * (1 + math.log(tf)) for w, tf in zip(FIELD_WEIGHTS, tfs) if tf)
+                _, fields, row = self._docs[report_id]
+                hits.append((round(score, 6), report_id, row, fields))
+        hits.sort(key=lambda hit: (hit[0], str(hit[1])), reverse=True)
+        return [(score, report_id, row, self.snippet(fields, set(terms))) for score, report_id, row, fields in hits]
+
+    @staticmethod
+    def snippet(fields: tuple, terms: set, words: int = SNIPPET_WORDS) -> str:
+        """A window of `words` words around the first match, matches in <b>."""
+        text = "\n".join(f for f in fields if f)
+        tokens = list(_TOKEN.finditer(text))
+        first = next((i for i, t in enumerate(tokens) if t.group().lower() in terms), 0)
+        window = tokens[max(first - words // 3, 0):max(first - words // 3, 0) + words]
+        if not window:
+            return ""
+        parts, pos = [], window[0].start()
+        for t in window:
+            parts.append(text[pos:t.start()])
+            parts.append(f"<b>{t.group()}</b>" if t.group().lower() in terms else t.group())
+            pos = t.end()
+        return " ".join("".join(parts).split())
+
+
+class ReportSearch:
+    """
+    Full-text search over report titles, summaries and current version text.
+
+    On Postgres every report carries a weighted tsvector (title A, summary B,
+    content C) behind a GIN index, refreshed by index_report() in the same
+    transaction that writes the report or a new version. Only the vector is
+    stored; search() ranks with ts_rank_cd and builds snippets with
+    ts_headline from the version texts of the page's reports only.
+    Elsewhere (SQLite test runs) the same API is served from an InvertedIndex,
+    built from the reports and their current versions on first use and
+    updated in-process when the writing transaction commits.
+
+    Pages are keyset on (rank, id); the cursor is returned in X-Next-Cursor.
+    """
+
+    def __init__(self, config: str = "english", max_chars: int = 200000):
+        self.config = config
+        self.max_chars = max_chars
+        self._index: InvertedIndex | None = None
+        self._build_lock = asyncio.Lock()
+
+    @staticmethod
+    def _postgres(db) -> bool:
+        return db.get_bind().dialect.name == "postgresql"
+
+    # -----------------------------
+    # INDEXING
+    # -----------------------------
+    async def index_report(self, db, report: Report, content: str | None = None):
+        """
+        Refresh the search fields of `report` (pass the new current version's
+        `content`, if any; otherwise the indexed content is kept). The caller
+        commits.
+        """
+        if content is not None:
+            content = content[:self.max_chars]
+        if not self._postgres(db):
+            self._hold(db, report.id, ((report.title, report.summary, content), self._row(report)))
+            return
+
+        cfg = literal_column(f"'{self.config}'::regconfig")
+        if content is not None:
+            body = func.setweight(func.to_tsvector(cfg, content), "C")
+        else:
+            # Title and summary only changed: keep the content lexemes (weight C)
+            body = func.ts_filter(func.coalesce(Report.search_vector, literal_column("''::tsvector")), literal_column("'{c}'"))
+        vector = (
+            func.setweight(func.to_tsvector(cfg, func.coalesce(report.title, "")), "A")
+            .op("||")(func.setweight(func.to_tsvector(cfg, func.coalesce(report.summary, "")), "B"))
+            .op("||")(body)
+        )
+        await db.execute(
+            update(Report).where(Report.id == report.id).values(search_vector=vector).execution_options(synchronize_session=False)
+        )
+
+    def remove(self, db, report_id):
+        """Drop a deleted report from the in-memory index once `db` commits."""
+        if not self._postgres(db):
+            self._hold(db, report_id, None)
+
+    @staticmethod
+    def _hold(db, report_id, document):
+        session = getattr(db, "sync_session", db)
+        session.info.setdefault(_PENDING_KEY, []).append((report_id, document))
+
+    def _apply(self, pending: list):
+        if self._index is None:
+            return
+        for report_id, document in pending:
+            if document is None:
+                self._index.remove(report_id)
+                continue
+            (title, summary, content), row = document
+            if content is None:
+                content = self._index.content(report_id)
+            self._index.add(report_id, (title, summary, content), row)
+
+    @staticmethod
+    def _row(report) -> dict:
+        return {
+            "id": report.id,
+            "title": report.title,
+            "summary": report.summary,
+            "created_by": report.created_by,
+            "created_at": report.created_at,
+        }
+
+    async def _contents(self, db, report_ids) -> dict:
+        """{report id: current version text, up to max_chars} for the reports that have one."""
+        if not report_ids:
+            return {}
+        versions = (await db.execute(
+            select(Report.id, ReportVersion.version_number)
+            .join(ReportVersion, ReportVersion.id == Report.current_version_id)
+            .where(Report.id.in_(report_ids))
+        )).all()
+        contents = {}
+        for report_id, number in versions:
+            text = await version_store.get_text(db, report_id, number)
+            if text:
+                contents[report_id] = text[:self.max_chars]
+        return contents
+
+    async def _inverted_index(self, db) -> InvertedIndex:
+        async with self._build_lock:
+            if self._index is None:
+                index = InvertedIndex()
+                rows = (await db.execute(select(
+                    Report.id, Report.title, Report.summary, Report.created_by, Report.created_at
+                ))).all()
+                contents = await self._contents(db, [row.id for row in rows])
+                for row in rows:
+                    index.add(row.id, (row.title, row.summary, contents.get(row.id, "")), self._row(row))
+                self._index = index
+        return self._index
+
+    # -----------------------------
+    # QUERYING
+    # -----------------------------
+    async def search(self, db, q: str, *, limit: int = 10, after: tuple | None = None, created_by=None) -> list[dict]:
+        """
+        Up to `limit + 1` hits for `q` (web search syntax on Postgres: "quoted
+        phrases", OR, -excluded), best first, after the (rank, id) `after`.
+        """
+        if self._postgres(db):
+            return await self._search_postgres(db, q, limit, after, created_by)
+        hits = (await self._inverted_index(db)).search(q)
+        results = []
+        for rank, report_id, row, snippet in hits:
+            if created_by is not None and row["created_by"] != created_by:
+                continue
+            if after is not None and (rank, str(report_id)) >= (after[0], str(after[1])):
+                continue
+            results.append({**row, "rank": rank, "snippet": snippet})
+            if len(results) > limit:
+                break
+        return results
+
+    async def _search_postgres(self, db, q, limit, after, created_by) -> list[dict]:
+        cfg = literal_column(f"'{self.config}'::regconfig")
+        tsquery = func.websearch_to_tsquery(cfg, q)
+        rank = func.ts_rank_cd(Report.search_vector, tsquery)
+        query = (
+            select(Report.id, Report.title, Report.summary, Report.created_by, Report.created_at, rank.label("rank"))
+            .where(Report.search_vector.op("@@")(tsquery))
+        )
+        if created_by is not None:
+            query = query.where(Report.created_by == created_by)
+        if after is not None:
+            query = query.where(tuple_(rank, Report.id) < tuple_(*after))
+        rows = (await db.execute(query.order_by(rank.desc(), Report.id.desc()).limit(limit + 1))).mappings().all()
+        if not rows:
+            return []
+
+        # Headlines are the expensive part: only for the rows on this page, in one round trip
+        contents = await self._contents(db, [row["id"] for row in rows])
+        headlines = [
+            func.ts_headline(
+                cfg,
+                "\n".join(part for part in (row["title"], row["summary"], contents.get(row["id"])) if part),
+                tsquery,
+                HEADLINE_OPTIONS,
+            )
+            for row in rows
+        ]
+        snippets = (await db.execute(select(*headlines))).one()
+        return [{**row, "snippet": snippet} for row, snippet in zip(rows, snippets)]
+
+
+report_search = ReportSearch(config=settings.SEARCH_CONFIG, max_chars=settings.SEARCH_MAX_CHARS)
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _apply_pending(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        report_search._apply(pending)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _drop_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,4 @@
+from .metrics import registry, record_model_call, serve_metrics
+from .tracing import tracer
+
+__all__ = ["registry", "record_model_call", "serve_metrics", "tracer"]
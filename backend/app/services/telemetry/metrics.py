@@ -0,0 +1,198 @@
+# app/services/telemetry/metrics.py
+import logging
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._samples(key, value))
+        return lines
+
+    def _samples(self, key, value) -> list[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {value}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket counts (+Inf last), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self, key, value):
+        counts, total, count = value
+        lines, cumulative = [], 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            cumulative += n
+            le = 'le="+Inf"' if bound == float("inf") else f'le="{float(bound)!r}"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics in the Prometheus text format. Collectors are
+    called on every scrape to refresh gauges (pool sizes, cache sizes, ...).
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labelnames=()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collect):
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        for collect in self._collectors:
+            try:
+                collect()
+            except Exception:
+                logger.exception("Metrics collector failed")
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# -----------------------------
+# PIPELINE METRICS
+# -----------------------------
+JOB_QUEUE_WAIT = registry.histogram(
+    "job_queue_wait_seconds", "Time from job creation to a worker claiming it", ("priority",)
+)
+JOB_DURATION = registry.histogram("job_duration_seconds", "Job run time by pipeline and final status", ("pipeline", "status"))
+STAGE_DURATION = registry.histogram("stage_duration_seconds", "Pipeline stage run time", ("pipeline", "stage", "tool"))
+
+INFERENCE_LATENCY = registry.histogram(
+    "inference_request_seconds", "HTTP latency per inference attempt", ("model", "outcome")
+)
+INFERENCE_RETRIES = registry.counter("inference_retries_total", "Inference attempts that were retried", ("model", "reason"))
+MODEL_CALLS = registry.counter("model_calls_total", "Model generations (cache misses)", ("tool", "model"))
+MODEL_CALL_DURATION = registry.histogram("model_call_seconds", "Model generation time incl. retries", ("tool", "model"))
+PROMPT_TOKENS = registry.counter("model_prompt_tokens_total", "Estimated prompt tokens sent", ("tool", "model"))
+OUTPUT_TOKENS = registry.counter("model_output_tokens_total", "Estimated tokens generated", ("tool", "model"))
+MODEL_COST = registry.counter("model_cost_estimate_total", "Estimated spend (MODEL_COSTS per 1k tokens)", ("tool", "model"))
+CACHE_LOOKUPS = registry.counter("tool_cache_lookups_total", "Tool cache lookups by result", ("tool", "result"))
+
+
+def record_model_call(tool: str, model: str, prompt: str, output: str, seconds: float):
+    from app.config import settings
+    from app.services.chunking import estimate_tokens
+
+    prompt_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(output or "")
+    MODEL_CALLS.inc(tool=tool, model=model)
+    MODEL_CALL_DURATION.observe(seconds, tool=tool, model=model)
+    PROMPT_TOKENS.inc(prompt_tokens, tool=tool, model=model)
+    OUTPUT_TOKENS.inc(output_tokens, tool=tool, model=model)
+    price = settings.MODEL_COSTS.get(model)
+    if price:
+        MODEL_COST.inc((prompt_tokens + output_tokens) / 1000 * price, tool=tool, model=model)
+
+
+# -----------------------------
+# STANDALONE EXPORT (worker processes)
+# -----------------------------
+def serve_metrics(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread, for processes without the API."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info("Serving metrics on %s:%d/metrics", host, port)
+    return server
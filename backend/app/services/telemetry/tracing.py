@@ -0,0 +1,100 @@
+# app/services/telemetry/tracing.py
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "status", "error")
+
+    def __init__(self, name: str, parent: "Span | None", attributes: dict):
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = "OK"
+        self.error = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        """OpenTelemetry-style (OTLP JSON field names) span record."""
+        record = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status},
+        }
+        if self.error:
+            record["status"]["message"] = self.error
+        return record
+
+
+class FileSpanExporter:
+    """Appends finished spans as JSON lines; one file can be shared by the API and workers."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            logger.exception("Failed to export span %s", span.name)
+
+
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Minimal tracer: spans nest through a ContextVar, so children started in
+    asyncio tasks (gather) still attach to the stage that spawned them.
+    Without an exporter spans are not recorded at all.
+    """
+
+    def __init__(self, exporter: FileSpanExporter | None = None):
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        if self.exporter is None:
+            yield None
+            return
+        span = Span(name, _current.get(), attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "ERROR"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            self.exporter.export(span)
+
+
+tracer = Tracer(FileSpanExporter(settings.TRACE_FILE) if settings.TRACE_FILE else None)
@@ -0,0 +1,261 @@
+# app/services/worker_pool.py
+import asyncio
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.config import settings
+from app.db.job import Job, job_uuid
+from app.db.engine import WorkerSessionLocal as SessionLocal
+from app.services.job_runner import _process_job
+from app.services.job_control import cancellation
+from app.services.documents import shutdown_extractors
+from app.services.job_events import job_events
+from app.services.scheduler import scheduler
+from app.services.telemetry.metrics import JOB_QUEUE_WAIT, registry
+
+logger = logging.getLogger(__name__)
+
+WORKER_ACTIVE_JOBS = registry.gauge("worker_active_jobs", "Jobs running in a worker pool", ("worker_id",))
+
+# Ranked queue heads a claim tries, in order, before giving up until the next poll
+_CLAIM_CANDIDATES = 16
+
+
+class WorkerPool:
+    """
+    Bounded pool of async workers that pull jobs from the `jobs` table.
+
+    Which pending job is claimed next is up to the FairScheduler (priority
+    classes, per-user/agent quotas, fair share). Ranking runs unlocked; the
+    quota re-check and the conditional UPDATE that claims a job are
+    serialized by an advisory lock, so any number of pools
+    (inside the API process or in separate `python -m app.worker` processes)
+    can share one queue without handing the same job out twice.
+    A worker only claims when it is idle, which is the backpressure: a burst
+    of submissions just grows the `pending` backlog instead of the task count.
+
+    All workers of a pool are coroutines on one event loop running in a
+    single background thread; blocking DB calls go through asyncio.to_thread.
+    """
+
+    def __init__(self, concurrency: int | None = None, poll_interval: float | None = None):
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or settings.WORKER_POLL_INTERVAL
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = threading.Event()
+        self._active: set[uuid.UUID] = set()
+        registry.add_collector(lambda: WORKER_ACTIVE_JOBS.set(len(self._active), worker_id=self.worker_id))
+
+    # -----------------------------
+    # LIFECYCLE
+    # -----------------------------
+    def start(self):
+        if self._thread:
+            return
+        self._stopping.clear()
+        self.recover_orphans()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="job-worker-loop", daemon=True)
+        self._thread.start()
+        logger.info("Worker pool %s started with %d workers", self.worker_id, self.concurrency)
+
+    def stop(self, timeout: float = 30.0):
+        """
+        Stop claiming new jobs and wait for running ones to finish. Jobs
+        still running after `timeout` are handed back to the queue, where
+        the next worker resumes them from their stage checkpoints.
+        """
+        if not self._thread:
+            return
+        self._stopping.set()
+        self.notify()
+        self._thread.join(timeout)
+        self._thread = None
+        unfinished = self.active_jobs
+        if unfinished:
+            try:
+                self._release(unfinished)
+            except Exception:
+                logger.exception("Failed to requeue %d unfinished job(s)", len(unfinished))
+        shutdown_extractors()
+        logger.info("Worker pool %s stopped", self.worker_id)
+
+    def notify(self):
+        """Wake idle workers, e.g. right after a job was inserted. Thread-safe."""
+        if self._loop and self._wakeup and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    @property
+    def active_jobs(self) -> list[uuid.UUID]:
+        return list(self._active)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        # Bounds the blocking DB calls made through asyncio.to_thread
+        self._loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=settings.WORKER_DB_THREADS, thread_name_prefix="job-worker-db")
+        )
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self):
+        self._wakeup = asyncio.Event()
+        workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        await asyncio.gather(*workers)
+        heartbeat.cancel()
+
+    # -----------------------------
+    # CLAIMING
+    # -----------------------------
+    def _claim_next(self) -> uuid.UUID | None:
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            # Ranking reads only; the lock covers the quota re-check and the claim
+            candidates = scheduler.rank(db, now)[:_CLAIM_CANDIDATES]
+            if not candidates:
+                db.rollback()
+                return None
+
+            scheduler.lock(db)
+            for job in candidates:
+                if not scheduler.admit(db, job):
+                    continue
+                # Conditional, so a concurrent claimer loses cleanly even where
+                # the scheduler lock does not exist (SQLite); the loser tries
+                # the next candidate
+                claimed = db.execute(
+                    update(Job)
+                    .where(Job.id == job.id, Job.status == "pending")
+                    .values(status="running", progress=0, worker_id=self.worker_id, heartbeat_at=now, started_at=now)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if claimed:
+                    break
+            else:
+                db.rollback()
+                return None
+            job_events.publish(job.id, {"type": "status", "status": "running", "progress": 0}, db=db)
+            db.commit()
+            if job.created_at:
+                created_at = job.created_at if job.created_at.tzinfo else job.created_at.replace(tzinfo=timezone.utc)
+                JOB_QUEUE_WAIT.observe((now - created_at).total_seconds(), priority=job.priority)
+            return job.id
+        finally:
+            db.close()
+
+    async def _worker(self, index: int):
+        while not self._stopping.is_set():
+            try:
+                job_id = await asyncio.to_thread(self._claim_next)
+            except Exception:
+                logger.exception("Failed to claim job")
+                job_id = None
+
+            if not job_id:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            self._active.add(job_id)
+            try:
+                await _process_job(job_id)
+            except Exception:
+                logger.exception("Unhandled error while processing job %s", job_id)
+            finally:
+                self._active.discard(job_id)
+
+    # -----------------------------
+    # LIVENESS / RECOVERY
+    # -----------------------------
+    async def _heartbeat_loop(self):
+        while not self._stopping.is_set():
+            await asyncio.sleep(settings.WORKER_HEARTBEAT_INTERVAL)
+            try:
+                await asyncio.to_thread(self._heartbeat, self.active_jobs)
+                await asyncio.to_thread(self.recover_orphans)
+            except Exception:
+                logger.exception("Worker heartbeat failed")
+
+    def _heartbeat(self, active: list[uuid.UUID]):
+        if not active:
+            return
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(Job)
+                .where(Job.id.in_(active), Job.worker_id == self.worker_id)
+                .values(heartbeat_at=datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            )
+            # One query covers cancellation for every job this pool is running
+            cancelled = db.query(Job.id).filter(Job.id.in_(active), Job.status == "cancelled").all()
+            db.commit()
+            for (job_id,) in cancelled:
+                cancellation.cancel(str(job_id))
+        finally:
+            db.close()
+
+    def _release(self, job_ids: list):
+        job_ids = [job_uuid(job_id) for job_id in job_ids]
+        for job_id in job_ids:
+            # Stops them at the next stage boundary if the process lives on
+            cancellation.cancel(job_id)
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(Job)
+                .where(Job.id.in_(job_ids), Job.worker_id == self.worker_id, Job.status == "running")
+                .values(status="pending", worker_id=None, heartbeat_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            logger.warning("Requeued %d unfinished job(s) on shutdown", result.rowcount)
+        finally:
+            db.close()
+
+    def recover_orphans(self) -> int:
+        """
+        Put `running` jobs whose worker stopped heartbeating back to `pending`.
+        Covers API restarts and crashed worker processes alike.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.WORKER_ORPHAN_TIMEOUT)
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(Job)
+                .where(
+                    Job.status == "running",
+                    (Job.heartbeat_at.is_(None)) | (Job.heartbeat_at < cutoff),
+                )
+                .values(status="pending", worker_id=None, heartbeat_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            if result.rowcount:
+                logger.warning("Requeued %d orphaned job(s)", result.rowcount)
+                self.notify()
+            return result.rowcount
+        finally:
+            db.close()
+
+
+worker_pool = WorkerPool()
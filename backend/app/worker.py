@@ -0,0 +1,56 @@
+# app/worker.py
+"""
+Standalone job worker process.
+
+    python -m app.worker --concurrency 8
+
+Run as many of these as needed next to the API (with EMBEDDED_WORKERS=false
+on the API side); they coordinate through the `jobs` table.
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from app.config import settings
+from app.services.audit import audit_writer
+from app.services.event_bus import event_bus
+from app.services.event_log import event_log
+from app.services.telemetry import serve_metrics
+from app.services.worker_pool import WorkerPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi Agent Research job worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="number of jobs run in parallel")
+    parser.add_argument("--poll-interval", type=float, default=None, help="seconds between queue polls when idle")
+    parser.add_argument(
+        "--metrics-port", type=int, default=settings.WORKER_METRICS_PORT, help="serve Prometheus /metrics on this port"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+
+    pool = WorkerPool(concurrency=args.concurrency, poll_interval=args.poll_interval)
+    stop = threading.Event()
+
+    def _shutdown(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    if settings.EVENT_LOG_ENABLED:
+        event_log.start()
+    pool.start()
+    stop.wait()
+    pool.stop()
+    event_bus.close()
+    audit_writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/compare.py
+"""
+Compare two benchmark result files and fail on regressions.
+
+    python -m benchmarks.compare results/baseline.json results/candidate.json --max-regression 0.10
+
+Exit status 1 when any gated metric got worse by more than the allowed
+fraction, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+# (path in the result JSON, True if higher is better)
+GATED_METRICS = [
+    ("throughput_jobs_per_s", True),
+    ("job_latency_s.p50", False),
+    ("job_latency_s.p95", False),
+    ("job_latency_s.p99", False),
+    ("submit_latency_ms.p95", False),
+    ("list_latency_ms.p95", False),
+    ("db_pool.peak_checked_out", False),
+    ("memory.peak_rss_mb", False),
+]
+
+
+def _get(result: dict, path: str):
+    value = result
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def compare(baseline: dict, candidate: dict, max_regression: float = 0.10) -> list[dict]:
+    """One row per gated metric present in both results."""
+    rows = []
+    for path, higher_is_better in GATED_METRICS:
+        old, new = _get(baseline, path), _get(candidate, path)
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+            continue
+        if old == 0:
+            change = 0.0 if new == 0 else float("inf")
+        else:
+            change = (new - old) / old
+        worse = -change if higher_is_better else change
+        rows.append({
+            "metric": path,
+            "baseline": old,
+            "candidate": new,
+            "change": round(change, 4),
+            "regressed": worse > max_regression,
+        })
+    return rows
+
+
+def format_rows(rows: list[dict]) -> str:
+    lines = [f"{'metric':<28}{'baseline':>14}{'candidate':>14}{'change':>10}"]
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        lines.append(
+            f"{row['metric']:<28}{row['baseline']:>14.4g}{row['candidate']:>14.4g}{row['change']:>+10.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="allowed relative slowdown (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    rows = compare(baseline, candidate, args.max_regression)
+    print(format_rows(rows))
+    sys.exit(1 if any(row["regressed"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# benchmarks/mock_hf.py
+"""
+Fake Hugging Face inference server for offline benchmarks.
+
+    python -m benchmarks.mock_hf --port 9100 --latency-ms 300 --error-rate 0.02
+
+Speaks the parts of the API the app uses: POST /<model> with
+{"inputs": str | [str], "parameters": {...}, "stream": bool}. Latency,
+failures (500), rate limits (429 + Retry-After) and cold models
+(503 + estimated_time) are drawn from configurable distributions; with a
+seed the run is reproducible.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "research agent model data report source finding evidence summary analysis "
+    "result method section claim citation policy risk review context signal"
+).split()
+
+
+@dataclass
+class MockProfile:
+    latency_ms: float = 200.0
+    latency_stddev_ms: float = 50.0
+    latency_dist: str = "lognormal"  # fixed | uniform | normal | lognormal
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    loading_rate: float = 0.0
+    output_tokens: int = 120
+    seed: int | None = None
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def latency(self) -> float:
+        """One latency sample in seconds."""
+        mean, sd = self.latency_ms, self.latency_stddev_ms
+        with self._lock:
+            if self.latency_dist == "fixed" or sd <= 0:
+                value = mean
+            elif self.latency_dist == "uniform":
+                value = self._rng.uniform(mean - sd, mean + sd)
+            elif self.latency_dist == "normal":
+                value = self._rng.gauss(mean, sd)
+            else:
+                # lognormal with the requested mean / stddev: a long right tail like real endpoints
+                sigma2 = math.log(1 + (sd / mean) ** 2)
+                mu = math.log(mean) - sigma2 / 2
+                value = self._rng.lognormvariate(mu, sigma2 ** 0.5)
+        return max(value, 0.0) / 1000
+
+    def outcome(self) -> int:
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            return 500
+        roll -= self.error_rate
+        if roll < self.rate_limit_rate:
+            return 429
+        roll -= self.rate_limit_rate
+        if roll < self.loading_rate:
+            return 503
+        return 200
+
+
+def generate_text(prompt: str, tokens: int) -> str:
+    """Deterministic filler text; different prompts give different outputs."""
+    rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+    return " ".join(rng.choice(WORDS) for _ in range(tokens))
+
+
+class MockInferenceServer:
+    def __init__(self, profile: MockProfile, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockInferenceServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-hf", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "failures": self.failures}
+
+    def _count(self, failed: bool):
+        with self._lock:
+            self.requests += 1
+            self.failures += int(failed)
+
+    def _handler(self):
+        server = self
+        profile = self.profile
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _json(self, status: int, body, headers: dict | None = None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._json(400, {"error": "invalid JSON"})
+                    return
+
+                status = profile.outcome()
+                server._count(status != 200)
+                delay = profile.latency()
+                if status == 429:
+                    self._json(429, {"error": "rate limited"}, {"Retry-After": "0.1"})
+                    return
+                if status == 503:
+                    self._json(503, {"error": "Model is loading", "estimated_time": 0.2})
+                    return
+                if status == 500:
+                    time.sleep(delay / 2)
+                    self._json(500, {"error": "internal error"})
+                    return
+
+                max_tokens = int((payload.get("parameters") or {}).get("max_new_tokens") or profile.output_tokens)
+                tokens = min(profile.output_tokens, max_tokens)
+                inputs = payload.get("inputs", "")
+                if payload.get("stream") and isinstance(inputs, str):
+                    self._stream(generate_text(inputs, tokens), delay)
+                    return
+
+                time.sleep(delay)
+                if isinstance(inputs, list):
+                    self._json(200, [[{"generated_text": generate_text(p, tokens)}] for p in inputs])
+                else:
+                    self._json(200, [{"generated_text": generate_text(inputs, tokens)}])
+
+            def _stream(self, text: str, delay: float):
+                words = text.split(" ")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                per_token = delay / max(len(words), 1)
+                for i, word in enumerate(words):
+                    time.sleep(per_token)
+                    piece = word if i == 0 else " " + word
+                    self.wfile.write(f"data: {json.dumps({'token': {'text': piece, 'special': False}})}\n\n".encode())
+                    self.wfile.flush()
+                final = {"token": {"text": "", "special": True}, "generated_text": text}
+                self.wfile.write(f"data: {json.dumps(final)}\n\n".encode())
+                self.close_connection = True
+
+        return Handler
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="mean model latency")
+    parser.add_argument("--latency-stddev-ms", type=float, default=50.0)
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "normal", "lognormal"], default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction answered with 429")
+    parser.add_argument("--loading-rate", type=float, default=0.0, help="fraction answered with 503 (model loading)")
+    parser.add_argument("--output-tokens", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def profile_from_args(args) -> MockProfile:
+    return MockProfile(
+        latency_ms=args.latency_ms,
+        latency_stddev_ms=args.latency_stddev_ms,
+        latency_dist=args.latency_dist,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        loading_rate=args.loading_rate,
+        output_tokens=args.output_tokens,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock HF inference server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    server = MockInferenceServer(profile_from_args(args), args.host, args.port)
+    logger.info("Mock inference server on %s (HF_API_URL=%s)", server.url, server.url)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+from pydantic import BaseModel
+
+# Run from backend/ or the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are read when `app` is first imported: point everything at a scratch directory
+WORKDIR = tempfile.mkdtemp(prefix="backend-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(WORKDIR, 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("EMBEDDED_WORKERS", "false")
+os.environ.setdefault("EVENT_LOG_ENABLED", "false")
+os.environ.setdefault("EVENT_BUS_BACKEND", "local")
+os.environ.setdefault("EVENT_BUS_FILE", "")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(WORKDIR, "uploads"))
+os.environ.setdefault("CONTENT_STORE_DIR", os.path.join(WORKDIR, "content"))
+os.environ.setdefault("EXTRACT_DIR", os.path.join(WORKDIR, "extracted"))
+os.environ.setdefault("TOOL_CACHE_PERSISTENT", "false")
+
+
+class TextInput(BaseModel):
+    text: str
+
+
+class TextOutput(BaseModel):
+    text: str
+
+
+class FakeTool:
+    """Stands in for a model-backed MCP tool; `hook` runs before it answers."""
+
+    InputSchema = TextInput
+
+    def __init__(self, name, calls, hook=None):
+        self.name, self.calls, self.hook = name, calls, hook
+
+    async def arun(self, input_data):
+        self.calls.append(self.name)
+        if self.hook:
+            await self.hook()
+        return TextOutput(text=f"{self.name}({input_data.text})")
+
+
+@pytest.fixture
+def fake_tools(monkeypatch):
+    """
+    Every pipeline tool replaced by a FakeTool. Yields (calls, hooks): the
+    tool names in call order, and {tool: async callable} run inside a call.
+    """
+    from app.services.mcp.registry import tool_registry
+    from app.services.pipeline import PIPELINES
+
+    calls, hooks = [], {}
+    for tool in {stage.tool for dag in PIPELINES.values() for stage in dag.stages}:
+        async def hook(tool=tool):
+            if tool in hooks:
+                await hooks[tool]()
+        monkeypatch.setitem(tool_registry.tools, tool, FakeTool(tool, calls, hook))
+    return calls, hooks
+
+
+@pytest.fixture(scope="session")
+def seed():
+    """Schema on the scratch SQLite database, plus the user and agent jobs belong to."""
+    from app.db import Agent, Base, SessionLocal, User, engine
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        user = User(full_name="Test", email="test@example.com", hashed_password="-", role="Admin")
+        db.add(user)
+        db.flush()
+        agent = Agent(name="test-agent", description="tests", created_by=user.id)
+        db.add(agent)
+        db.commit()
+        return {"user_id": str(user.id), "agent_id": str(agent.id)}
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def user_id(seed):
+    """A user of its own, so list filters and queues see only what a test created."""
+    from app.db import SessionLocal, User
+
+    db = SessionLocal()
+    try:
+        user = User(full_name="Other", email=f"{uuid.uuid4().hex}@example.com", hashed_password="-", role="Admin")
+        db.add(user)
+        db.commit()
+        return str(user.id)
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def api(seed):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def running_job(api, seed):
+    """Submits a job for `text` and marks it claimed by a worker; returns its id."""
+    from app.db import SessionLocal
+    from app.db.job import Job
+
+    def submit(text, **form):
+        data = {"agent_id": seed["agent_id"], "created_by": seed["user_id"], "input_data": json.dumps({"text": text}), **form}
+        response = api.post("/jobs/", data=data)
+        assert response.status_code == 200, response.text
+        job_id = response.json()["id"]
+        db = SessionLocal()
+        try:
+            db.query(Job).filter(Job.id == uuid.UUID(job_id)).update({"status": "running"})
+            db.commit()
+        finally:
+            db.close()
+        return job_id
+
+    return submit
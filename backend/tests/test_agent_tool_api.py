@@ -0,0 +1,37 @@
+import uuid
+
+import pytest
+
+
+def test_get_and_delete_agent(api, seed):
+    response = api.post("/agents/", json={"name": "reviewer", "description": "reviews", "created_by": seed["user_id"]})
+    assert response.status_code == 200, response.text
+    agent_id = response.json()["id"]
+
+    response = api.get(f"/agents/{agent_id}")
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "reviewer"
+
+    assert api.delete(f"/agents/{agent_id}").status_code == 200
+    assert api.get(f"/agents/{agent_id}").status_code == 404
+    assert api.delete(f"/agents/{agent_id}").status_code == 404
+
+
+def test_get_and_delete_tool(api, seed):
+    response = api.post("/tools/", json={"name": "summarizer", "type": "llm", "agent_id": seed["agent_id"]})
+    assert response.status_code == 200, response.text
+    tool_id = response.json()["id"]
+
+    response = api.get(f"/tools/{tool_id}")
+    assert response.status_code == 200, response.text
+    assert response.json()["agent_id"] == seed["agent_id"]
+
+    assert api.delete(f"/tools/{tool_id}").status_code == 200
+    assert api.get(f"/tools/{tool_id}").status_code == 404
+
+
+@pytest.mark.parametrize("path", ["/agents", "/tools"])
+def test_unknown_and_malformed_ids(api, path):
+    assert api.get(f"{path}/{uuid.uuid4()}").status_code == 404
+    assert api.get(f"{path}/not-a-uuid").status_code == 422
+    assert api.delete(f"{path}/not-a-uuid").status_code == 422
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def audit_entries():
+    """Reads the audit log of one entity once the writer has flushed."""
+    from app.db import SessionLocal
+    from app.db.audit_log import AuditLog
+    from app.services.audit import audit_writer
+
+    def read(entity_id):
+        audit_writer.close()
+        db = SessionLocal()
+        try:
+            return db.query(AuditLog).filter(AuditLog.entity_id == uuid.UUID(str(entity_id))).all()
+        finally:
+            db.close()
+
+    return read
+
+
+def status_changes(entries):
+    return {
+        (entry.old_values.get("status"), entry.new_values.get("status"))
+        for entry in entries
+        if entry.action == "update" and "status" in entry.new_values
+    }
+
+
+def test_api_writes_are_audited(api, seed, audit_entries):
+    response = api.post("/agents/", json={"name": "audited", "description": "before", "created_by": seed["user_id"]})
+    agent_id = response.json()["id"]
+    api.delete(f"/agents/{agent_id}")
+
+    entries = audit_entries(agent_id)
+    assert sorted(entry.action for entry in entries) == ["create", "delete"]
+    create = next(entry for entry in entries if entry.action == "create")
+    assert create.entity == "agent"
+    assert create.new_values["name"] == "audited"
+    assert str(create.user_id) == seed["user_id"]
+
+
+def test_job_state_transitions_are_audited(api, seed, fake_tools, audit_entries, monkeypatch):
+    from app.db import SessionLocal
+    from app.db.job import Job
+    from app.services import worker_pool as worker_pool_module
+    from app.services.job_runner import _process_job
+    from app.services.worker_pool import WorkerPool
+
+    data = {"agent_id": seed["agent_id"], "created_by": seed["user_id"], "input_data": json.dumps({"text": "audit me"})}
+    job_id = uuid.UUID(api.post("/jobs/", data=data).json()["id"])
+
+    db = SessionLocal()
+    try:
+        job = db.get(Job, job_id)
+        monkeypatch.setattr(worker_pool_module.scheduler, "rank", lambda session, now=None: [job])
+        pool = WorkerPool(concurrency=1)
+
+        # Claimed, then the worker dies and the job is requeued
+        assert pool._claim_next() == job_id
+        pool._release([job_id])
+        # Claimed again and run to completion
+        assert pool._claim_next() == job_id
+        asyncio.run(_process_job(job_id))
+    finally:
+        db.close()
+
+    entries = audit_entries(job_id)
+    assert "create" in {entry.action for entry in entries}
+    assert status_changes(entries) == {("pending", "running"), ("running", "pending"), ("running", "completed")}
+    claim = next(entry for entry in entries if entry.new_values.get("status") == "running")
+    assert claim.new_values["worker_id"] == pool.worker_id
+    # Excluded columns never reach the log, heartbeats and progress writes add no entries
+    assert all("output_data" not in (entry.new_values or {}) for entry in entries)
+    assert all(set(entry.new_values or {}) != {"progress"} for entry in entries)
+
+
+def test_conditional_update_that_matches_nothing_is_not_audited(api, seed, audit_entries):
+    from sqlalchemy import update
+
+    from app.db import SessionLocal
+    from app.db.job import Job
+
+    data = {"agent_id": seed["agent_id"], "created_by": seed["user_id"], "input_data": json.dumps({"text": "x"})}
+    job_id = uuid.UUID(api.post("/jobs/", data=data).json()["id"])
+
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "running")
+            .values(status="completed")
+            .execution_options(synchronize_session=False)
+        )
+        assert result.rowcount == 0
+        db.commit()
+    finally:
+        db.close()
+
+    assert status_changes(audit_entries(job_id)) == set()
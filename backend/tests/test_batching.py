@@ -0,0 +1,44 @@
+from concurrent.futures import CancelledError
+
+import pytest
+
+from app.services.inference.batching import MicroBatcher
+from app.services.inference.client import _BaseClient
+
+
+class FakeClient:
+    """Answers batched payloads in-process, one output per prompt."""
+
+    build_payload = staticmethod(_BaseClient.build_payload)
+    parse_generated = staticmethod(_BaseClient.parse_generated)
+
+    def __init__(self):
+        self.payloads = []
+
+    def request(self, model, payload):
+        self.payloads.append(payload)
+        inputs = payload["inputs"]
+        if isinstance(inputs, str):
+            return [{"generated_text": inputs.upper()}]
+        return [[{"generated_text": prompt.upper()}] for prompt in inputs]
+
+
+def test_concurrent_prompts_share_one_request():
+    client = FakeClient()
+    batcher = MicroBatcher(client, max_batch_size=3, max_wait=1.0)
+    futures = [batcher.submit("m", p) for p in ("a", "b", "c")]
+    assert [f.result(5) for f in futures] == ["A", "B", "C"]
+    assert client.payloads == [{"inputs": ["a", "b", "c"], "parameters": {"max_new_tokens": 500}}]
+
+
+def test_cancelled_caller_does_not_fail_the_batch():
+    client = FakeClient()
+    # The batch goes out when the window closes, after the cancel
+    batcher = MicroBatcher(client, max_batch_size=4, max_wait=0.3)
+    futures = [batcher.submit("m", p) for p in ("a", "b", "c")]
+    assert futures[1].cancel()
+    assert futures[0].result(5) == "A"
+    assert futures[2].result(5) == "C"
+    with pytest.raises(CancelledError):
+        futures[1].result(0)
+    assert client.payloads[0]["inputs"] == ["a", "c"]
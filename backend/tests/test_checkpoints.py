@@ -0,0 +1,90 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.services.content_store import content_store
+
+
+def stages(api, job_id):
+    return [row["stage"] for row in api.get(f"/jobs/{job_id}/stages").json()]
+
+
+def checkpoint_refs(job_id) -> dict:
+    from app.db import SessionLocal
+    from app.db.job_stage import JobStage
+
+    db = SessionLocal()
+    try:
+        return dict(db.query(JobStage.stage, JobStage.output_ref).filter(JobStage.job_id == uuid.UUID(job_id)).all())
+    finally:
+        db.close()
+
+
+def test_killed_job_resumes_from_its_checkpoints(api, fake_tools, running_job):
+    from app.services.job_runner import _process_job
+
+    calls, hooks = fake_tools
+    job_id = running_job("resume me")
+
+    async def killed_during_citation():
+        task = asyncio.ensure_future(_process_job(job_id))
+        started = asyncio.Event()
+
+        async def citation():
+            started.set()
+            await asyncio.sleep(3600)
+
+        hooks["citation"] = citation
+        await started.wait()
+        # The worker process dies mid-stage: nothing after this point runs
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(killed_during_citation())
+    assert calls == ["ingestion", "research", "citation"]
+    assert stages(api, job_id) == ["ingestion", "research"]
+    assert api.get(f"/jobs/{job_id}").json()["status"] == "running"
+    refs = list(checkpoint_refs(job_id).values())
+    assert all(content_store.exists(ref) for ref in refs)
+
+    # Orphan recovery hands it to another worker
+    hooks.clear()
+    calls.clear()
+    asyncio.run(_process_job(job_id))
+    assert calls == ["citation", "formatter", "compliance"]
+
+    job = api.get(f"/jobs/{job_id}").json()
+    assert job["status"] == "completed"
+    report = api.get(f"/jobs/{job_id}/report/content").text
+    assert report == "compliance(formatter(citation(research(ingestion(resume me)))))"
+
+    # Completed: checkpoints and their blobs are gone
+    assert stages(api, job_id) == []
+    assert not any(content_store.exists(ref) for ref in refs)
+
+
+def test_clearing_keeps_blobs_other_checkpoints_share(running_job):
+    from app.db import SessionLocal
+    from app.services.checkpoints import clear_checkpoints, save_checkpoint
+
+    first, second = running_job("a"), running_job("b")
+    save_checkpoint(first, "default", "ingestion", "same output")
+    save_checkpoint(second, "default", "ingestion", "same output")
+    save_checkpoint(first, "default", "research", "only the first job's")
+    refs = checkpoint_refs(first)
+    shared, own = refs["ingestion"], refs["research"]
+
+    db = SessionLocal()
+    try:
+        clear_checkpoints(db, first)
+        db.rollback()
+        assert content_store.exists(own)
+
+        clear_checkpoints(db, first)
+        db.commit()
+    finally:
+        db.close()
+    assert content_store.exists(shared)
+    assert not content_store.exists(own)
@@ -0,0 +1,72 @@
+import asyncio
+import io
+
+from app.config import settings
+from app.services.agent_orchestrator import AgentOrchestrator
+from app.services.chunking import estimate_tokens, group_for_reduce, iter_chunks
+from app.services.pipeline import CHUNKED_PIPELINE
+
+DOCUMENT = "\n\n".join(f"Paragraph {i}. " + "word " * 40 for i in range(30))
+
+
+def test_chunks_stay_within_budget_and_cover_the_document():
+    chunks = list(iter_chunks(DOCUMENT, max_tokens=200, overlap_tokens=20))
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 200 for chunk in chunks)
+    for i in range(30):
+        assert any(f"Paragraph {i}." in chunk for chunk in chunks)
+    # Each chunk opens with the tail of the one before
+    assert chunks[1].startswith(chunks[0][-20 * 4:])
+
+
+def test_chunks_from_lines_match_chunks_from_text():
+    assert list(iter_chunks(io.StringIO(DOCUMENT), 200, 20)) == list(iter_chunks(DOCUMENT, 200, 20))
+
+
+def test_oversized_paragraphs_are_split():
+    sentence = "This sentence has exactly seven words. "
+    chunks = list(iter_chunks(sentence * 100 + "q" * 2000, max_tokens=50, overlap_tokens=0))
+    assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+    assert "".join(chunks).count("q") == 2000
+
+
+def test_group_for_reduce():
+    texts = ["a" * 400, "b" * 400, "c" * 400, "d" * 1000]
+    assert group_for_reduce(texts, max_tokens=200) == [texts[:2], texts[2:3], texts[3:]]
+
+
+def test_chunked_pipeline_maps_and_reduces(fake_tools, monkeypatch):
+    calls, _ = fake_tools
+    monkeypatch.setattr(settings, "CHUNK_MAX_TOKENS", 200)
+    monkeypatch.setattr(settings, "CHUNK_OVERLAP_TOKENS", 0)
+    monkeypatch.setattr(settings, "REDUCE_MAX_INPUT_TOKENS", 600)
+    chunks = len(list(iter_chunks(DOCUMENT, 200, 0)))
+
+    report = asyncio.run(AgentOrchestrator().execute(CHUNKED_PIPELINE, DOCUMENT))
+
+    assert calls.count("ingestion") == calls.count("research") == chunks
+    # The notes do not fit one reduce prompt: more than one level of merging
+    assert calls.count("reducer") > 1
+    assert calls[-3:] == ["citation", "formatter", "compliance"]
+    assert report.startswith("compliance(formatter(citation(reducer(")
+    for i in range(30):
+        assert f"Paragraph {i}." in report
+
+
+def test_large_inputs_take_the_chunked_pipeline(api, fake_tools, running_job, monkeypatch):
+    from app.services.job_runner import _process_job
+
+    calls, _ = fake_tools
+    monkeypatch.setattr(settings, "CHUNK_THRESHOLD_TOKENS", 100)
+    monkeypatch.setattr(settings, "CHUNK_MAX_TOKENS", 400)
+
+    job_id = running_job(DOCUMENT)
+    asyncio.run(_process_job(job_id))
+
+    assert api.get(f"/jobs/{job_id}").json()["status"] == "completed"
+    assert calls.count("ingestion") > 1 and "reducer" in calls
+
+    calls.clear()
+    small = running_job("short text")
+    asyncio.run(_process_job(small))
+    assert calls == ["ingestion", "research", "citation", "formatter", "compliance"]
@@ -0,0 +1,71 @@
+import io
+import os
+
+import pytest
+
+from app.api.content import _parse_range, content_disposition
+from app.services.content_store import ContentNotFound, ContentTooLarge, LocalContentStore
+
+
+def test_content_disposition_plain_name():
+    assert content_disposition("report.txt") == "inline; filename=\"report.txt\"; filename*=UTF-8''report.txt"
+
+
+def test_content_disposition_cannot_break_the_header():
+    value = content_disposition('evil"\r\nSet-Cookie: a=b.pdf')
+    assert "\r" not in value and "\n" not in value
+    fallback = value.split("; filename*=")[0]
+    assert fallback.count('"') == 2
+    assert value.endswith("filename*=UTF-8''evil%22%0D%0ASet-Cookie%3A%20a%3Db.pdf")
+
+
+def test_content_disposition_non_ascii_name():
+    value = content_disposition("résumé 2024.pdf")
+    assert 'filename="resume 2024.pdf"' in value
+    assert "filename*=UTF-8''r%C3%A9sum%C3%A9%202024.pdf" in value
+
+
+def test_parse_range():
+    assert _parse_range("bytes=0-9", 100) == (0, 9)
+    assert _parse_range("bytes=-10", 100) == (90, 99)
+    assert _parse_range("bytes=90-", 100) == (90, 99)
+    assert _parse_range("bytes=100-", 100) is None
+
+
+def test_local_store_dedupes_and_serves_ranges(tmp_path):
+    store = LocalContentStore(str(tmp_path), chunk_size=4)
+    ref = store.put_stream(io.BytesIO(b"0123456789"))
+    assert store.put_bytes(b"0123456789") == ref == {"sha256": ref["sha256"], "size": 10}
+    assert store.size(ref["sha256"]) == 10
+    assert b"".join(store.iter_range(ref["sha256"], 2, 5, chunk_size=3)) == b"2345"
+    assert store.read_text(ref["sha256"]) == "0123456789"
+    # Only the blob itself is left behind, no partial files
+    assert [name for _, _, files in os.walk(tmp_path) for name in files] == [ref["sha256"]]
+
+
+def test_local_store_limits_and_missing_blobs(tmp_path):
+    store = LocalContentStore(str(tmp_path))
+    with pytest.raises(ContentTooLarge):
+        store.put_stream(io.BytesIO(b"x" * 100), max_bytes=10)
+    assert not any(files for _, _, files in os.walk(tmp_path))
+
+    with pytest.raises(ContentNotFound):
+        store.size("0" * 64)
+    assert not store.exists("../etc/passwd")
+
+
+def test_uploaded_document_downloads_with_ranges(api, seed):
+    data = {"agent_id": seed["agent_id"], "created_by": seed["user_id"]}
+    files = {"input_file": ("notes.txt", b"uploaded document body", "text/plain")}
+    response = api.post("/jobs/", data=data, files=files)
+    assert response.status_code == 200, response.text
+    job_id = response.json()["id"]
+
+    full = api.get(f"/jobs/{job_id}/input/content")
+    assert full.status_code == 200
+    assert full.content == b"uploaded document body"
+    assert 'filename="notes.txt"' in full.headers["content-disposition"]
+
+    partial = api.get(f"/jobs/{job_id}/input/content", headers={"Range": "bytes=9-16"})
+    assert partial.status_code == 206
+    assert partial.content == b"document"
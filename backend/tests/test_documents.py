@@ -0,0 +1,36 @@
+import asyncio
+import io
+import os
+
+import pytest
+
+from app.config import settings
+from app.services import documents
+
+
+def test_save_upload_rejects_unsupported_types():
+    with pytest.raises(ValueError):
+        documents.save_upload(io.BytesIO(b"x"), "notes.exe")
+
+
+def test_uploaded_text_is_extracted_outside_the_upload_dir():
+    document = documents.save_upload(io.BytesIO(b"hello from an upload\n"), "notes.txt")
+    try:
+        text = asyncio.run(documents.load_job_text({"document": document}))
+    finally:
+        documents.shutdown_extractors()
+    assert text == "hello from an upload\n"
+
+    extracted = os.path.join(settings.EXTRACT_DIR, f"{document['sha256']}.txt")
+    assert os.path.exists(extracted)
+    assert not os.path.exists(os.path.join(settings.UPLOAD_DIR, "text"))
+
+
+def test_large_inline_text_is_offloaded(monkeypatch):
+    monkeypatch.setattr(settings, "INLINE_TEXT_MAX_BYTES", 16)
+    small = documents.offload_input({"text": "short", "topic": "x"})
+    assert small == {"text": "short", "topic": "x"}
+
+    large = documents.offload_input({"text": "long " * 10, "topic": "x"})
+    assert "text" not in large and large["topic"] == "x"
+    assert asyncio.run(documents.load_job_text(large)) == "long " * 10
@@ -0,0 +1,56 @@
+import importlib
+import logging
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.db.engine import async_url, get_engine, make_engine, pool_stats
+
+# app.db re-exports the `engine` object under the module's name
+engine_module = importlib.import_module("app.db.engine")
+
+
+def test_async_url_swaps_the_driver():
+    assert async_url("postgresql://u:secret@db/app") == "postgresql+asyncpg://u:secret@db/app"
+    assert async_url("postgresql+psycopg2://u@db/app") == "postgresql+asyncpg://u@db/app"
+    assert async_url("sqlite:///var/app.db") == "sqlite+aiosqlite:///var/app.db"
+
+
+def test_api_and_worker_pools_are_sized_separately(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql://u@db/app")
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 10)
+    monkeypatch.setattr(settings, "WORKER_DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "WORKER_DB_MAX_OVERFLOW", 1)
+
+    api = engine_module._pool_options("api")
+    worker = engine_module._pool_options("worker")
+    assert api["pool_size"] == 10
+    assert (worker["pool_size"], worker["max_overflow"]) == (3, 1)
+    assert api["pool_recycle"] == worker["pool_recycle"] == settings.DB_POOL_RECYCLE
+
+
+def test_one_engine_per_role():
+    assert get_engine("api") is get_engine("api") is engine_module.engine
+    assert get_engine("worker") is engine_module.worker_engine
+    assert engine_module.engine is not engine_module.worker_engine
+    assert engine_module.engine.echo is False
+
+
+def test_pool_stats_count_checkouts():
+    before = pool_stats()["worker"]["checkouts"]
+    with engine_module.worker_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        during = pool_stats()["worker"]
+    assert during["checkouts"] == before + 1
+    assert during["checkedout"] >= 1 and 0 < during["utilization"] <= 1
+
+
+def test_sampled_statement_logging(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_LOG_SAMPLE_RATE", 1.0)
+    sampled = make_engine("sampled")
+    try:
+        with caplog.at_level(logging.INFO, logger="app.db.sql"), sampled.connect() as conn:
+            conn.execute(text("SELECT 42"))
+    finally:
+        sampled.dispose()
+    assert any("[sampled] SELECT 42" in record.getMessage() for record in caplog.records)
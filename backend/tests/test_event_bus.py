@@ -0,0 +1,27 @@
+import json
+import os
+
+from app.services.event_bus import LocalEventBus
+
+
+def test_local_bus_appends_and_delivers(tmp_path):
+    path = tmp_path / "bus" / "events.jsonl"
+    bus = LocalEventBus(str(path), flush_interval=0.01)
+    received = []
+    bus.subscribe(received.extend)
+    bus.publish({"job_id": "a", "type": "status"})
+    bus.publish({"job_id": "b", "type": "stage"})
+    bus.close()
+    assert [e["job_id"] for e in received] == ["a", "b"]
+    assert [json.loads(line)["job_id"] for line in path.read_text().splitlines()] == ["a", "b"]
+
+
+def test_local_bus_rotates_segments(tmp_path):
+    path = tmp_path / "events.jsonl"
+    bus = LocalEventBus(str(path), max_bytes=1, backups=2, batch_size=1, flush_interval=0.01)
+    for job_id in ("a", "b", "c", "d"):
+        bus.publish({"job_id": job_id})
+    bus.close()
+    segments = [path, tmp_path / "events.jsonl.1", tmp_path / "events.jsonl.2"]
+    assert [json.loads(p.read_text())["job_id"] for p in segments] == ["d", "c", "b"]
+    assert not os.path.exists(tmp_path / "events.jsonl.3")
@@ -0,0 +1,104 @@
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.services.event_log import EventLogWriter
+
+
+@pytest.fixture
+def writer():
+    writer = EventLogWriter()
+    # Maintenance only when a test asks for it
+    writer._last_maintenance = float("inf")
+    return writer
+
+
+@pytest.fixture
+def job_id(api, seed):
+    data = {"agent_id": seed["agent_id"], "created_by": seed["user_id"], "input_data": json.dumps({"text": "x"})}
+    return api.post("/jobs/", data=data).json()["id"]
+
+
+def ago(**delta) -> str:
+    return (datetime.now(timezone.utc) - timedelta(**delta)).isoformat()
+
+
+def latest_id(api) -> int:
+    events = api.get("/events/", params={"limit": 1}).json()
+    return events[0]["id"] if events else 0
+
+
+def test_events_are_listed_newest_first(api, seed, writer, job_id):
+    writer.write([
+        {"job_id": job_id, "type": "status", "status": "running", "progress": 0, "ts": ago(seconds=3)},
+        {"job_id": job_id, "type": "stage", "stage": "ingestion", "progress": 20, "ts": ago(seconds=2)},
+        {"job_id": job_id, "type": "status", "status": "completed", "ts": ago(seconds=1)},
+    ])
+
+    events = api.get("/events/", params={"job_id": job_id}).json()
+    assert [(e["type"], e["status"] or e["stage"]) for e in events] == [
+        ("status", "completed"), ("stage", "ingestion"), ("status", "running"),
+    ]
+    # Owner looked up from the job; keys without a column go to `data`
+    assert {e["user_id"] for e in events} == {seed["user_id"]}
+    assert events[1]["data"] == {"progress": 20}
+
+    stages = api.get("/events/", params={"job_id": job_id, "type": "stage"}).json()
+    assert [e["stage"] for e in stages] == ["ingestion"]
+
+    first = api.get("/events/", params={"job_id": job_id, "limit": 2})
+    rest = api.get("/events/", params={"job_id": job_id, "cursor": first.headers["X-Next-Cursor"]})
+    assert [e["id"] for e in first.json() + rest.json()] == [e["id"] for e in events]
+
+
+def test_live_tail_returns_new_events_oldest_first(api, writer, job_id):
+    after = latest_id(api)
+    writer.write([{"job_id": job_id, "type": "status", "status": s} for s in ("running", "completed")])
+
+    response = api.get("/events/", params={"after": after})
+    events = response.json()
+    assert [e["status"] for e in events] == ["running", "completed"]
+    assert response.headers["X-Last-Event-Id"] == str(events[-1]["id"])
+
+    # Nothing new: the same position comes back
+    response = api.get("/events/", params={"after": events[-1]["id"]})
+    assert response.json() == []
+    assert response.headers["X-Last-Event-Id"] == str(events[-1]["id"])
+
+
+def test_live_tail_waits_for_the_next_event(api, writer, job_id, monkeypatch):
+    monkeypatch.setattr(settings, "EVENT_LOG_TAIL_INTERVAL", 0.05)
+    after = latest_id(api)
+    timer = threading.Timer(0.2, writer.write, [[{"job_id": job_id, "type": "status", "status": "cancelled"}]])
+    timer.start()
+    try:
+        events = api.get("/events/", params={"after": after, "wait": 5}).json()
+    finally:
+        timer.join()
+    assert [e["status"] for e in events] == ["cancelled"]
+
+
+def test_maintenance_expires_and_compacts(api, writer, monkeypatch):
+    monkeypatch.setattr(settings, "EVENT_LOG_RETENTION_DAYS", 30)
+    monkeypatch.setattr(settings, "EVENT_LOG_COMPACT_DAYS", 7)
+    job_id = str(uuid.uuid4())
+    writer.write([
+        {"job_id": job_id, "type": "status", "status": "expired", "ts": ago(days=40)},
+        {"job_id": job_id, "type": "stage", "stage": "compacted", "ts": ago(days=10)},
+        {"job_id": job_id, "type": "status", "status": "kept", "ts": ago(days=10)},
+        {"job_id": job_id, "type": "stage", "stage": "recent", "ts": ago(days=1)},
+    ])
+
+    result = writer.maintain()
+    assert result["expired"] >= 1 and result["compacted"] >= 1
+    events = api.get("/events/", params={"job_id": job_id}).json()
+    assert [e["status"] or e["stage"] for e in events] == ["recent", "kept"]
+
+
+def test_tail_limits(api):
+    assert api.get("/events/", params={"after": 0, "limit": 0}).status_code == 422
+    assert api.get("/events/", params={"after": 0, "limit": 1000}).status_code == 422
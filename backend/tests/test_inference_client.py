@@ -0,0 +1,203 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import settings
+from app.services.inference.breaker import BreakerRegistry, CircuitBreaker, CircuitOpenError
+from app.services.inference.client import AsyncHFInferenceClient, HFInferenceClient, InferenceError
+
+MODEL = "test-model"
+
+
+class StubServer:
+    """Local inference endpoint answering from a script of (status, body, headers)."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                stub.requests.append(json.loads(self.rfile.read(length) or b"null"))
+                status, body, headers = stub.script.pop(0) if stub.script else (200, {"generated_text": "ok"}, {})
+                raw = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "HF_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(settings, "HF_BACKOFF_MAX", 0.05)
+
+
+def make_client(url, **kwargs):
+    kwargs.setdefault("max_retries", 3)
+    kwargs.setdefault("breakers", BreakerRegistry(failure_threshold=5, reset_timeout=30))
+    return HFInferenceClient(base_url=url, token="", **kwargs)
+
+
+def test_retries_until_success():
+    script = [
+        (503, {"error": "overloaded"}, {}),
+        (429, {"error": "rate limited"}, {"Retry-After": "0"}),
+        (200, [{"generated_text": "hello"}], {}),
+    ]
+    with StubServer(script) as stub:
+        client = make_client(stub.url)
+        assert client.generate(MODEL, "hi", max_tokens=5) == "hello"
+    assert len(stub.requests) == 3
+    assert stub.requests[0] == {"inputs": "hi", "parameters": {"max_new_tokens": 5}}
+
+
+def test_gives_up_after_max_retries():
+    with StubServer([(500, {"error": "boom"}, {})] * 3) as stub:
+        client = make_client(stub.url, max_retries=2)
+        with pytest.raises(InferenceError) as exc:
+            client.generate(MODEL, "hi")
+    assert exc.value.status_code == 500
+    assert len(stub.requests) == 3
+
+
+def test_client_errors_are_not_retried():
+    with StubServer([(400, {"error": "bad input"}, {})]) as stub:
+        client = make_client(stub.url)
+        with pytest.raises(InferenceError) as exc:
+            client.generate(MODEL, "hi")
+    assert exc.value.status_code == 400
+    assert len(stub.requests) == 1
+
+
+def test_retry_delay_honors_retry_after_and_estimated_time():
+    class Response:
+        def __init__(self, status_code, headers=None, body=None):
+            self.status_code, self.headers, self._body = status_code, headers or {}, body or {}
+
+        def json(self):
+            return self._body
+
+    client = make_client("http://unused")
+    assert client.retry_delay(0, Response(429, {"Retry-After": "0.02"})) == 0.02
+    assert client.retry_delay(0, Response(503, body={"estimated_time": 0.03})) == 0.03
+    # Capped at HF_BACKOFF_MAX
+    assert client.retry_delay(0, Response(429, {"Retry-After": "120"})) == settings.HF_BACKOFF_MAX
+    assert 0 <= client.retry_delay(3) <= settings.HF_BACKOFF_MAX
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breakers = BreakerRegistry(failure_threshold=2, reset_timeout=30)
+    with StubServer([(500, {"error": "boom"}, {})] * 2) as stub:
+        client = make_client(stub.url, max_retries=5, breakers=breakers)
+        with pytest.raises(CircuitOpenError):
+            client.generate(MODEL, "hi")
+    assert len(stub.requests) == 2
+    assert breakers.get(MODEL).state == CircuitBreaker.OPEN
+
+
+def test_rate_limits_and_loading_do_not_trip_the_breaker():
+    breakers = BreakerRegistry(failure_threshold=2, reset_timeout=30)
+    script = [
+        (429, {"error": "rate limited"}, {"Retry-After": "0"}),
+        (503, {"error": "loading", "estimated_time": 0.01}, {}),
+        (429, {"error": "rate limited"}, {"Retry-After": "0"}),
+        (200, {"generated_text": "done"}, {}),
+    ]
+    with StubServer(script) as stub:
+        client = make_client(stub.url, breakers=breakers)
+        assert client.generate(MODEL, "hi") == "done"
+    assert breakers.get(MODEL).state == CircuitBreaker.CLOSED
+
+
+def _half_open(breakers):
+    breaker = breakers.get(MODEL)
+    breaker.state, breaker._opened_at = CircuitBreaker.OPEN, 0.0
+    return breaker
+
+
+def test_stale_trial_release_does_not_free_a_newer_trial():
+    # A long stream releases its trial only when it ends, after the circuit
+    # re-opened and another caller's trial took the slot
+    breaker = CircuitBreaker(MODEL, failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    stale = breaker.before_call()
+    breaker.record_failure()
+    current = breaker.before_call()
+    assert current is not None and current != stale
+
+    breaker.release_trial(stale)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.release_trial(current)
+    assert breaker.before_call() is not None
+
+
+def test_half_open_trial_without_outcome_releases_the_slot():
+    # A trial that is rate limited and then rejected must not wedge the breaker
+    breakers = BreakerRegistry(failure_threshold=1, reset_timeout=0.01)
+    breaker = _half_open(breakers)
+    with StubServer([(429, {"error": "rate limited"}, {"Retry-After": "0"})] + [(400, {"error": "bad"}, {})]) as stub:
+        client = make_client(stub.url, breakers=breakers)
+        with pytest.raises(InferenceError):
+            client.generate(MODEL, "hi")
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert client.generate(MODEL, "again") == "ok"
+
+
+def test_half_open_trial_on_last_attempt_releases_the_slot():
+    breakers = BreakerRegistry(failure_threshold=1, reset_timeout=0.01)
+    breaker = _half_open(breakers)
+    with StubServer([(429, {"error": "rate limited"}, {"Retry-After": "0"})]) as stub:
+        client = make_client(stub.url, max_retries=0, breakers=breakers)
+        with pytest.raises(InferenceError):
+            client.generate(MODEL, "hi")
+        assert breaker._trial is None
+        assert client.generate(MODEL, "again") == "ok"
+
+
+def test_cancelled_async_trial_releases_the_slot(monkeypatch):
+    monkeypatch.setattr(settings, "HF_BACKOFF_MAX", 30.0)
+    breakers = BreakerRegistry(failure_threshold=1, reset_timeout=0.01)
+    breaker = _half_open(breakers)
+
+    async def run(url):
+        client = AsyncHFInferenceClient(base_url=url, token="", max_retries=3, breakers=breakers)
+        try:
+            # Loading: the trial sleeps before its retry and is cancelled there
+            task = asyncio.create_task(client.generate(MODEL, "hi"))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert breaker._trial is None
+            return await client.generate(MODEL, "again")
+        finally:
+            await client.aclose()
+
+    script = [(503, {"error": "loading", "estimated_time": 30}, {"Retry-After": "30"})]
+    with StubServer(script) as stub:
+        assert asyncio.run(run(stub.url)) == "ok"
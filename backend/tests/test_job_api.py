@@ -0,0 +1,35 @@
+import json
+
+
+def create_job(api, seed, **form):
+    data = {"agent_id": seed["agent_id"], "created_by": seed["user_id"], **form}
+    return api.post("/jobs/", data=data)
+
+
+def test_create_job_returns_the_job_without_loading_deferred_payloads(api, seed):
+    response = create_job(api, seed, input_data=json.dumps({"text": "hello"}))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["status"] == "pending"
+    assert body["input_data"] == {"text": "hello"}
+    assert body["output_data"] is None
+
+
+def test_get_job_fields_pick_payloads(api, seed):
+    job_id = create_job(api, seed, input_data=json.dumps({"text": "hi"})).json()["id"]
+
+    full = api.get(f"/jobs/{job_id}")
+    assert full.status_code == 200, full.text
+    assert full.json()["input_data"] == {"text": "hi"}
+
+    bare = api.get(f"/jobs/{job_id}", params={"fields": ""})
+    assert bare.status_code == 200, bare.text
+    assert bare.json()["input_data"] is None
+
+
+def test_list_jobs_returns_summaries(api, seed):
+    create_job(api, seed, input_data=json.dumps({"text": "listed"}))
+    response = api.get("/jobs/", params={"limit": 5})
+    assert response.status_code == 200, response.text
+    assert response.json()
+    assert "input_data" not in response.json()[0]
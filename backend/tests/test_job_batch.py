@@ -0,0 +1,117 @@
+import json
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+
+
+def submit(api, seed, files=None, **form):
+    data = {"agent_id": seed["agent_id"], "created_by": seed["user_id"], **form}
+    return api.post("/jobs/batch", data=data, files=files)
+
+
+def set_status(job_id, status, progress=0):
+    from app.db import SessionLocal
+    from app.db.job import Job
+
+    db = SessionLocal()
+    try:
+        db.query(Job).filter(Job.id == uuid.UUID(job_id)).update({"status": status, "progress": progress})
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_batch_is_one_insert(api, seed):
+    from app.db.engine import get_async_engine
+
+    statements = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO jobs"):
+            statements.append(executemany)
+
+    sync_engine = get_async_engine().sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count_inserts)
+    try:
+        files = [("input_files", ("notes.txt", b"uploaded notes\n", "text/plain"))]
+        response = submit(api, seed, files=files, inputs=json.dumps(["first", {"text": "second", "topic": "t"}]))
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count_inserts)
+    assert response.status_code == 200, response.text
+    assert statements == [True]
+
+    batch = response.json()
+    jobs = [api.get(f"/jobs/{job_id}").json() for job_id in batch["job_ids"]]
+    assert {job["batch_id"] for job in jobs} == {batch["batch_id"]}
+    assert {job["priority"] for job in jobs} == {settings.JOB_BATCH_PRIORITY}
+    assert "document" in jobs[0]["input_data"]
+    assert [job["input_data"] for job in jobs[1:]] == [{"text": "first"}, {"text": "second", "topic": "t"}]
+
+    listed = api.get("/jobs/", params={"batch_id": batch["batch_id"], "limit": 10}).json()
+    assert sorted(job["id"] for job in listed) == sorted(batch["job_ids"])
+
+
+def test_batch_status(api, seed):
+    batch = submit(api, seed, inputs=json.dumps(["a", "b", "c", "d"]), priority="normal").json()
+    batch_id, (first, second, third, fourth) = batch["batch_id"], batch["job_ids"]
+
+    status = api.get(f"/jobs/batch/{batch_id}").json()
+    assert (status["total"], status["statuses"], status["progress"], status["done"]) == (4, {"pending": 4}, 0, False)
+
+    set_status(first, "completed", 100)
+    set_status(second, "failed", 40)
+    set_status(third, "running", 50)
+    status = api.get(f"/jobs/batch/{batch_id}").json()
+    assert status["statuses"] == {"completed": 1, "failed": 1, "running": 1, "pending": 1}
+    # Finished jobs count as done whatever progress they stopped at
+    assert status["progress"] == (100 + 100 + 50 + 0) // 4
+    assert not status["done"]
+
+    set_status(third, "completed", 100)
+    set_status(fourth, "cancelled")
+    status = api.get(f"/jobs/batch/{batch_id}").json()
+    assert (status["progress"], status["done"]) == (100, True)
+
+
+@pytest.mark.parametrize(
+    "form, error",
+    [
+        ({}, "Provide input_files and/or inputs"),
+        ({"inputs": "[]"}, "Provide input_files and/or inputs"),
+        ({"inputs": '{"text": "x"}'}, "must be a JSON array"),
+        ({"inputs": "[not json"}, "Invalid JSON"),
+        ({"inputs": '["x"]', "pipeline": "nope"}, "Unknown pipeline"),
+        ({"inputs": '["x"]', "priority": "urgent"}, "Unknown priority"),
+    ],
+)
+def test_invalid_batches(api, seed, form, error):
+    response = submit(api, seed, **form)
+    assert response.status_code == 400
+    assert error in response.json()["detail"]
+
+
+def test_batch_limits(api, seed, monkeypatch):
+    from app.db import SessionLocal
+    from app.db.job import Job
+
+    monkeypatch.setattr(settings, "MAX_BATCH_JOBS", 2)
+    assert submit(api, seed, inputs=json.dumps(["a", "b", "c"])).status_code == 400
+
+    # The whole batch must fit the queue
+    db = SessionLocal()
+    try:
+        pending = db.query(Job).filter(Job.status == "pending").count()
+    finally:
+        db.close()
+    monkeypatch.setattr(settings, "MAX_PENDING_JOBS", pending + 1)
+    response = submit(api, seed, inputs=json.dumps(["a", "b"]))
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    assert submit(api, seed, inputs=json.dumps(["a"])).status_code == 200
+
+
+def test_unknown_batch(api):
+    assert api.get(f"/jobs/batch/{uuid.uuid4()}").status_code == 404
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+
+from app.services.job_events import format_sse, job_events
+
+
+def parse_sse(body: str) -> list[dict]:
+    return [
+        json.loads(line[len("data: "):])
+        for block in body.split("\n\n")
+        for line in block.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def run_once_subscribed(job_id, run):
+    """Starts `run()` in a thread once a client has subscribed to the job's events."""
+
+    def wait_and_run():
+        deadline = time.monotonic() + 5
+        while str(job_id) not in job_events._subscribers and time.monotonic() < deadline:
+            time.sleep(0.01)
+        run()
+
+    thread = threading.Thread(target=wait_and_run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_format_sse():
+    assert format_sse({"type": "progress", "progress": 40}) == 'event: progress\ndata: {"type": "progress", "progress": 40}\n\n'
+    assert format_sse({"a": 1}, "status").startswith("event: status\n")
+
+
+def test_stream_of_a_finished_job_is_its_status(api, running_job):
+    job_id = running_job("done")
+    api.delete(f"/jobs/{job_id}")
+
+    response = api.get(f"/jobs/{job_id}/events")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert parse_sse(response.text) == [{"job_id": job_id, "type": "status", "status": "cancelled", "progress": 0}]
+
+
+def test_stream_follows_a_running_job_to_the_end(api, fake_tools, running_job):
+    from app.services.job_runner import _process_job
+
+    job_id = running_job("streamed")
+    worker = run_once_subscribed(job_id, lambda: asyncio.run(_process_job(job_id)))
+
+    response = api.get(f"/jobs/{job_id}/events")
+    worker.join(5)
+
+    events = parse_sse(response.text)
+    assert events[0] == {"job_id": job_id, "type": "status", "status": "running", "progress": 0}
+    assert [(e["stage"], e["progress"]) for e in events if e["type"] == "stage"] == [
+        ("ingestion", 20), ("research", 40), ("citation", 60), ("formatting", 80), ("compliance", 100),
+    ]
+    assert events[-1]["type"] == "status" and events[-1]["status"] == "completed"
+    assert not job_events._subscribers.get(job_id)
+
+
+def test_stream_sends_keep_alives(api, running_job, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "SSE_KEEPALIVE_INTERVAL", 0.05)
+    job_id = running_job("idle")
+
+    def cancel():
+        time.sleep(0.2)
+        job_events.publish(job_id, {"type": "status", "status": "cancelled"})
+
+    worker = run_once_subscribed(job_id, cancel)
+    body = api.get(f"/jobs/{job_id}/events").text
+    worker.join(5)
+    assert ": keep-alive\n\n" in body
+    assert parse_sse(body)[-1]["status"] == "cancelled"
+
+
+def test_stream_of_an_unknown_job(api):
+    job_id = uuid.uuid4()
+    assert api.get(f"/jobs/{job_id}/events").status_code == 404
+    assert not job_events._subscribers.get(str(job_id))
+
+
+def test_report_streams_the_output_stage_tokens(api, fake_tools, running_job, monkeypatch):
+    from app.api import job_router
+    from app.services.job_runner import _process_job
+    from app.services.mcp.base import _token_sink
+
+    _, hooks = fake_tools
+    job_id = running_job("tokens")
+
+    async def compliance():
+        # What a streaming model call does inside stream_tokens()
+        for piece in ("Final ", "report ", "text"):
+            await _token_sink.get()(piece)
+
+    async def stored_report(job_id):
+        raise AssertionError("the report should come from the token stream")
+
+    hooks["compliance"] = compliance
+    monkeypatch.setattr(job_router, "_final_report", stored_report)
+    worker = run_once_subscribed(job_id, lambda: asyncio.run(_process_job(job_id)))
+
+    response = api.get(f"/jobs/{job_id}/report/stream")
+    worker.join(5)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text == "Final report text"
+
+
+def test_report_stream_of_a_finished_job_is_the_stored_report(api, fake_tools, running_job):
+    from app.services.job_runner import _process_job
+
+    job_id = running_job("finished")
+    asyncio.run(_process_job(job_id))
+    assert api.get(f"/jobs/{job_id}/report/stream").text == api.get(f"/jobs/{job_id}/report/content").text
+
+
+def test_report_stream_falls_back_to_the_stored_report(api, fake_tools, running_job):
+    from app.services.job_runner import _process_job
+
+    # No tokens streamed (e.g. the stage was restored from a checkpoint): sent once the job completes
+    job_id = running_job("not streamed")
+    worker = run_once_subscribed(job_id, lambda: asyncio.run(_process_job(job_id)))
+    body = api.get(f"/jobs/{job_id}/report/stream").text
+    worker.join(5)
+    assert body == "compliance(formatter(citation(research(ingestion(not streamed)))))"
+
+
+def test_report_stream_of_an_unknown_job(api):
+    job_id = uuid.uuid4()
+    assert api.get(f"/jobs/{job_id}/report/stream").status_code == 404
+    assert not job_events._subscribers.get(str(job_id))
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+
+async def run_collecting(job_id) -> list[dict]:
+    """Runs a claimed job to its end and returns the events published for it."""
+    from app.services.job_events import job_events
+    from app.services.job_runner import _process_job
+
+    queue = job_events.subscribe(job_id)
+    try:
+        await _process_job(job_id)
+        # Events published from worker threads arrive through call_soon_threadsafe
+        await asyncio.sleep(0.05)
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return events
+    finally:
+        job_events.unsubscribe(job_id, queue)
+
+
+def test_progress_follows_finished_stages(api, fake_tools, running_job):
+    calls, _ = fake_tools
+    job_id = running_job("progress")
+
+    started = time.monotonic()
+    events = asyncio.run(run_collecting(job_id))
+    # No fixed per-stage delay: five fake stages take next to nothing
+    assert time.monotonic() - started < 5
+
+    stages = [(event["stage"], event["progress"]) for event in events if event["type"] == "stage"]
+    assert stages == [("ingestion", 20), ("research", 40), ("citation", 60), ("formatting", 80), ("compliance", 100)]
+    assert calls == ["ingestion", "research", "citation", "formatter", "compliance"]
+    assert events[-1]["type"] == "status" and events[-1]["status"] == "completed"
+
+    job = api.get(f"/jobs/{job_id}").json()
+    assert (job["status"], job["progress"]) == ("completed", 100)
+
+
+def test_cancelled_job_stops_after_the_running_stage(api, fake_tools, running_job):
+    calls, hooks = fake_tools
+    job_id = running_job("cancel me")
+
+    async def cancel():
+        # The cancel lands while research runs; its progress write finds the job cancelled
+        await asyncio.to_thread(api.delete, f"/jobs/{job_id}")
+
+    hooks["research"] = cancel
+    events = asyncio.run(run_collecting(job_id))
+
+    assert calls == ["ingestion", "research"]
+    assert [event["stage"] for event in events if event["type"] == "stage"] == ["ingestion"]
+    job = api.get(f"/jobs/{job_id}").json()
+    assert (job["status"], job["progress"]) == ("cancelled", 20)
+
+
+def test_failed_stage_fails_the_job_with_its_error(api, fake_tools, running_job):
+    _, hooks = fake_tools
+    job_id = running_job("fail me")
+
+    async def broken():
+        raise RuntimeError("model unavailable")
+
+    hooks["citation"] = broken
+    events = asyncio.run(run_collecting(job_id))
+
+    assert events[-1]["status"] == "failed"
+    job = api.get(f"/jobs/{job_id}").json()
+    assert job["status"] == "failed"
+    assert "model unavailable" in job["output_data"]["error"]
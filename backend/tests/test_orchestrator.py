@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from app.services.agent_orchestrator import AgentOrchestrator
+from app.services.pipeline import DEFAULT_PIPELINE, SECTIONED_PIPELINE, PipelineDAG, Stage
+
+
+def run(dag, text, **kwargs):
+    return asyncio.run(asyncio.wait_for(AgentOrchestrator().execute(dag, text, **kwargs), 5))
+
+
+def test_dag_validation():
+    with pytest.raises(ValueError, match="cycle"):
+        PipelineDAG("p", [Stage("a", "t", ["b"]), Stage("b", "t", ["a"])], output="a")
+    with pytest.raises(ValueError, match="unknown stage"):
+        PipelineDAG("p", [Stage("a", "t", ["missing"])], output="a")
+    with pytest.raises(ValueError, match="duplicate"):
+        PipelineDAG("p", [Stage("a", "t"), Stage("a", "t")], output="a")
+    with pytest.raises(ValueError, match="unknown output"):
+        PipelineDAG("p", [Stage("a", "t")], output="b")
+
+    dag = PipelineDAG("p", [Stage("c", "t", ["a", "b"]), Stage("b", "t", ["a"]), Stage("a", "t")], output="c")
+    assert [stage.name for stage in dag.order] == ["a", "b", "c"]
+
+
+def test_serial_pipeline(fake_tools):
+    calls, _ = fake_tools
+    completed = []
+
+    async def on_stage_complete(stage, output):
+        completed.append((stage.name, output))
+
+    assert run(DEFAULT_PIPELINE, "x", on_stage_complete=on_stage_complete) == "compliance(formatter(citation(research(ingestion(x)))))"
+    assert calls == ["ingestion", "research", "citation", "formatter", "compliance"]
+    assert completed[1] == ("research", "research(ingestion(x))")
+
+
+def test_independent_branches_run_concurrently(fake_tools):
+    _, hooks = fake_tools
+    dag = PipelineDAG(
+        "branches",
+        [
+            Stage("ingestion", "ingestion"),
+            Stage("research", "research", ["ingestion"]),
+            Stage("citation", "citation", ["ingestion"]),
+            Stage("compliance", "compliance", ["research", "citation"]),
+        ],
+        output="compliance",
+    )
+    research_started, citation_started = asyncio.Event(), asyncio.Event()
+
+    async def research():
+        research_started.set()
+        await citation_started.wait()
+
+    async def citation():
+        citation_started.set()
+        await research_started.wait()
+
+    # Each branch waits for the other to start: run one after the other, they would time out
+    hooks.update(research=research, citation=citation)
+    assert run(dag, "x") == "compliance(research(ingestion(x))\n\ncitation(ingestion(x)))"
+
+
+def test_sections_are_formatted_as_soon_as_their_citation_check_is_done(fake_tools):
+    calls, hooks = fake_tools
+    formatted = asyncio.Event()
+    citations = 0
+
+    async def citation():
+        nonlocal citations
+        citations += 1
+        if citations == 1:
+            # The first section's check only finishes once another section was formatted
+            await formatted.wait()
+
+    async def formatter():
+        formatted.set()
+
+    hooks.update(citation=citation, formatter=formatter)
+    # Research output is split at the blank line into two sections
+    report = run(SECTIONED_PIPELINE, "first part\n\nsecond part")
+
+    assert calls.count("citation") == calls.count("formatter") == 2
+    assert report == (
+        "compliance(formatter(citation(research(ingestion(first part))"
+        "\n\nformatter(citation(second part)))))"
+    )
+
+
+def test_aborted_stage_cancels_the_run(fake_tools):
+    calls, _ = fake_tools
+
+    def before_stage(stage):
+        if stage.name == "citation":
+            raise RuntimeError("cancelled")
+
+    with pytest.raises(RuntimeError, match="cancelled"):
+        run(DEFAULT_PIPELINE, "x", before_stage=before_stage)
+    assert calls == ["ingestion", "research"]
+
+
+def test_completed_stages_are_skipped(fake_tools):
+    calls, _ = fake_tools
+    completed = {"ingestion": "restored", "research": "notes"}
+    assert run(DEFAULT_PIPELINE, "x", completed=completed) == "compliance(formatter(citation(notes)))"
+    assert calls == ["citation", "formatter", "compliance"]
@@ -0,0 +1,91 @@
+import uuid
+
+
+def create_report(api, seed, title="Quarterly review", summary="Sales by region"):
+    response = api.post("/reports/", json={"title": title, "summary": summary, "created_by": seed["user_id"]})
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_delete_report_with_versions(api, seed):
+    report_id = create_report(api, seed)
+    for content in ("first draft\n", "first draft\nsecond line\n"):
+        response = api.post(f"/reports/{report_id}/versions", json={"content": content})
+        assert response.status_code == 200, response.text
+
+    response = api.delete(f"/reports/{report_id}")
+    assert response.status_code == 200, response.text
+    assert api.get(f"/reports/{report_id}").status_code == 404
+    assert api.delete(f"/reports/{report_id}").status_code == 404
+
+
+def test_delete_report_rejects_malformed_ids(api):
+    assert api.delete("/reports/not-a-uuid").status_code == 422
+
+
+def test_version_content_and_diff(api, seed):
+    report_id = create_report(api, seed)
+    api.post(f"/reports/{report_id}/versions", json={"content": "a\nb\n"})
+    api.post(f"/reports/{report_id}/versions", json={"content": "a\nc\n"})
+
+    assert api.get(f"/reports/{report_id}/versions/2/content").text == "a\nc\n"
+    diff = api.get(f"/reports/{report_id}/versions/diff", params={"from_version": 1, "to_version": 2}).text
+    assert "-b\n" in diff and "+c\n" in diff
+
+
+def test_versions_round_trip_through_snapshots_and_deltas(api, seed):
+    from app.db import SessionLocal
+    from app.db.report_version import ReportVersion
+    from app.services.report_versions import version_store
+
+    report_id = create_report(api, seed)
+    texts = ["".join(f"line {i}\n" for i in range(40))]
+    for n in range(1, 13):
+        texts.append(texts[-1].replace(f"line {n}\n", f"line {n} (edited)\n"))
+    for text in texts[1:]:
+        assert api.post(f"/reports/{report_id}/versions", json={"content": text}).status_code == 200
+
+    db = SessionLocal()
+    try:
+        rows = db.query(ReportVersion.version_number, ReportVersion.delta.is_(None)).filter(
+            ReportVersion.report_id == uuid.UUID(report_id)
+        ).order_by(ReportVersion.version_number).all()
+    finally:
+        db.close()
+    snapshots = [number for number, snapshot in rows if snapshot]
+    assert snapshots == list(range(1, 13, version_store.snapshot_interval))
+
+    # Cold cache: every version is rebuilt from its snapshot
+    version_store._cache.clear()
+    for number, text in enumerate(texts[1:], start=1):
+        assert api.get(f"/reports/{report_id}/versions/{number}/content").text == text
+
+
+def test_deleted_report_is_not_served_from_the_version_cache(api, seed):
+    from app.db import SessionLocal
+    from app.db.report import Report
+    from app.db.report_version import ReportVersion
+
+    report_id = create_report(api, seed)
+    api.post(f"/reports/{report_id}/versions", json={"content": "a\nb\n"})
+    api.post(f"/reports/{report_id}/versions", json={"content": "a\nc\n"})
+    params = {"from_version": 1, "to_version": 2}
+    assert api.get(f"/reports/{report_id}/versions/diff", params=params).status_code == 200
+
+    # Deleted through another process: this one's cache still holds both versions
+    db = SessionLocal()
+    try:
+        db.query(ReportVersion).filter(ReportVersion.report_id == uuid.UUID(report_id)).delete()
+        db.query(Report).filter(Report.id == uuid.UUID(report_id)).delete()
+        db.commit()
+    finally:
+        db.close()
+    assert api.get(f"/reports/{report_id}/versions/diff", params=params).status_code == 404
+
+
+def test_delta_round_trip():
+    from app.services.report_versions import apply_delta, make_delta
+
+    old = "a\nb\nc\nd\n"
+    for new in ("a\nb\nc\nd\n", "a\nx\nc\nd\ne\n", "", "no newline at end"):
+        assert apply_delta(old, make_delta(old, new)) == new
@@ -0,0 +1,116 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.db.job import Job
+from app.services import worker_pool as worker_pool_module
+from app.services.scheduler import FairScheduler
+from app.services.worker_pool import WorkerPool
+
+WEIGHTS = {"interactive": 8, "normal": 4, "bulk": 1}
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+USER_A, USER_B = uuid.uuid4(), uuid.uuid4()
+AGENT_X, AGENT_Y = uuid.uuid4(), uuid.uuid4()
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scheduler.db'}")
+    Base.metadata.create_all(engine, tables=[Job.__table__])
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.info["factory"] = Session
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_job(db, user=USER_A, agent=AGENT_X, priority="normal", status="pending", age=0.0):
+    job = Job(
+        id=uuid.uuid4(),
+        created_by=user,
+        agent_id=agent,
+        priority=priority,
+        status=status,
+        created_at=NOW - timedelta(seconds=age),
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_queue_heads_are_the_oldest_job_of_each_queue(db):
+    oldest = {}
+    for queue in [(USER_A, AGENT_X, "normal"), (USER_A, AGENT_Y, "normal"), (USER_A, AGENT_X, "bulk"), (USER_B, AGENT_X, "normal")]:
+        for age in (30, 20, 10):
+            job_id = add_job(db, *queue, age=age + len(oldest))
+            oldest.setdefault(queue, job_id)
+    add_job(db, USER_B, AGENT_Y, status="running", age=500)
+
+    heads = db.execute(FairScheduler(WEIGHTS)._queue_heads()).all()
+    assert {head.id for head in heads} == set(oldest.values())
+    assert [head.created_at for head in heads] == sorted(head.created_at for head in heads)
+    assert len(db.execute(FairScheduler(WEIGHTS, window=2)._queue_heads()).all()) == 2
+
+
+def test_no_pending_jobs(db):
+    add_job(db, status="completed")
+    assert FairScheduler(WEIGHTS).pick(db, NOW) is None
+
+
+def test_fair_share_between_users(db):
+    add_job(db, USER_A, status="running")
+    a = add_job(db, USER_A, age=60)
+    b = add_job(db, USER_B, age=1)
+    assert [head.id for head in FairScheduler(WEIGHTS).rank(db, NOW)] == [b, a]
+
+
+def test_priority_classes_and_aging(db):
+    add_job(db, USER_A, priority="bulk", age=10)
+    interactive = add_job(db, USER_B, priority="interactive", age=1)
+    scheduler = FairScheduler(WEIGHTS, aging_seconds=600)
+    assert scheduler.pick(db, NOW).id == interactive
+
+    # Waiting long enough, bulk work overtakes
+    starved = add_job(db, uuid.uuid4(), priority="bulk", age=7200)
+    assert scheduler.pick(db, NOW).id == starved
+
+
+def test_quotas(db):
+    add_job(db, USER_A, AGENT_X, status="running")
+    a = add_job(db, USER_A, AGENT_Y, age=60)
+    b = add_job(db, USER_B, AGENT_X, age=30)
+    c = add_job(db, USER_B, AGENT_Y, age=10)
+
+    assert {head.id for head in FairScheduler(WEIGHTS, user_quota=1).rank(db, NOW)} == {b, c}
+    assert {head.id for head in FairScheduler(WEIGHTS, agent_quota=1).rank(db, NOW)} == {a, c}
+
+    scheduler = FairScheduler(WEIGHTS, user_quota=1)
+    head = scheduler.pick(db, NOW)
+    assert scheduler.admit(db, head)
+    add_job(db, head.created_by, status="running")
+    assert not scheduler.admit(db, head)
+
+
+def test_claim_skips_candidates_taken_since_ranking(db, monkeypatch):
+    monkeypatch.setattr(worker_pool_module, "SessionLocal", db.info["factory"])
+    first = add_job(db, USER_A, age=60)
+    second = add_job(db, USER_B, age=30)
+    pool = WorkerPool(concurrency=1)
+
+    # Ranked before the first claim committed, as a concurrent worker would
+    stale = FairScheduler(WEIGHTS).rank(db, NOW)
+    assert [head.id for head in stale] == [first, second]
+    assert pool._claim_next() == first
+
+    monkeypatch.setattr(worker_pool_module.scheduler, "rank", lambda session, now=None: stale)
+    assert pool._claim_next() == second
+    assert pool._claim_next() is None
+
+    db.expire_all()
+    for job in db.query(Job).all():
+        assert (job.status, job.worker_id) == ("running", pool.worker_id)
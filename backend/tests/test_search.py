@@ -0,0 +1,105 @@
+import uuid
+
+from app.services.search import InvertedIndex, report_search
+
+
+def create_report(api, seed, title, summary="", content=None, created_by=None):
+    data = {"title": title, "summary": summary, "created_by": created_by or seed["user_id"]}
+    response = api.post("/reports/", json=data)
+    assert response.status_code == 200, response.text
+    report_id = response.json()["id"]
+    if content is not None:
+        response = api.post(f"/reports/{report_id}/versions", json={"content": content})
+        assert response.status_code == 200, response.text
+    return report_id
+
+
+def search(api, q, **params):
+    response = api.get("/reports/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json(), response.headers.get("X-Next-Cursor")
+
+
+def test_title_matches_rank_above_content_matches(api, seed):
+    in_content = create_report(api, seed, "Quarterly review", content="notes on the marmalade supply chain")
+    in_title = create_report(api, seed, "Marmalade outlook", content="prices and volumes")
+
+    hits, cursor = search(api, "marmalade")
+    assert [hit["id"] for hit in hits] == [in_title, in_content]
+    assert cursor is None
+    assert "<b>marmalade</b>" in hits[1]["snippet"]
+
+
+def test_new_versions_replace_the_indexed_content(api, seed):
+    report_id = create_report(api, seed, "Versioned", content="draft about zeppelins")
+    assert [hit["id"] for hit in search(api, "zeppelins")[0]] == [report_id]
+
+    api.post(f"/reports/{report_id}/versions", json={"content": "final text about airships"})
+    assert search(api, "zeppelins")[0] == []
+    assert [hit["id"] for hit in search(api, "airships")[0]] == [report_id]
+
+
+def test_index_is_built_from_current_version_text(api, seed, monkeypatch):
+    report_id = create_report(api, seed, "Rebuilt", content="old words")
+    api.post(f"/reports/{report_id}/versions", json={"content": "capybara census results"})
+
+    # As after a restart: the index is rebuilt from the reports and their version texts
+    monkeypatch.setattr(report_search, "_index", None)
+    hits, _ = search(api, "capybara")
+    assert [hit["id"] for hit in hits] == [report_id]
+    assert "<b>capybara</b>" in hits[0]["snippet"]
+    assert search(api, "old words")[0] == []
+
+
+def test_cursor_pages_through_every_hit_once(api, seed):
+    ids = {create_report(api, seed, f"Walrus report {i}", content="walrus " * (i + 1)) for i in range(5)}
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        hits, cursor = search(api, "walrus", **params)
+        assert len(hits) <= 2
+        seen += [hit["id"] for hit in hits]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 5
+    assert set(seen) == ids
+    ranks = [hit["rank"] for hit in search(api, "walrus", limit=5)[0]]
+    assert ranks == sorted(ranks, reverse=True)
+
+
+def test_created_by_filter_and_deleted_reports(api, seed):
+    from app.db import SessionLocal, User
+
+    db = SessionLocal()
+    try:
+        other = User(full_name="Other", email=f"{uuid.uuid4().hex}@example.com", hashed_password="-", role="Admin")
+        db.add(other)
+        db.commit()
+        other_id = str(other.id)
+    finally:
+        db.close()
+
+    mine = create_report(api, seed, "Narwhal sightings")
+    theirs = create_report(api, seed, "Narwhal migration", created_by=other_id)
+    assert {hit["id"] for hit in search(api, "narwhal")[0]} == {mine, theirs}
+    assert [hit["id"] for hit in search(api, "narwhal", created_by=other_id)[0]] == [theirs]
+
+    api.delete(f"/reports/{theirs}")
+    assert [hit["id"] for hit in search(api, "narwhal")[0]] == [mine]
+
+
+def test_rejects_empty_queries_and_bad_limits(api):
+    assert api.get("/reports/search", params={"q": "  "}).status_code == 422
+    assert api.get("/reports/search", params={"q": "x", "limit": 0}).status_code == 422
+
+
+def test_inverted_index_requires_every_term():
+    index = InvertedIndex()
+    index.add("a", ("Solar power", "", "panels on roofs"), {"id": "a"})
+    index.add("b", ("Solar wind", "", ""), {"id": "b"})
+    assert [hit[1] for hit in index.search("solar panels")] == ["a"]
+    assert {hit[1] for hit in index.search("the solar")} == {"a", "b"}
+    assert index.search("the") == []
+    index.remove("a")
+    assert index.search("panels") == [] and index.content("a") == ""
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.services.telemetry import metrics
+from app.services.telemetry.metrics import MetricsRegistry
+from app.services.telemetry.tracing import FileSpanExporter, Tracer
+
+
+def samples(text: str) -> dict:
+    """{'name{labels}': value} of a Prometheus text rendering."""
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+def test_counter_gauge_and_histogram_rendering():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls", ("tool",))
+    depth = registry.gauge("depth", "Depth")
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    assert registry.counter("calls_total", "Calls", ("tool",)) is calls
+
+    calls.inc(tool='say "hi"')
+    calls.inc(2, tool='say "hi"')
+    registry.add_collector(lambda: depth.set(7))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert samples(text) == {
+        'calls_total{tool="say \\"hi\\""}': 3,
+        "depth": 7,
+        'latency_seconds_bucket{le="0.1"}': 2,
+        'latency_seconds_bucket{le="1.0"}': 3,
+        'latency_seconds_bucket{le="+Inf"}': 4,
+        "latency_seconds_sum": 3.65,
+        "latency_seconds_count": 4,
+    }
+
+
+def test_failing_collector_does_not_break_a_scrape():
+    registry = MetricsRegistry()
+    registry.gauge("up", "Up").set(1)
+    registry.add_collector(lambda: 1 / 0)
+    assert samples(registry.render()) == {"up": 1}
+
+
+def test_model_calls_record_tokens_and_cost(monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_COSTS", {"priced-model": 0.5})
+    labels = '{tool="summarizer",model="priced-model"}'
+    before = samples(metrics.registry.render())
+
+    metrics.record_model_call("summarizer", "priced-model", "p" * 400, "o" * 200, 0.2)
+
+    after = samples(metrics.registry.render())
+    delta = {name: after[name] - before.get(name, 0) for name in after}
+    assert delta[f"model_calls_total{labels}"] == 1
+    assert delta[f"model_prompt_tokens_total{labels}"] == 100
+    assert delta[f"model_output_tokens_total{labels}"] == 50
+    assert delta[f"model_cost_estimate_total{labels}"] == pytest.approx(0.075)
+
+
+def test_spans_nest_across_tasks(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer(FileSpanExporter(str(path)))
+
+    async def child(i):
+        with tracer.span("child", index=i):
+            await asyncio.sleep(0)
+
+    async def run():
+        with tracer.span("job", job_id="j") as span:
+            await asyncio.gather(child(0), child(1))
+            span.set_attribute("status", "completed")
+        with pytest.raises(ValueError), tracer.span("failing"):
+            raise ValueError("boom")
+
+    asyncio.run(run())
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    job = next(span for span in spans if span["name"] == "job")
+    children = [span for span in spans if span["name"] == "child"]
+    assert job["attributes"] == {"job_id": "j", "status": "completed"} and job["parentSpanId"] is None
+    assert {span["parentSpanId"] for span in children} == {job["spanId"]}
+    assert {span["traceId"] for span in children} == {job["traceId"]}
+    failing = next(span for span in spans if span["name"] == "failing")
+    assert failing["status"] == {"code": "ERROR", "message": "ValueError: boom"}
+    assert failing["traceId"] != job["traceId"]
+
+
+def test_disabled_tracer_records_nothing():
+    with Tracer().span("job") as span:
+        assert span is None
+
+
+def test_job_runs_are_measured(api, fake_tools, running_job):
+    from app.services.job_runner import _process_job
+
+    before = samples(api.get("/metrics").text)
+    asyncio.run(_process_job(running_job("measured")))
+    response = api.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    after = samples(response.text)
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert delta('job_duration_seconds_count{pipeline="default",status="completed"}') == 1
+    for stage, tool in [("ingestion", "ingestion"), ("formatting", "formatter"), ("compliance", "compliance")]:
+        assert delta(f'stage_duration_seconds_count{{pipeline="default",stage="{stage}",tool="{tool}"}}') == 1
+    assert any(name.startswith("db_pool_connections{") for name in after)
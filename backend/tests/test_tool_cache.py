@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+from app.services.mcp.cache import CacheTier, LRUCacheTier, ToolResultCache, cache_bypass, cache_key
+
+
+class DictTier(CacheTier):
+    """Stand-in for the shared tier."""
+
+    name = "shared"
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, *, tool, model):
+        self.data[key] = value
+
+    def clear(self):
+        self.data.clear()
+
+
+def make_cache():
+    memory, shared = LRUCacheTier(max_entries=2, ttl=60), DictTier()
+    return ToolResultCache([memory, shared]), memory, shared
+
+
+def counting(value):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+
+    return compute, calls
+
+
+def test_cache_key_depends_on_every_input():
+    key = cache_key("summarizer", "m", "prompt", {"max_new_tokens": 5})
+    assert key == cache_key("summarizer", "m", "prompt", {"max_new_tokens": 5})
+    assert key != cache_key("summarizer", "m", "prompt", {"max_new_tokens": 6})
+    assert key != cache_key("summarizer", "other", "prompt", {"max_new_tokens": 5})
+    assert key != cache_key("citation", "m", "prompt", {"max_new_tokens": 5})
+
+
+def test_miss_then_hit():
+    cache, memory, shared = make_cache()
+    compute, calls = counting("result")
+    assert cache.get_or_compute("t", "m", "p", {}, compute) == "result"
+    assert cache.get_or_compute("t", "m", "p", {}, compute) == "result"
+    assert len(calls) == 1
+    assert len(memory) == 1 and len(shared.data) == 1
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["hits_memory"] == 1 and stats["stores"] == 1
+
+
+def test_shared_hit_is_copied_into_memory():
+    cache, memory, shared = make_cache()
+    shared.data[cache_key("t", "m", "p", {})] = "from elsewhere"
+    compute, calls = counting("result")
+    assert cache.get_or_compute("t", "m", "p", {}, compute) == "from elsewhere"
+    assert not calls
+    assert memory.get(cache_key("t", "m", "p", {})) == "from elsewhere"
+
+
+def test_memory_tier_evicts_oldest_and_expired_entries():
+    memory = LRUCacheTier(max_entries=2, ttl=60)
+    for key in ("a", "b", "c"):
+        memory.set(key, key, tool="t", model="m")
+    assert memory.get("a") is None and memory.get("c") == "c"
+
+    short = LRUCacheTier(max_entries=2, ttl=0.01)
+    short.set("a", "a", tool="t", model="m")
+    time.sleep(0.02)
+    assert short.get("a") is None
+
+
+def test_bypass_never_reads_or_stores():
+    cache, memory, shared = make_cache()
+    compute, calls = counting("result")
+    with cache_bypass():
+        cache.get_or_compute("t", "m", "p", {}, compute)
+        cache.get_or_compute("t", "m", "p", {}, compute)
+    assert len(calls) == 2
+    assert len(memory) == 0 and not shared.data
+
+
+def test_empty_results_are_not_stored():
+    cache, memory, shared = make_cache()
+    for empty in ("", "  \n"):
+        compute, calls = counting(empty)
+        assert cache.get_or_compute("t", "m", "p", {}, compute) == empty
+        assert cache.get_or_compute("t", "m", "p", {}, compute) == empty
+        assert len(calls) == 2
+    assert len(memory) == 0 and not shared.data
+    assert cache.stats()["skipped"] == 4
+
+    compute, calls = counting("recovered")
+    assert cache.get_or_compute("t", "m", "p", {}, compute) == "recovered"
+    assert shared.data[cache_key("t", "m", "p", {})] == "recovered"
+
+
+def test_async_empty_results_are_not_stored():
+    cache, memory, shared = make_cache()
+    results = iter(["", "second try"])
+
+    async def acompute():
+        return next(results)
+
+    async def run():
+        first = await cache.aget_or_compute("t", "m", "p", {}, acompute)
+        second = await cache.aget_or_compute("t", "m", "p", {}, acompute)
+        third = await cache.aget_or_compute("t", "m", "p", {}, acompute)
+        return first, second, third
+
+    assert asyncio.run(run()) == ("", "second try", "second try")
+    assert shared.data[cache_key("t", "m", "p", {})] == "second try"
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db import SessionLocal
+from app.db.job import Job
+from app.services import worker_pool as worker_pool_module
+from app.services.worker_pool import WorkerPool
+
+
+@pytest.fixture
+def submit(api, seed, user_id, monkeypatch):
+    """Submits jobs of a user of their own; the pools under test claim only those."""
+    ours = set()
+    rank = worker_pool_module.scheduler.rank
+    monkeypatch.setattr(
+        worker_pool_module.scheduler, "rank",
+        lambda db, now=None: [job for job in rank(db, now) if job.id in ours],
+    )
+
+    def submit(text):
+        data = {"agent_id": seed["agent_id"], "created_by": user_id, "input_data": json.dumps({"text": text})}
+        job_id = api.post("/jobs/", data=data).json()["id"]
+        ours.add(uuid.UUID(job_id))
+        return job_id
+
+    return submit
+
+
+def job_row(job_id) -> Job:
+    db = SessionLocal()
+    try:
+        return db.get(Job, uuid.UUID(job_id))
+    finally:
+        db.close()
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_pool_runs_submitted_jobs(fake_tools, submit):
+    pool = WorkerPool(concurrency=2, poll_interval=0.05)
+    pool.start()
+    try:
+        job_ids = [submit(f"job {i}") for i in range(4)]
+        pool.notify()
+        wait_for(lambda: all(job_row(job_id).status == "completed" for job_id in job_ids))
+    finally:
+        pool.stop(timeout=5)
+    assert {job_row(job_id).worker_id for job_id in job_ids} == {pool.worker_id}
+    assert not pool.active_jobs
+
+
+def test_stop_requeues_unfinished_jobs(fake_tools, submit):
+    _, hooks = fake_tools
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(2)
+
+    hooks["research"] = slow
+    pool = WorkerPool(concurrency=1, poll_interval=0.05)
+    pool.start()
+    job_id = submit("interrupted")
+    pool.notify()
+    wait_for(lambda: started.is_set())
+    pool.stop(timeout=0.1)
+
+    job = job_row(job_id)
+    assert (job.status, job.worker_id, job.heartbeat_at) == ("pending", None, None)
+
+
+def test_recover_orphans(submit):
+    stale, alive = submit("orphaned"), submit("alive")
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        for job_id, heartbeat in ((stale, now - timedelta(hours=1)), (alive, now)):
+            db.query(Job).filter(Job.id == uuid.UUID(job_id)).update(
+                {"status": "running", "worker_id": "gone", "heartbeat_at": heartbeat}
+            )
+        db.commit()
+    finally:
+        db.close()
+
+    assert WorkerPool(concurrency=1).recover_orphans() >= 1
+    assert (job_row(stale).status, job_row(stale).worker_id) == ("pending", None)
+    assert (job_row(alive).status, job_row(alive).worker_id) == ("running", "gone")
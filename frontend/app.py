@@ -568,6 +568,34 @@ with right:
             except Exception as e:
                 st.error(f"Reports list failed: {e}")
 
+        # Full-text search (best match first, keyset cursor in X-Next-Cursor)
+        search_q = st.text_input("Search reports", key="rep_search_q")
+        if st.button("Search", key="rep_search_btn") and search_q.strip():
+            st.session_state["rep_search_cursor"] = None
+            st.session_state["rep_search_query"] = search_q
+        if st.session_state.get("rep_search_query"):
+            params = {"q": st.session_state["rep_search_query"], "limit": 10}
+            if st.session_state.get("rep_search_cursor"):
+                params["cursor"] = st.session_state["rep_search_cursor"]
+            try:
+                r = requests.get(f"{BASE_URL}/reports/search", params=params, headers=get_headers(), timeout=REQUEST_TIMEOUT)
+                if r.status_code == 200:
+                    hits = r.json()
+                    if not hits:
+                        st.info("No matching reports")
+                    for hit in hits:
+                        st.markdown(f"**{hit['title']}** · `{hit['id']}` · rank {hit['rank']:.3f}")
+                        # Snippets mark matches with <b>; shown as markdown bold, not raw HTML
+                        st.markdown(hit["snippet"].replace("<b>", "**").replace("</b>", "**"))
+                    next_cursor = r.headers.get("X-Next-Cursor")
+                    if next_cursor and st.button("More results", key="rep_search_more"):
+                        st.session_state["rep_search_cursor"] = next_cursor
+                        st.rerun()
+                else:
+                    show_api_response(r)
+            except Exception as e:
+                st.error(f"Report search failed: {e}")
+
         rep_id = st.text_input("Report ID (get/delete)", key="rep_id")
         if st.button("Get report"):
             try:
@@ -585,6 +613,47 @@ with right:
                 except Exception as e:
                     st.error(f"Delete report failed: {e}")
 
+        # ----------------- Version history -----------------
+        with st.expander("Version history", expanded=False):
+            if st.button("List versions"):
+                try:
+                    r = requests.get(f"{BASE_URL}/reports/{rep_id}/versions", headers=get_headers(), timeout=REQUEST_TIMEOUT)
+                    if r.status_code == 200:
+                        st.dataframe(pd.DataFrame(r.json()))
+                    else:
+                        show_api_response(r)
+                except Exception as e:
+                    st.error(f"List versions failed: {e}")
+            if st.session_state.user_role == "admin":
+                rv_content = st.text_area("New version content", key="rv_content")
+                if st.button("Save new version"):
+                    try:
+                        r = requests.post(
+                            f"{BASE_URL}/reports/{rep_id}/versions", json={"content": rv_content},
+                            headers=get_headers(), timeout=REQUEST_TIMEOUT,
+                        )
+                        show_api_response(r)
+                    except Exception as e:
+                        st.error(f"Save version failed: {e}")
+            rv_col1, rv_col2 = st.columns(2)
+            with rv_col1:
+                rv_from = st.number_input("From version", min_value=1, value=1, step=1, key="rv_from")
+            with rv_col2:
+                rv_to = st.number_input("To version", min_value=1, value=2, step=1, key="rv_to")
+            if st.button("Show diff"):
+                try:
+                    r = requests.get(
+                        f"{BASE_URL}/reports/{rep_id}/versions/diff",
+                        params={"from_version": int(rv_from), "to_version": int(rv_to)},
+                        headers=get_headers(), timeout=REQUEST_TIMEOUT,
+                    )
+                    if r.status_code == 200:
+                        st.code(r.text or "(no changes)", language="diff")
+                    else:
+                        show_api_response(r)
+                except Exception as e:
+                    st.error(f"Diff failed: {e}")
+
     # ----------------- TOOLS TAB -----------------
     with tabs[3]:
         st.markdown("<div class='card'><h3>Tools</h3></div>", unsafe_allow_html=True)
@@ -660,6 +729,10 @@ with tabs[4]:
             )
             j_file = st.file_uploader("Upload document (PDF/TXT/DOCX)", type=["pdf", "txt", "docx"])
             j_input_data = st.text_area("Or enter JSON input manually (optional)", key="j_input_data")
+            j_priority = st.selectbox(
+                "Priority", ["normal", "interactive", "bulk"], index=0, key="j_priority",
+                help="interactive: single documents you are waiting for; bulk: large batches that can run later",
+            )
             j_submit = st.form_submit_button("Create Job")
 
         if j_submit:
@@ -673,7 +746,7 @@ with tabs[4]:
             else:
                 try:
                     files = {"input_file": (j_file.name, j_file.getvalue())} if j_file else None
-                    data = {"agent_id": j_agent_id, "created_by": created_by_val}
+                    data = {"agent_id": j_agent_id, "created_by": created_by_val, "priority": j_priority}
                     if j_input_data.strip():
                         data["input_data"] = j_input_data.strip()
 
@@ -687,59 +760,136 @@ with tabs[4]:
                     job_response = r.json()
                     show_api_response(r)
 
-                    # Poll for progress if job created successfully
+                    # Follow progress over the job's event stream (SSE) if job created successfully
                     if r.status_code == 200:
                         job_id = job_response["id"]
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                         report_text = st.empty()
-
-                        while True:
-                            r_poll = requests.get(f"{BASE_URL}/jobs/{job_id}", headers=get_headers(), timeout=REQUEST_TIMEOUT)
-                            job_data = r_poll.json()
-                            progress = job_data.get("progress", 0)
-                            status = job_data.get("status", "pending")
-                            progress_bar.progress(progress)
-                            status_text.markdown(f"**Status:** {status} | **Progress:** {progress}%")
-
-                            if status in ["completed", "failed", "cancelled"]:
-                                if status == "completed" and job_data.get("output_data"):
-                                    report_text.markdown(f"**Report Output:**\n```\n{job_data['output_data'].get('final_report', '')}\n```")
-                                break
-                            time.sleep(2)  # poll every 2 seconds
+                        if job_response.get("queue_position"):
+                            eta = job_response.get("eta_seconds")
+                            eta_text = f", starts in ~{eta:.0f}s" if eta is not None else ""
+                            status_text.markdown(f"**Queued:** position {job_response['queue_position']}{eta_text}")
+
+                        status, progress, live_report = "pending", 0, ""
+                        with requests.get(
+                            f"{BASE_URL}/jobs/{job_id}/events",
+                            headers={**get_headers(), "Accept": "text/event-stream"},
+                            stream=True,
+                            timeout=(REQUEST_TIMEOUT, None),
+                        ) as r_events:
+                            for line in r_events.iter_lines(decode_unicode=True):
+                                if not line or not line.startswith("data:"):
+                                    continue  # event names, keep-alives, separators
+                                event = json.loads(line[len("data:"):])
+                                if event.get("type") == "token":
+                                    # The final report materializes as it is generated
+                                    if event.get("final"):
+                                        live_report += event["text"]
+                                        report_text.markdown(f"**Report Output:**\n```\n{live_report}\n```")
+                                    continue
+                                status = event.get("status", status)
+                                progress = event.get("progress", progress)
+                                progress_bar.progress(progress)
+                                stage = f" | **Stage done:** {event['stage']}" if event.get("stage") else ""
+                                status_text.markdown(f"**Status:** {status} | **Progress:** {progress}%{stage}")
+
+                        # The report itself is fetched once, when the job is done
+                        if status == "completed":
+                            r_report = requests.get(f"{BASE_URL}/jobs/{job_id}/report", headers=get_headers(), timeout=REQUEST_TIMEOUT)
+                            final_report = r_report.json().get("final_report")
+                            if final_report:
+                                report_text.markdown(f"**Report Output:**\n```\n{final_report}\n```")
 
                 except Exception as e:
                     st.error(f"Create job failed: {e}")
 
+    # ----------------- Batch Jobs -----------------
+    with st.expander("Create Batch (many documents / inputs at once)", expanded=False):
+        with st.form("create_batch_form"):
+            b_agent_id = st.text_input("Agent ID (UUID)", key="b_agent_id")
+            b_files = st.file_uploader(
+                "Upload documents (PDF/TXT/DOCX)", type=["pdf", "txt", "docx"], accept_multiple_files=True
+            )
+            b_inputs = st.text_area("Or a JSON array of inputs, one job each (optional)", key="b_inputs")
+            b_submit = st.form_submit_button("Create Batch")
+
+        if b_submit:
+            if not b_agent_id.strip() or not st.session_state.user_id:
+                st.error("Agent ID and a logged-in user are required.")
+            elif not b_files and not b_inputs.strip():
+                st.error("Please provide files or a JSON array of inputs.")
+            else:
+                try:
+                    files = [("input_files", (f.name, f.getvalue())) for f in b_files] or None
+                    data = {"agent_id": b_agent_id, "created_by": st.session_state.user_id}
+                    if b_inputs.strip():
+                        data["inputs"] = b_inputs.strip()
+                    r = requests.post(
+                        f"{BASE_URL}/jobs/batch", headers=get_headers(), data=data, files=files, timeout=REQUEST_TIMEOUT
+                    )
+                    show_api_response(r)
+                    if r.status_code == 200:
+                        st.session_state["last_batch_id"] = r.json()["batch_id"]
+                except Exception as e:
+                    st.error(f"Create batch failed: {e}")
+
+        bp_id = st.text_input("Batch ID", value=st.session_state.get("last_batch_id", ""), key="bp_id")
+        if st.button("Batch progress") and bp_id.strip():
+            try:
+                r = requests.get(f"{BASE_URL}/jobs/batch/{bp_id.strip()}", headers=get_headers(), timeout=REQUEST_TIMEOUT)
+                if r.status_code == 200:
+                    batch = r.json()
+                    st.progress(batch["progress"])
+                    st.write(f"{batch['total']} jobs: " + ", ".join(f"{k} {v}" for k, v in batch["statuses"].items()))
+                else:
+                    show_api_response(r)
+            except Exception as e:
+                st.error(f"Batch progress failed: {e}")
+
     st.write("---")
 
     # ----------------- Jobs List -----------------
-    if st.button("Refresh jobs list"):
+    # Filtering and paging happen server side (keyset cursor in X-Next-Cursor)
+    jl_status = st.selectbox("Status filter", options=["", "pending", "running", "completed", "failed", "cancelled"], key="jl_status")
+    jl_refresh = st.button("Refresh jobs list")
+    jl_next = st.button("Next page", disabled=not st.session_state.get("jobs_next_cursor"))
+    if jl_refresh or jl_next:
+        params = {"limit": 50}
+        if jl_status:
+            params["status"] = jl_status
+        # Normal users only see their own jobs
+        if st.session_state.user_role != "admin" and st.session_state.user_id:
+            params["created_by"] = st.session_state.user_id
+        if jl_next:
+            params["cursor"] = st.session_state.get("jobs_next_cursor")
         try:
-            r = requests.get(f"{BASE_URL}/jobs/", headers=get_headers(), timeout=REQUEST_TIMEOUT)
+            r = requests.get(f"{BASE_URL}/jobs/", headers=get_headers(), params=params, timeout=REQUEST_TIMEOUT)
             data = show_api_response(r)
             if r.status_code == 200:
+                st.session_state["jobs_next_cursor"] = r.headers.get("X-Next-Cursor")
                 df = pd.DataFrame(r.json())
-                # Filter for normal users
-                if st.session_state.user_role != "admin" and "created_by" in df.columns:
-                    df = df[df["created_by"] == st.session_state.user_id]
                 if "progress" in df.columns:
                     df["progress_display"] = df["progress"].astype(str) + "%"
                 st.dataframe(df)
         except Exception as e:
             st.error(f"Jobs list failed: {e}")
 
-    # ----------------- Get / Cancel Job -----------------
-    job_id_input = st.text_input("Job ID (get/cancel)", key="job_id_action")
-    col1, col2 = st.columns(2)
+    # ----------------- Get / Cancel / Retry Job -----------------
+    job_id_input = st.text_input("Job ID (get/cancel/retry)", key="job_id_action")
+    col1, col2, col3 = st.columns(3)
     with col1:
         if st.button("Get job"):
             try:
                 r = requests.get(f"{BASE_URL}/jobs/{job_id_input}", headers=get_headers(), timeout=REQUEST_TIMEOUT)
                 job_data = r.json()
                 show_api_response(r)
-                if r.status_code == 200 and job_data.get("output_data"):
-                    st.markdown(f"**Report Output:**\n```\n{job_data['output_data'].get('final_report', '')}\n```")
+                if r.status_code == 200 and job_data.get("status") == "completed":
+                    # Report bodies live in the backend's content store
+                    r_report = requests.get(f"{BASE_URL}/jobs/{job_id_input}/report", headers=get_headers(), timeout=REQUEST_TIMEOUT)
+                    final_report = r_report.json().get("final_report") if r_report.status_code == 200 else None
+                    if final_report:
+                        st.markdown(f"**Report Output:**\n```\n{final_report}\n```")
             except Exception as e:
                 st.error(f"Get job failed: {e}")
 
@@ -751,6 +901,15 @@ with tabs[4]:
             except Exception as e:
                 st.error(f"Cancel job failed: {e}")
 
+    with col3:
+        if st.button("Retry job"):
+            try:
+                # Resumes after the last checkpointed stage
+                r = requests.post(f"{BASE_URL}/jobs/{job_id_input}/retry", headers=get_headers(), timeout=REQUEST_TIMEOUT)
+                show_api_response(r)
+            except Exception as e:
+                st.error(f"Retry job failed: {e}")
+
 
 
     # ----------------- EVENTS TAB -----------------
@@ -758,29 +917,52 @@ with tabs[4]:
         st.markdown("<div class='card'><h3>Event logs</h3></div>", unsafe_allow_html=True)
         st.write("Admin can view system event logs. Users get a notification if they have personal events (backend dependent).")
 
-        # This reads local event file if present (your previous behavior)
-        event_file = os.path.join("event", "events.jsonl")
-        if os.path.exists(event_file):
+        # Paged server side from GET /events (newest first, keyset cursor in X-Next-Cursor)
+        ev_col1, ev_col2, ev_col3 = st.columns(3)
+        with ev_col1:
+            ev_job = st.text_input("Job ID filter", key="ev_job")
+        with ev_col2:
+            ev_type = st.selectbox("Type", options=["", "status", "stage"], key="ev_type")
+        with ev_col3:
+            ev_since = st.text_input("Since (ISO time, optional)", key="ev_since")
+        ev_params = {"limit": 50}
+        if ev_job.strip():
+            ev_params["job_id"] = ev_job.strip()
+        if ev_type:
+            ev_params["type"] = ev_type
+        if ev_since.strip():
+            ev_params["created_after"] = ev_since.strip()
+        # Normal users only see events of their own jobs
+        if st.session_state.user_role != "admin" and st.session_state.user_id:
+            ev_params["user_id"] = st.session_state.user_id
+
+        ev_load = st.button("Load events")
+        ev_next = st.button("Older events", disabled=not st.session_state.get("events_next_cursor"))
+        ev_tail = st.button("New events since last load", disabled=not st.session_state.get("events_last_id"))
+        if ev_load or ev_next or ev_tail:
+            params = dict(ev_params)
+            if ev_next:
+                params["cursor"] = st.session_state.get("events_next_cursor")
+            if ev_tail:
+                params["after"] = st.session_state.get("events_last_id")
             try:
-                with open(event_file, "r", encoding="utf-8") as f:
-                    logs = [json.loads(line) for line in f if line.strip()]
-                if logs:
-                    # show all logs only to admin
-                    df = pd.DataFrame(logs)
-                    if st.session_state.user_role != "admin":
-                        # attempt to filter user-specific logs if they include 'user_id' field
-                        if "user_id" in df.columns:
-                            df = df[df["user_id"] == st.session_state.user_id]
-                    if df.empty:
-                        st.info("No events visible for you.")
+                r = requests.get(f"{BASE_URL}/events/", headers=get_headers(), params=params, timeout=REQUEST_TIMEOUT)
+                if r.status_code == 200:
+                    events = r.json()
+                    if ev_tail:
+                        st.session_state["events_last_id"] = int(r.headers.get("X-Last-Event-Id") or params["after"])
                     else:
-                        st.dataframe(df)
+                        st.session_state["events_next_cursor"] = r.headers.get("X-Next-Cursor")
+                        if ev_load and events:
+                            st.session_state["events_last_id"] = events[0]["id"]
+                    if events:
+                        st.dataframe(pd.DataFrame(events))
+                    else:
+                        st.info("No events.")
                 else:
-                    st.info("Event file exists but contains no lines.")
+                    show_api_response(r)
             except Exception as e:
-                st.error(f"Failed to read events: {e}")
-        else:
-            st.info("No event file found at 'event/events.jsonl' (relative to the Streamlit working dir).")
+                st.error(f"Failed to load events: {e}")
 
     # ----------------- DIAGNOSTICS TAB -----------------
     with tabs[6]: